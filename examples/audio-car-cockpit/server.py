@@ -1,4 +1,6 @@
+import asyncio
 import base64
+import json
 import webbrowser
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -7,6 +9,7 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 from openai import AsyncOpenAI
 
+from src.audio_frames import FORMAT_PCM_F32LE, AudioFrame, AudioIngest, pcm_to_wav
 from src.checklist import create_checklist_router
 from src.connection_manager import ConnectionManager
 from src.functions import create_functions_router
@@ -22,12 +25,18 @@ async def lifespan(app: FastAPI):
     with (
         spawn_server(file_name="LiquidAI/LFM2-1.2B-Tool-GGUF:Q8_0") as (_, port_lm),
     ):
-        app.state.tcr = ToolCallingRuntime(port=port_lm)
+        # Pooled clients, shared by all requests for the app's lifetime
+        async with (
+            ToolCallingRuntime(port=port_lm) as tcr,
+            AsyncOpenAI(base_url=f"http://127.0.0.1:{p_env.AUDIO_SERVER_PORT}/v1", api_key="dummy") as audio_client,
+        ):
+            app.state.tcr = tcr
+            app.state.audio_client = audio_client
 
-        _url = p_env.DEMO_URL.unicode_string()
-        print(f"Ready, opening: {_url}")
-        webbrowser.open(_url, new=0, autoraise=True)
-        yield
+            _url = p_env.DEMO_URL.unicode_string()
+            print(f"Ready, opening: {_url}")
+            webbrowser.open(_url, new=0, autoraise=True)
+            yield
 
 
 # Initialize FastAPI app and connection manager
@@ -71,7 +80,7 @@ async def get_index():
 async def tool_calling_single_turn(query: str):
     tcr: ToolCallingRuntime = app.state.tcr
 
-    tool_call, text = tcr.completion(query)
+    tool_call, text = await tcr.completion(query)
 
     if tool_call is not None:
         func_name, args = function_to_args(tool_call)
@@ -107,39 +116,120 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.websocket("/ws-audio")
 async def websocket_audio_endpoint(websocket: WebSocket):
     await websocket.accept()
-    audio_client = AsyncOpenAI(base_url=f"http://127.0.0.1:{p_env.AUDIO_SERVER_PORT}/v1", api_key="dummy")
+    audio_client: AsyncOpenAI = app.state.audio_client
 
     voice = "US female"
+    ingest: AudioIngest | None = None  # Utterance being uploaded as binary frames
+    pending: dict = {}  # Request that started the upload
+    segments: asyncio.Queue[bytes | None] = asyncio.Queue()  # WAV segments awaiting ASR
+    asr_task: asyncio.Task[str] | None = None
+    out_sequence = 0
+
+    async def send_audio(chunk_b64: str) -> None:
+        """Forward a synthesized chunk as a binary frame as soon as it arrives."""
+        nonlocal out_sequence
+        frame = AudioFrame(
+            format=FORMAT_PCM_F32LE, sample_rate=24000, sequence=out_sequence, payload=base64.b64decode(chunk_b64)
+        )
+        out_sequence += 1
+        await websocket.send_bytes(frame.encode())
+
+    async def transcribe(wav_data: bytes) -> str:
+        """Run ASR on one WAV, forwarding text deltas to the client as they arrive."""
+        stream = await audio_client.chat.completions.create(
+            model="",
+            messages=[
+                {"role": "system", "content": "Perform ASR."},
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_audio",
+                            "input_audio": {
+                                "data": base64.b64encode(wav_data).decode("utf-8"),
+                                "format": "wav",
+                            },
+                        }
+                    ],
+                },
+            ],
+            stream=True,
+            max_tokens=512,
+        )
+        text = ""
+        async for chunk in stream:
+            delta = chunk.choices[0].delta
+            if delta.content:
+                text += delta.content
+                await websocket.send_json({"type": "text", "data": delta.content})
+        return text
+
+    async def transcribe_segments(queue: asyncio.Queue[bytes | None]) -> str:
+        """Transcribe segments in order while the rest of the utterance is still uploading."""
+        parts: list[str] = []
+        while (wav_data := await queue.get()) is not None:
+            if parts:
+                await websocket.send_json({"type": "text", "data": " "})
+            part = (await transcribe(wav_data)).strip()
+            if part:
+                parts.append(part)
+        return " ".join(parts)
 
     try:
         while True:
-            data = await websocket.receive_json()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            transcribed_text: str | None = None
+            wav_data: bytes | None = None
+            if message.get("bytes") is not None:
+                # Binary upload: each segment ending at a pause is transcribed while
+                # the user keeps talking; only the tail is left after the last frame
+                if ingest is None or asr_task is None:
+                    continue
+                frame = AudioFrame.decode(message["bytes"])
+                sample_rate = frame.sample_rate
+                for pcm in ingest.add(frame):
+                    segments.put_nowait(pcm_to_wav(pcm, sample_rate))
+                if not frame.last:
+                    continue
+                tail = ingest.flush()
+                if tail is not None:
+                    segments.put_nowait(pcm_to_wav(tail, sample_rate))
+                segments.put_nowait(None)
+                print(
+                    f"\n[AUDIO] Received {ingest.duration_s:.1f}s of audio in {frame.sequence + 1} frames, "
+                    f"{ingest.segments_emitted} ASR segment(s)"
+                )
+                transcribed_text = await asr_task
+                data = pending
+                ingest, pending, asr_task = None, {}, None
+            else:
+                data = json.loads(message["text"])
+                if data.get("stream_audio"):
+                    # Audio follows as binary frames; ASR starts on the first finished segment
+                    if asr_task is not None:
+                        asr_task.cancel()
+                    print("\n[AUDIO] Starting streaming ASR (Speech-to-Text)...")
+                    ingest, pending = AudioIngest(), data
+                    segments = asyncio.Queue()
+                    asr_task = asyncio.create_task(transcribe_segments(segments))
+                    continue
+                # Legacy: whole WAV as base64 in the JSON message
+                audio_b64 = data.get("audio")
+                wav_data = base64.b64decode(audio_b64) if audio_b64 else None
+
             mode = data.get("mode", "asr")
             text = data.get("text")
-            audio_b64 = data.get("audio")
+            out_sequence = 0
 
-            wav_data = base64.b64decode(audio_b64) if audio_b64 else None
-
-            # Build messages based on mode
             if mode == "asr":
-                print("\n[AUDIO] Starting ASR (Speech-to-Text)...")
-                if wav_data is None:
-                    continue
-                messages = [
-                    {"role": "system", "content": "Perform ASR."},
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "input_audio",
-                                "input_audio": {
-                                    "data": base64.b64encode(wav_data).decode("utf-8"),
-                                    "format": "wav",
-                                },
-                            }
-                        ],
-                    },
-                ]
+                if transcribed_text is None:
+                    print("\n[AUDIO] Starting ASR (Speech-to-Text)...")
+                    if wav_data is None:
+                        continue
+                    transcribed_text = await transcribe(wav_data)
             else:  # tts
                 voice = data.get("voice", None) or voice
                 print(f"\n[AUDIO] Starting TTS (Text-to-Speech) with voice '{voice}': '{text}'")
@@ -151,28 +241,24 @@ async def websocket_audio_endpoint(websocket: WebSocket):
                     {"role": "user", "content": text},
                 ]
 
-            # Stream response
-            stream = await audio_client.chat.completions.create(
-                model="",
-                messages=messages,
-                stream=True,
-                max_tokens=512,
-            )
-
-            transcribed_text = ""
+                # Stream response
+                stream = await audio_client.chat.completions.create(
+                    model="",
+                    messages=messages,
+                    stream=True,
+                    max_tokens=512,
+                )
 
-            async for chunk in stream:
-                delta = chunk.choices[0].delta
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta
 
-                if delta.content:
-                    _text_content = delta.content  # .rstrip("<|im_end|>")
-                    transcribed_text += _text_content
-                    await websocket.send_json({"type": "text", "data": _text_content})
+                    if delta.content:
+                        await websocket.send_json({"type": "text", "data": delta.content})
 
-                if hasattr(delta, "audio_chunk") and delta.audio_chunk:
-                    chunk_data = delta.audio_chunk["data"]
-                    # Send audio chunk immediately for low latency
-                    await websocket.send_json({"type": "audio", "data": chunk_data, "sample_rate": 24000})
+                    if hasattr(delta, "audio_chunk") and delta.audio_chunk:
+                        chunk_data = delta.audio_chunk["data"]
+                        # Send audio chunk immediately for low latency
+                        await send_audio(chunk_data)
 
             # If ASR mode, process through tool calling and then TTS
             if mode == "asr" and transcribed_text:
@@ -184,7 +270,7 @@ async def websocket_audio_endpoint(websocket: WebSocket):
                 # Process through tool calling runtime
                 print("[AUDIO] Processing through tool calling model...")
                 tcr: ToolCallingRuntime = app.state.tcr
-                tool_call, response_text = tcr.completion(transcribed_text)
+                tool_call, response_text = await tcr.completion(transcribed_text)
 
                 formatted_tool_name = None
                 tool_call_valid = True
@@ -249,7 +335,7 @@ async def websocket_audio_endpoint(websocket: WebSocket):
                     if hasattr(delta, "audio_chunk") and delta.audio_chunk:
                         chunk_data = delta.audio_chunk["data"]
                         # Send audio chunk immediately for low latency
-                        await websocket.send_json({"type": "audio", "data": chunk_data, "sample_rate": 24000})
+                        await send_audio(chunk_data)
 
             await websocket.send_json({"type": "done"})
 
@@ -258,6 +344,9 @@ async def websocket_audio_endpoint(websocket: WebSocket):
     except Exception as e:
         print(f"[AUDIO] Error: {e}")
         await websocket.send_json({"type": "error", "data": str(e)})
+    finally:
+        if asr_task is not None:
+            asr_task.cancel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+"""Binary audio frames exchanged over /ws-audio.
+
+Every frame is a 12-byte little-endian header followed by raw audio:
+
+    uint8  format       FORMAT_* below
+    uint8  flags        FLAG_LAST on the final frame of an utterance
+    uint16 reserved
+    uint32 sample_rate  Hz
+    uint32 sequence     frame number, starting at 0 for each utterance
+
+Keep in sync with `AUDIO_FRAME_*` in static/script.js.
+"""
+
+import io
+import math
+import struct
+import sys
+import wave
+from array import array
+from dataclasses import dataclass
+
+FORMAT_PCM_S16LE = 1
+FORMAT_PCM_F32LE = 2
+
+FLAG_LAST = 0x01
+
+HEADER = struct.Struct("<BBHII")
+
+
+@dataclass
+class AudioFrame:
+    format: int
+    sample_rate: int
+    sequence: int
+    payload: bytes
+    last: bool = False
+
+    def encode(self) -> bytes:
+        flags = FLAG_LAST if self.last else 0
+        return HEADER.pack(self.format, flags, 0, self.sample_rate, self.sequence) + self.payload
+
+    @classmethod
+    def decode(cls, data: bytes) -> "AudioFrame":
+        if len(data) < HEADER.size:
+            raise ValueError(f"Audio frame too short: {len(data)} bytes")
+        fmt, flags, _, sample_rate, sequence = HEADER.unpack_from(data)
+        return cls(
+            format=fmt,
+            sample_rate=sample_rate,
+            sequence=sequence,
+            payload=bytes(data[HEADER.size :]),
+            last=bool(flags & FLAG_LAST),
+        )
+
+
+class AudioIngest:
+    """Collects the 16-bit PCM frames of one utterance and cuts them into segments.
+
+    A segment ends at the first pause of `silence_s` once it is at least
+    `min_segment_s` long, or at `max_segment_s`, so finished segments can be
+    transcribed while the user is still talking. Pauses are found with a
+    simple energy VAD over 20 ms windows.
+    """
+
+    def __init__(
+        self,
+        min_segment_s: float = 1.5,
+        max_segment_s: float = 8.0,
+        silence_s: float = 0.3,
+        silence_rms: float = 500.0,
+    ):
+        self.min_segment_s = min_segment_s
+        self.max_segment_s = max_segment_s
+        self.silence_s = silence_s
+        self.silence_rms = silence_rms
+        self.sample_rate: int | None = None
+        self.received_bytes = 0
+        self.segments_emitted = 0
+
+        self._next_sequence = 0
+        self._segment = bytearray()
+        self._scanned = 0  # bytes of _segment already run through the VAD
+        self._silent_bytes = 0  # trailing silence in the scanned part
+        self._voiced = False  # whether the current segment has any speech
+
+    def add(self, frame: AudioFrame) -> list[bytes]:
+        """Append a frame; return the PCM of any segments it completed."""
+        if frame.format != FORMAT_PCM_S16LE:
+            raise ValueError(f"Unsupported upload format: {frame.format}")
+        if frame.sequence != self._next_sequence:
+            raise ValueError(f"Audio frame {frame.sequence} out of order, expected {self._next_sequence}")
+        if self.sample_rate is None:
+            self.sample_rate = frame.sample_rate
+        elif frame.sample_rate != self.sample_rate:
+            raise ValueError("Sample rate changed mid-utterance")
+
+        self._segment += frame.payload
+        self.received_bytes += len(frame.payload)
+        self._next_sequence += 1
+
+        bytes_per_s = 2 * self.sample_rate
+        window = max(2, int(bytes_per_s * 0.02) // 2 * 2)
+        finished: list[bytes] = []
+        while self._scanned + window <= len(self._segment):
+            samples = array("h", self._segment[self._scanned : self._scanned + window])
+            if sys.byteorder == "big":
+                samples.byteswap()
+            rms = math.sqrt(sum(x * x for x in samples) / len(samples))
+            if rms < self.silence_rms:
+                self._silent_bytes += window
+            else:
+                self._silent_bytes = 0
+                self._voiced = True
+            self._scanned += window
+
+            length_s = self._scanned / bytes_per_s
+            paused = self._silent_bytes / bytes_per_s >= self.silence_s
+            if (length_s >= self.min_segment_s and paused) or length_s >= self.max_segment_s:
+                segment = self._cut()
+                if segment is not None:
+                    finished.append(segment)
+        return finished
+
+    def flush(self) -> bytes | None:
+        """Return the rest of the utterance after the last frame, if there is anything to transcribe."""
+        self._scanned = len(self._segment)
+        # With nothing emitted yet, send the audio even if the VAD heard no speech
+        if self.segments_emitted == 0 and self._segment:
+            self._voiced = True
+        return self._cut()
+
+    def _cut(self) -> bytes | None:
+        """Split off the scanned part as a segment; pure silence is dropped."""
+        segment = bytes(self._segment[: self._scanned])
+        voiced = self._voiced
+        del self._segment[: self._scanned]
+        self._scanned = self._silent_bytes = 0
+        self._voiced = False
+        if not voiced:
+            return None
+        self.segments_emitted += 1
+        return segment
+
+    @property
+    def duration_s(self) -> float:
+        return self.received_bytes / 2 / self.sample_rate if self.sample_rate else 0.0
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap mono 16-bit PCM in a WAV header."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
@@ -1,4 +1,8 @@
 import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
 
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
@@ -8,9 +12,121 @@ from .connection_manager import ConnectionManager
 router = APIRouter()
 
 
+@dataclass
+class Check:
+    """One checklist step. Runs once every check named in `after` has passed."""
+
+    name: str
+    run: Callable[[], Awaitable[dict]]
+    after: tuple[str, ...] = ()
+    # Housekeeping steps (e.g. restoring defaults) run but are not listed in the results
+    report: bool = True
+
+
+class DependencyFailed(Exception):
+    pass
+
+
+async def poll_until(
+    fetch: Callable[[], Awaitable[Any]],
+    predicate: Callable[[Any], bool],
+    timeout: float = 3.0,
+    initial_delay: float = 0.05,
+    max_delay: float = 0.5,
+) -> Any:
+    """Call `fetch` with exponential backoff until `predicate` holds or `timeout` expires.
+
+    Returns the last fetched value, so the caller decides whether the check passed.
+    """
+    deadline = time.perf_counter() + timeout
+    delay = initial_delay
+    while True:
+        value = await fetch()
+        remaining = deadline - time.perf_counter()
+        if predicate(value) or remaining <= 0:
+            return value
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+async def run_checklist(checks: list[Check]) -> dict:
+    """Run `checks` concurrently, each one as soon as its dependencies are done.
+
+    Startup time is bounded by the slowest dependency chain (the critical path)
+    instead of the sum of all checks.
+    """
+    names = [c.name for c in checks]
+    assert len(set(names)) == len(names), "Check names must be unique"
+
+    start = time.perf_counter()
+    tasks: dict[str, asyncio.Task] = {}
+    records: dict[str, dict] = {}
+    critical_path_ms: dict[str, float] = {}
+
+    async def run_one(check: Check) -> None:
+        try:
+            await asyncio.gather(*(tasks[dep] for dep in check.after))
+        except Exception as e:
+            records[check.name] = {"test": check.name, "skipped": True, "error": f"Dependency failed: {e}"}
+            raise DependencyFailed(check.name) from e
+
+        started = time.perf_counter()
+        try:
+            outcome = await check.run()
+        except Exception as e:
+            records[check.name] = {"test": check.name, "error": str(e)}
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            critical_path_ms[check.name] = duration_ms + max(
+                (critical_path_ms.get(dep, 0.0) for dep in check.after), default=0.0
+            )
+            records.setdefault(check.name, {"test": check.name})
+            records[check.name] |= {
+                "started_ms": round((started - start) * 1000, 1),
+                "duration_ms": round(duration_ms, 1),
+            }
+        records[check.name] = {"test": check.name, **outcome} | records[check.name]
+
+    for check in checks:
+        assert all(dep in tasks for dep in check.after), f"{check.name}: dependencies must be declared before it"
+        tasks[check.name] = asyncio.create_task(run_one(check))
+
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    results = [records[c.name] for c in checks if c.report]
+    errors = [r["error"] for c in checks if "error" in (r := records[c.name]) and not r.get("skipped")]
+    return {
+        "results": results,
+        "errors": errors,
+        "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+        "critical_path_ms": round(max(critical_path_ms.values(), default=0.0), 1),
+    }
+
+
 def create_checklist_router(manager: ConnectionManager) -> APIRouter:
     """Create and configure the checklist testing router."""
 
+    def checklist_response(report: dict, **extra) -> dict | JSONResponse:
+        if report["errors"]:
+            return JSONResponse(
+                status_code=500,
+                content={
+                    "status": "error",
+                    "message": report["errors"][0],
+                    "partial_results": report["results"],
+                    "wall_ms": report["wall_ms"],
+                },
+            )
+        return {
+            "status": "success",
+            **extra,
+            "tests_run": len(report["results"]),
+            "wall_ms": report["wall_ms"],
+            "critical_path_ms": report["critical_path_ms"],
+            "results": report["results"],
+        }
+
     @router.get("/checklist/quick-check")
     async def quick_check():
         """
@@ -26,73 +142,50 @@ def create_checklist_router(manager: ConnectionManager) -> APIRouter:
             )
 
         ws = manager.active_connections[0]
-        results = []
-
-        try:
-            # Test 1: Open front-right window
-            results.append(
-                {
-                    "test": "Open front-right window",
-                    "result": await manager.send_rpc_request(ws, "carWindows.set", {"id": "fr", "open": True}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Test 2: Check window state
-            window_state = await manager.send_rpc_request(ws, "carWindows.get", {"id": "fr"})
-            results.append(
-                {
-                    "test": "Verify window opened",
-                    "result": window_state,
-                    "passed": window_state,
-                }
-            )
 
-            # Test 3: Close window
-            results.append(
-                {
-                    "test": "Close front-right window",
-                    "result": await manager.send_rpc_request(ws, "carWindows.set", {"id": "fr", "open": False}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Test 4: Set climate temperature
-            results.append(
-                {
-                    "test": "Set temperature to 22°C",
-                    "result": await manager.send_rpc_request(ws, "climate.setTarget", {"temperature": 22}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Test 5: Verify climate state
-            climate_state = await manager.send_rpc_request(ws, "climate.get", {})
-            results.append(
-                {
-                    "test": "Verify temperature set",
-                    "result": climate_state,
-                    "passed": climate_state.get("targetTemp") == 22,
-                }
-            )
-
-            # Test 6: Get full system state
-            state = await manager.send_rpc_request(ws, "system.getState", {})
-            results.append(
-                {
-                    "test": "Get system state",
-                    "result": "success" if state else "failed",
-                    "state_keys": list(state.keys()) if state else [],
-                }
-            )
-
-            return {"status": "success", "tests_run": len(results), "results": results}
-
-        except Exception as e:
-            return JSONResponse(
-                status_code=500,
-                content={"status": "error", "message": str(e), "partial_results": results},
-            )
+        def rpc(method: str, params: dict | None = None):
+            return lambda: manager.send_rpc_request(ws, method, params or {})
+
+        def action(method: str, params: dict | None = None):
+            async def run():
+                return {"result": await rpc(method, params)()}
+
+            return run
+
+        async def verify_window_opened():
+            window_state = await poll_until(rpc("carWindows.get", {"id": "fr"}), bool)
+            return {"result": window_state, "passed": window_state}
+
+        async def verify_temperature():
+            climate_state = await poll_until(rpc("climate.get"), lambda s: s.get("targetTemp") == 22)
+            return {"result": climate_state, "passed": climate_state.get("targetTemp") == 22}
+
+        async def system_state():
+            state = await rpc("system.getState")()
+            return {"result": "success" if state else "failed", "state_keys": list(state.keys()) if state else []}
+
+        report = await run_checklist(
+            [
+                # Windows
+                Check("Open front-right window", action("carWindows.set", {"id": "fr", "open": True})),
+                Check("Verify window opened", verify_window_opened, after=("Open front-right window",)),
+                Check(
+                    "Close front-right window",
+                    action("carWindows.set", {"id": "fr", "open": False}),
+                    after=("Verify window opened",),
+                ),
+                # Climate
+                Check("Set temperature to 22°C", action("climate.setTarget", {"temperature": 22})),
+                Check("Verify temperature set", verify_temperature, after=("Set temperature to 22°C",)),
+                # Everything settled
+                Check(
+                    "Get system state",
+                    system_state,
+                    after=("Close front-right window", "Verify temperature set"),
+                ),
+            ]
+        )
+        return checklist_response(report)
 
     @router.get("/checklist/full-system")
     async def full_system_check():
@@ -110,209 +203,94 @@ def create_checklist_router(manager: ConnectionManager) -> APIRouter:
             )
 
         ws = manager.active_connections[0]
-        results = []
 
-        try:
-            # === WINDOWS TESTS ===
-            # Test opening all windows
-            results.append(
-                {
-                    "test": "Open all windows",
-                    "result": await manager.send_rpc_request(ws, "carWindows.openAll", {}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Verify all windows open
-            windows = await manager.send_rpc_request(ws, "carWindows.get", {})
-            results.append(
-                {
-                    "test": "Verify all windows open",
-                    "result": windows,
-                    "passed": all(windows.values()),
-                }
-            )
+        def rpc(method: str, params: dict | None = None):
+            return lambda: manager.send_rpc_request(ws, method, params or {})
 
-            # Close all windows
-            results.append(
-                {
-                    "test": "Close all windows",
-                    "result": await manager.send_rpc_request(ws, "carWindows.closeAll", {}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Test individual window toggle
-            results.append(
-                {
-                    "test": "Toggle rear-left window",
-                    "result": await manager.send_rpc_request(ws, "carWindows.toggle", {"id": "rl"}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # === MEDIA TESTS ===
-            # Get initial media state
-            media_state = await manager.send_rpc_request(ws, "media.get", {})
-            results.append(
-                {
-                    "test": "Get media state",
-                    "result": f"Track: {media_state['track']['title']}",
-                    "passed": "track" in media_state,
-                }
-            )
+        def action(method: str, params: dict | None = None):
+            async def run():
+                return {"result": await rpc(method, params)()}
 
-            # Play media
-            results.append(
-                {
-                    "test": "Play media",
-                    "result": await manager.send_rpc_request(ws, "media.play", {}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Verify playing
-            media_state = await manager.send_rpc_request(ws, "media.get", {})
-            results.append(
-                {
-                    "test": "Verify media playing",
-                    "result": media_state.get("isPlaying"),
-                    "passed": media_state.get("isPlaying"),
-                }
-            )
+            return run
 
-            # Next track
-            results.append(
-                {
-                    "test": "Next track",
-                    "result": await manager.send_rpc_request(ws, "media.next", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Previous track
-            results.append(
-                {
-                    "test": "Previous track",
-                    "result": await manager.send_rpc_request(ws, "media.previous", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Pause
-            results.append(
-                {
-                    "test": "Pause media",
-                    "result": await manager.send_rpc_request(ws, "media.pause", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # === CLIMATE TESTS ===
-            # Set target temperature
-            results.append(
-                {
-                    "test": "Set temperature to 24°C",
-                    "result": await manager.send_rpc_request(ws, "climate.setTarget", {"temperature": 24}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Set fan level
-            results.append(
-                {
-                    "test": "Set fan to level 3",
-                    "result": await manager.send_rpc_request(ws, "climate.setFan", {"level": 3}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Verify climate state
-            climate = await manager.send_rpc_request(ws, "climate.get", {})
-            results.append(
-                {
-                    "test": "Verify climate settings",
-                    "result": climate,
-                    "passed": climate.get("targetTemp") == 24 and climate.get("fanLevel") == 3,
-                }
-            )
+        # === WINDOWS TESTS ===
+        async def verify_windows_open():
+            windows = await poll_until(rpc("carWindows.get"), lambda w: all(w.values()))
+            return {"result": windows, "passed": all(windows.values())}
 
-            # Reset to defaults
-            await manager.send_rpc_request(ws, "climate.setTarget", {"temperature": 23})
-            await manager.send_rpc_request(ws, "climate.setFan", {"level": 2})
-
-            # === NAVIGATION TESTS ===
-            # Set destination
-            results.append(
-                {
-                    "test": "Set navigation destination",
-                    "result": await manager.send_rpc_request(ws, "navigation.setDestination", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Get navigation state
-            nav_state = await manager.send_rpc_request(ws, "navigation.get", {})
-            results.append(
-                {
-                    "test": "Verify route generated",
-                    "result": f"Route has {nav_state.get('totalSteps', 0)} steps",
-                    "passed": nav_state.get("totalSteps", 0) > 0,
-                }
-            )
+        # === MEDIA TESTS ===
+        async def media_state():
+            state = await rpc("media.get")()
+            return {"result": f"Track: {state['track']['title']}", "passed": "track" in state}
 
-            # Start navigation
-            results.append(
-                {
-                    "test": "Start navigation",
-                    "result": await manager.send_rpc_request(ws, "navigation.start", {}),
-                }
-            )
-            await asyncio.sleep(1.0)
-
-            # Pause navigation
-            results.append(
-                {
-                    "test": "Pause navigation",
-                    "result": await manager.send_rpc_request(ws, "navigation.pause", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Clear navigation
-            results.append(
-                {
-                    "test": "Clear navigation",
-                    "result": await manager.send_rpc_request(ws, "navigation.clear", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # === FINAL STATE CHECK ===
-            final_state = await manager.send_rpc_request(ws, "system.getState", {})
-            results.append(
-                {
-                    "test": "Final system state check",
-                    "result": "success",
-                    "state": final_state,
-                }
-            )
+        async def verify_playing():
+            state = await poll_until(rpc("media.get"), lambda s: s.get("isPlaying"))
+            return {"result": state.get("isPlaying"), "passed": state.get("isPlaying")}
+
+        # === CLIMATE TESTS ===
+        def climate_ok(c: dict) -> bool:
+            return c.get("targetTemp") == 24 and c.get("fanLevel") == 3
 
-            passed_tests = sum(1 for r in results if r.get("passed", True))
-            total_tests = len(results)
+        async def verify_climate():
+            climate = await poll_until(rpc("climate.get"), climate_ok)
+            return {"result": climate, "passed": climate_ok(climate)}
 
+        # === NAVIGATION TESTS ===
+        async def verify_route():
+            nav_state = await poll_until(rpc("navigation.get"), lambda s: s.get("totalSteps", 0) > 0)
             return {
-                "status": "success",
-                "summary": f"{passed_tests}/{total_tests} tests passed",
-                "tests_run": total_tests,
-                "tests_passed": passed_tests,
-                "results": results,
+                "result": f"Route has {nav_state.get('totalSteps', 0)} steps",
+                "passed": nav_state.get("totalSteps", 0) > 0,
             }
 
-        except Exception as e:
-            return JSONResponse(
-                status_code=500,
-                content={"status": "error", "message": str(e), "partial_results": results},
-            )
+        # === FINAL STATE CHECK ===
+        async def final_state():
+            return {"result": "success", "state": await rpc("system.getState")()}
+
+        # Each subsystem is a chain; chains run concurrently
+        report = await run_checklist(
+            [
+                Check("Open all windows", action("carWindows.openAll")),
+                Check("Verify all windows open", verify_windows_open, after=("Open all windows",)),
+                Check("Close all windows", action("carWindows.closeAll"), after=("Verify all windows open",)),
+                Check("Toggle rear-left window", action("carWindows.toggle", {"id": "rl"}), after=("Close all windows",)),
+                Check("Get media state", media_state),
+                Check("Play media", action("media.play"), after=("Get media state",)),
+                Check("Verify media playing", verify_playing, after=("Play media",)),
+                Check("Next track", action("media.next"), after=("Verify media playing",)),
+                Check("Previous track", action("media.previous"), after=("Next track",)),
+                Check("Pause media", action("media.pause"), after=("Previous track",)),
+                Check("Set temperature to 24°C", action("climate.setTarget", {"temperature": 24})),
+                Check("Set fan to level 3", action("climate.setFan", {"level": 3}), after=("Set temperature to 24°C",)),
+                Check("Verify climate settings", verify_climate, after=("Set fan to level 3",)),
+                Check(
+                    "Reset temperature",
+                    action("climate.setTarget", {"temperature": 23}),
+                    after=("Verify climate settings",),
+                    report=False,
+                ),
+                Check("Reset fan", action("climate.setFan", {"level": 2}), after=("Reset temperature",), report=False),
+                Check("Set navigation destination", action("navigation.setDestination")),
+                Check("Verify route generated", verify_route, after=("Set navigation destination",)),
+                Check("Start navigation", action("navigation.start"), after=("Verify route generated",)),
+                Check("Pause navigation", action("navigation.pause"), after=("Start navigation",)),
+                Check("Clear navigation", action("navigation.clear"), after=("Pause navigation",)),
+                Check(
+                    "Final system state check",
+                    final_state,
+                    after=("Toggle rear-left window", "Pause media", "Reset fan", "Clear navigation"),
+                ),
+            ]
+        )
+
+        if report["errors"]:
+            return checklist_response(report)
+
+        passed_tests = sum(1 for r in report["results"] if r.get("passed", True))
+        return checklist_response(
+            report,
+            summary=f"{passed_tests}/{len(report['results'])} tests passed",
+            tests_passed=passed_tests,
+        )
 
     return router
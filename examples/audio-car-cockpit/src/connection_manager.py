@@ -1,23 +1,85 @@
 import asyncio
+import itertools
 import json
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from typing import Any
 
 from fastapi import WebSocket
 
+# Seconds to wait for the cockpit UI to answer an RPC
+DEFAULT_RPC_TIMEOUT_S = 2.0
+RPC_TIMEOUTS_S = {
+    "system.getFunctions": 5.0,
+    "system.getState": 3.0,
+}
+# Requests awaiting an answer per connection; further calls wait for a slot
+MAX_IN_FLIGHT = 16
+
+
+class RpcError(Exception):
+    pass
+
+
+class RpcTimeoutError(RpcError):
+    pass
+
+
+@dataclass
+class PendingRequest:
+    future: asyncio.Future
+    websocket: WebSocket
+    method: str
+    sent_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class RpcMethodStats:
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    latencies_ms: deque = field(default_factory=lambda: deque(maxlen=500))
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+            "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+            "max_ms": round(latencies[-1], 2) if latencies else None,
+        }
+
 
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT):
         self.active_connections: list[WebSocket] = []
-        # Track pending requests: request_id -> Future
-        self.pending_requests: dict[int, asyncio.Future] = {}
+        # Track pending requests: request_id -> PendingRequest
+        self.pending_requests: dict[int, PendingRequest] = {}
+        self.max_in_flight = max_in_flight
+        self._ids = itertools.count(1)
+        self._slots: dict[WebSocket, asyncio.Semaphore] = {}
+        self.rpc_stats: dict[str, RpcMethodStats] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self._slots[websocket] = asyncio.Semaphore(self.max_in_flight)
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        self._slots.pop(websocket, None)
+
+        # Fail the requests that can no longer be answered
+        for request_id, pending in list(self.pending_requests.items()):
+            if pending.websocket is websocket:
+                self.pending_requests.pop(request_id)
+                if not pending.future.done():
+                    pending.future.set_exception(RpcError("Cockpit disconnected"))
 
     async def send_message(self, websocket: WebSocket, message: dict):
         await websocket.send_text(json.dumps(message))
@@ -29,11 +91,14 @@ class ConnectionManager:
 
             # Check if this is a response to a pending request
             if "id" in message and message["id"] in self.pending_requests:
-                future = self.pending_requests.pop(message["id"])
+                future = self.pending_requests.pop(message["id"]).future
+                if future.done():
+                    # Caller already gave up
+                    return
                 if "result" in message:
                     future.set_result(message["result"])
                 elif "error" in message:
-                    future.set_exception(Exception(f"RPC Error: {message['error']}"))
+                    future.set_exception(RpcError(f"RPC Error: {message['error']}"))
                 else:
                     future.set_result(None)
             else:
@@ -54,35 +119,53 @@ class ConnectionManager:
         method: str,
         params: dict | None = None,
         request_id: int | None = None,
+        timeout: float | None = None,
     ) -> Any:
         """Send a JSON-RPC request and wait for response"""
         if params is None:
             params = {}
         if request_id is None:
-            # Generate a unique request ID
-            request_id = id(params) + int(asyncio.get_event_loop().time() * 1000000)
-
-        # Create a Future to wait for the response
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
-
-        message = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-            "params": params,
-        }
+            request_id = next(self._ids)
+        if timeout is None:
+            timeout = RPC_TIMEOUTS_S.get(method, DEFAULT_RPC_TIMEOUT_S)
 
-        try:
-            await self.send_message(websocket, message)
-            # Wait for the response with timeout
-            result = await asyncio.wait_for(future, timeout=2.0)
+        stats = self.rpc_stats.setdefault(method, RpcMethodStats())
+        stats.calls += 1
+
+        slots = self._slots.get(websocket)
+        if slots is None:
+            stats.errors += 1
+            raise RpcError("Cockpit not connected")
+
+        async with slots:
+            # Create a Future to wait for the response
+            pending = PendingRequest(future=asyncio.get_running_loop().create_future(), websocket=websocket, method=method)
+            self.pending_requests[request_id] = pending
+
+            message = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params,
+            }
+
+            try:
+                await self.send_message(websocket, message)
+                # Wait for the response with timeout
+                result = await asyncio.wait_for(pending.future, timeout=timeout)
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                raise RpcTimeoutError(f"Request timeout: {method} after {timeout:.1f}s")
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                # Clean up the pending request
+                self.pending_requests.pop(request_id, None)
+
+            stats.latencies_ms.append((time.perf_counter() - pending.sent_at) * 1000)
             return result
-        except asyncio.TimeoutError:
-            # Clean up the pending request
-            self.pending_requests.pop(request_id, None)
-            raise Exception("Request timeout")
-        except Exception as e:
-            # Clean up the pending request
-            self.pending_requests.pop(request_id, None)
-            raise e
+
+    def rpc_metrics(self) -> dict[str, dict]:
+        """Call counts and latency percentiles per RPC method."""
+        return {method: stats.summary() for method, stats in sorted(self.rpc_stats.items())}
@@ -0,0 +1,142 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cached_property
+
+# Always offered to the model, whatever the command
+ESSENTIAL_FUNCTIONS = ("system.getState",)
+
+# Spoken words that the function descriptions phrase differently
+_SYNONYMS = {
+    "song": "track",
+    "songs": "track",
+    "music": "media",
+    "tune": "track",
+    "skip": "next",
+    "resume": "play",
+    "stop": "pause",
+    "hot": "temperature",
+    "cold": "temperature",
+    "warm": "temperature",
+    "cool": "temperature",
+    "degrees": "temperature",
+    "ac": "climate",
+    "air": "fan",
+    "navigate": "navigation",
+    "route": "navigation",
+    "directions": "navigation",
+    "drive": "destination",
+    "go": "destination",
+    "window": "windows",
+    "speaker": "voice",
+    "radio": "media",
+    "player": "media",
+}
+
+_STOP_WORDS = {"a", "an", "the", "to", "of", "and", "or", "for", "in", "on", "is", "be", "it", "please", "my"}
+# Command verbs that say nothing about which subsystem is meant ("turn off the radio")
+_STOP_WORDS |= {"turn", "switch", "off", "make", "can", "you", "i", "want"}
+
+
+def _tokenize(text: str) -> list[str]:
+    # Split camelCase names ("setDestination" -> "set destination")
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text).lower()
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", text):
+        if word in _STOP_WORDS:
+            continue
+        word = _SYNONYMS.get(word, word)
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _document(function: dict) -> str:
+    """Text indexed for a function: name, description and parameter descriptions."""
+    parts = [function["name"].replace(".", " "), function.get("description", "")]
+    for name, param in function.get("parameters", {}).get("properties", {}).items():
+        parts += [name, param.get("description", "")]
+    return " ".join(parts)
+
+
+@dataclass
+class FunctionSelection:
+    query: str
+    functions: list[dict]
+    scores: dict[str, float]
+    fallback: bool = False
+
+    @property
+    def names(self) -> list[str]:
+        return [f["name"] for f in self.functions]
+
+
+@dataclass
+class FunctionIndex:
+    """BM25 keyword index over the cockpit functions.
+
+    `select()` returns the top-k functions for a command plus the essentials, in
+    `functions.json` order. Keeping a stable order means identical selections
+    produce byte-identical prompts, which llama-server serves from its prompt cache.
+
+    Weak matches are cut: when the best score is below `min_score` the full list
+    is used, candidates scoring under `relative_cut` times the best are dropped,
+    and every function in the best match's namespace (e.g. all `climate.*`) is
+    offered, so the model can still pick a sibling of the top hit.
+    """
+
+    functions: list[dict]
+    essentials: tuple[str, ...] = ESSENTIAL_FUNCTIONS
+    k1: float = 1.2
+    b: float = 0.75
+    min_score: float = 1.5
+    relative_cut: float = 0.5
+    _postings: dict[str, list[tuple[int, int]]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        docs = [_tokenize(_document(f)) for f in self.functions]
+        self._doc_len = [len(d) for d in docs]
+        self._avg_len = sum(self._doc_len) / max(len(docs), 1)
+
+        self._postings = {}
+        for i, doc in enumerate(docs):
+            for term, tf in Counter(doc).items():
+                self._postings.setdefault(term, []).append((i, tf))
+
+        n = len(docs)
+        self._idf = {
+            term: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    @cached_property
+    def _positions(self) -> dict[str, int]:
+        return {f["name"]: i for i, f in enumerate(self.functions)}
+
+    def scores(self, query: str) -> dict[str, float]:
+        scores: Counter[int] = Counter()
+        for term in set(_tokenize(query)):
+            for i, tf in self._postings.get(term, ()):
+                norm = tf + self.k1 * (1 - self.b + self.b * self._doc_len[i] / self._avg_len)
+                scores[i] += self._idf[term] * tf * (self.k1 + 1) / norm
+        return {self.functions[i]["name"]: round(score, 3) for i, score in scores.most_common()}
+
+    def select(self, query: str, top_k: int = 6) -> FunctionSelection:
+        """Relevant functions for `query` plus the essentials; all functions if nothing matches well."""
+        scores = self.scores(query)
+        best_name, best = next(iter(scores.items()), ("", 0.0))
+        if best < self.min_score:
+            return FunctionSelection(query=query, functions=self.functions, scores=scores, fallback=True)
+
+        candidates = [name for name, score in scores.items() if score >= self.relative_cut * best][:top_k]
+        namespace = best_name.split(".")[0] + "."
+        siblings = [f["name"] for f in self.functions if f["name"].startswith(namespace)]
+        names = set(candidates) | set(siblings) | {n for n in self.essentials if n in self._positions}
+        selected = sorted(names, key=self._positions.__getitem__)
+        return FunctionSelection(
+            query=query,
+            functions=[self.functions[self._positions[n]] for n in selected],
+            scores=scores,
+        )
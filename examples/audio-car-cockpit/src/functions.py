@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
 from .connection_manager import ConnectionManager
@@ -102,4 +102,52 @@ def create_functions_router(manager: ConnectionManager) -> APIRouter:
                 content={"status": "error", "message": error_msg},
             )
 
+    @router.get("/debug/rpc-metrics")
+    async def debug_rpc_metrics():
+        """
+        Debug endpoint: Call counts, errors, timeouts and latency percentiles per cockpit RPC method.
+        """
+        return JSONResponse(
+            content={
+                "status": "success",
+                "in_flight": len(manager.pending_requests),
+                "methods": manager.rpc_metrics(),
+            }
+        )
+
+    @router.get("/debug/select-functions/{query}")
+    async def debug_select_functions(query: str, request: Request):
+        """
+        Debug endpoint: Show which functions the retrieval stage offers to the model for a command.
+        Prints results to terminal and returns JSON response.
+
+        Args:
+            query: Voice command, e.g. "open the window"
+        """
+        tcr = request.app.state.tcr
+        selection = tcr.function_index.select(query, top_k=tcr.retrieval_top_k)
+        prompt = tcr.system_prompt_for(query)
+
+        print("\n" + "=" * 80)
+        print(f"[DEBUG] Function selection for query: '{query}'")
+        print("=" * 80)
+        if selection.fallback:
+            print("No function matched well enough, the full function list is used.")
+        for name in selection.names:
+            print(f"- {name} (score: {selection.scores.get(name, 0.0)})")
+        print(f"\nPrompt size: {len(prompt)} chars (full list: {len(tcr.system_prompt)} chars)")
+        print("=" * 80 + "\n")
+
+        return JSONResponse(
+            content={
+                "status": "success",
+                "query": query,
+                "fallback": selection.fallback,
+                "selected": selection.names,
+                "scores": selection.scores,
+                "prompt_chars": len(prompt),
+                "full_prompt_chars": len(tcr.system_prompt),
+            }
+        )
+
     return router
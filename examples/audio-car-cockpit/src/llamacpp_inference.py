@@ -1,17 +1,23 @@
 import ast
+import asyncio
 import json
 import signal
 import subprocess
-from collections.abc import Generator
+from collections.abc import Coroutine, Generator
 from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime
+from functools import cache
 from pathlib import Path
 from time import sleep
-from typing import AsyncGenerator, overload
+from typing import AsyncGenerator, Self, overload
 
 import httpx
+import jinja2
 from httpx_retries import Retry, RetryTransport
+from jinja2.sandbox import ImmutableSandboxedEnvironment
 
+from src.function_retrieval import FunctionIndex
 from src.utils import find_available_port
 
 
@@ -147,14 +153,92 @@ def spawn_server(
                 embedding_process.wait()
 
 
+def _raise_exception(message: str):
+    raise jinja2.TemplateError(message)
+
+
+@cache
+def _compile_template(source: str) -> jinja2.Template:
+    """Compile a chat template the way HF tokenizers and llama-server's Jinja mode do."""
+    env = ImmutableSandboxedEnvironment(trim_blocks=True, lstrip_blocks=True)
+    env.filters["tojson"] = lambda x, indent=None, **_: json.dumps(x, indent=indent, ensure_ascii=False)
+    env.globals["raise_exception"] = _raise_exception
+    env.globals["strftime_now"] = lambda fmt: datetime.now().strftime(fmt)
+    return env.from_string(source)
+
+
+@dataclass(frozen=True)
+class ChatTemplate:
+    """Chat template read from the GGUF metadata of the served model."""
+
+    source: str
+    bos_token: str = ""
+    eos_token: str = ""
+
+    def render(self, messages: list[dict]) -> str:
+        return _compile_template(self.source).render(
+            messages=messages,
+            bos_token=self.bos_token,
+            eos_token=self.eos_token,
+            add_generation_prompt=True,
+        )
+
+
+# One template per model file, shared by every runtime serving that model
+_chat_templates: dict[str, ChatTemplate] = {}
+
+
+async def load_chat_template(client: httpx.AsyncClient, timeout: float = 30.0) -> ChatTemplate | None:
+    """Fetch the model's chat template from llama-server `/props`, cached per model."""
+    response = await client.get("/props", timeout=timeout)
+    response.raise_for_status()
+    props: dict = response.json()
+
+    source = props.get("chat_template")
+    if not source:
+        return None
+
+    model = props.get("model_path") or source
+    if model not in _chat_templates:
+        _chat_templates[model] = ChatTemplate(
+            source=source,
+            bos_token=props.get("bos_token") or "",
+            eos_token=props.get("eos_token") or "",
+        )
+    return _chat_templates[model]
+
+
 @dataclass(kw_only=True)
 class ToolCallingRuntime:
+    """Async client for the tool calling llama-server.
+
+    One pooled `httpx.AsyncClient` is shared by every request for the lifetime of
+    the runtime. Use it as an async context manager (warmup on enter, close on exit),
+    or `SyncToolCallingRuntime` from scripts.
+    """
+
     port: int
     host: str = "localhost"
     max_tokens: int = 4096
+    connect_timeout: float = 5.0
+    template_timeout: float = 30.0
+    completion_timeout: float = 300.0
+    retries: int = 3
+    backoff_factor: float = 0.1
+    max_connections: int = 8
+    retrieve_functions: bool = True
+    retrieval_top_k: int = 6
 
     def __post_init__(self):
-        self.client = httpx.Client(transport=RetryTransport(retry=Retry(total=3, backoff_factor=0.1)))
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Content-Type": "application/json"},
+            timeout=httpx.Timeout(self.completion_timeout, connect=self.connect_timeout),
+            transport=RetryTransport(
+                transport=httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=self.max_connections)),
+                retry=Retry(total=self.retries, backoff_factor=self.backoff_factor),
+            ),
+        )
 
         self.default_completion_params: dict[str, float | int | bool] = {
             "temperature": 0.0,
@@ -165,59 +249,122 @@ class ToolCallingRuntime:
         assert path_functions_def.exists(), f"Function definition file not found: {path_functions_def}"
 
         self.list_functions: list[dict] = json.loads(path_functions_def.read_bytes())["functions"]
+        self.function_index = FunctionIndex(self.list_functions)
+
+        # Full prompt, used when retrieval is off or finds nothing relevant
+        self.system_prompt = self._build_system_prompt(self.list_functions)
+        # Prompts per selection of function names, reused across turns
+        self._system_prompts: dict[tuple[str, ...], str] = {}
+
+        self._last_messages: list[dict] = []
+
+        # Render prompts locally to skip the /apply-template round trip. The first
+        # render is checked against the server; on any mismatch we keep using the server.
+        self._template: ChatTemplate | None = None
+        self._template_verified = False
+
+    async def __aenter__(self) -> Self:
+        await self.warmup()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def warmup(self) -> None:
+        try:
+            self._template = await load_chat_template(self.client, timeout=self.template_timeout)
+        except httpx.HTTPError as e:
+            print(f"Could not read the chat template, using /apply-template: {e}")
+
+        print("Inference warming...", end=" ")
+        _ = await self.completion("Turn on the audio.")
+        print("Done")
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
 
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @staticmethod
+    def _build_system_prompt(functions: list[dict]) -> str:
         # Prepare as a string with a flat layout
-        self.all_functions_no_indent: str = json.dumps(self.list_functions, indent=2, ensure_ascii=False)
+        functions_str = json.dumps(functions, indent=2, ensure_ascii=False)
 
         _instructions = (
             """If you call a function, also output a brief message for the user. The message should be concise."""
         )
 
-        self.system_prompt = f"""List of tools:
+        return f"""List of tools:
 
-<|tool_list_start|>{self.all_functions_no_indent}<|tool_list_end|>
+<|tool_list_start|>{functions_str}<|tool_list_end|>
 
 {_instructions}"""
 
-        self._last_messages: list[dict] = []
+    def system_prompt_for(self, content: str) -> str:
+        """Prompt listing only the functions retrieved for `content`."""
+        if not self.retrieve_functions:
+            return self.system_prompt
 
-        # Warmup
-        print("Inference warming...", end=" ")
-        _ = self.completion("Turn on the audio.")
-        print("Done")
+        selection = self.function_index.select(content, top_k=self.retrieval_top_k)
+        if selection.fallback:
+            return self.system_prompt
 
-    def __del__(self):
-        self.client.close()
-
-    def _apply_template(self, content: str) -> str:
-        response = self.client.post(
-            f"http://{self.host}:{self.port}/apply-template",
-            json={
-                "messages": [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": content},
-                ]
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
+        key = tuple(selection.names)
+        if key not in self._system_prompts:
+            self._system_prompts[key] = self._build_system_prompt(selection.functions)
+        return self._system_prompts[key]
+
+    def _messages(self, content: str) -> list[dict]:
+        return [
+            {"role": "system", "content": self.system_prompt_for(content)},
+            {"role": "user", "content": content},
+        ]
+
+    async def _format_prompt(self, content: str) -> str:
+        if self._template is not None:
+            try:
+                formatted_prompt = self._template.render(self._messages(content))
+            except jinja2.TemplateError as e:
+                print(f"Local chat template failed, using /apply-template: {e}")
+                self._template = None
+            else:
+                if self._template_verified:
+                    return formatted_prompt
+                if formatted_prompt == await self._apply_template(content):
+                    self._template_verified = True
+                    return formatted_prompt
+                print("Local chat template differs from llama-server, using /apply-template")
+                self._template = None
+
+        return await self._apply_template(content)
+
+    async def _apply_template(self, content: str) -> str:
+        response = await self.client.post(
+            "/apply-template",
+            json={"messages": self._messages(content)},
+            timeout=self.template_timeout,
         )
         response.raise_for_status()
         formatted_prompt: str = response.json().get("prompt")
         return formatted_prompt
 
-    def _completion(self, content: str) -> tuple[str | None, str]:
-        formatted_prompt = self._apply_template(content)
+    async def _completion(self, content: str) -> tuple[str | None, str]:
+        formatted_prompt = await self._format_prompt(content)
 
-        response = self.client.post(
-            f"http://{self.host}:{self.port}/completion",
-            json=self.default_completion_params
-            | {
-                "prompt": formatted_prompt,
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=300.0,
-        )
-        response.raise_for_status()
+        try:
+            response = await self.client.post(
+                "/completion",
+                json=self.default_completion_params
+                | {
+                    "prompt": formatted_prompt,
+                },
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            print(f"Failed on:\n{content}\n{e}")
+            raise
         j = response.json()
         rez: str = j.get("content")
 
@@ -239,38 +386,55 @@ class ToolCallingRuntime:
         https://html.spec.whatwg.org/multipage/server-sent-events.html
         """
 
-        formatted_prompt = self._apply_template(content)
+        formatted_prompt = await self._format_prompt(content)
 
-        async with httpx.AsyncClient() as aclient:
-            async with aclient.stream(
-                "post",
-                f"http://{self.host}:{self.port}/completion",
-                json=self.default_completion_params
-                | {
-                    "prompt": formatted_prompt,
-                    "stream": True,
-                },
-                headers={"Content-Type": "application/json"},
-                timeout=300.0,
-            ) as r:
-                async for x in r.aiter_text():
-                    yield x
+        async with self.client.stream(
+            "post",
+            "/completion",
+            json=self.default_completion_params
+            | {
+                "prompt": formatted_prompt,
+                "stream": True,
+            },
+        ) as r:
+            async for x in r.aiter_text():
+                yield x
 
     @overload
     def completion(
         self,
         content: str,
-    ) -> tuple[str | None, str]: ...
+    ) -> Coroutine[None, None, tuple[str | None, str]]: ...
 
     @overload
     def completion(self, content: str, stream: bool = True) -> AsyncGenerator[str, None]: ...
 
-    def completion(self, content: str, stream: bool = False) -> tuple[str | None, str] | AsyncGenerator[str, None]:
-        try:
-            if stream:
-                return self._completion_stream(content)
-            else:
-                return self._completion(content)
-        except httpx.HTTPStatusError as e:
-            print(f"Failed on:\n{content}\n{e}")
-            raise
+    def completion(
+        self, content: str, stream: bool = False
+    ) -> Coroutine[None, None, tuple[str | None, str]] | AsyncGenerator[str, None]:
+        """Await for `(tool_call, text)`, or iterate with `stream=True` for raw SSE chunks."""
+        if stream:
+            return self._completion_stream(content)
+        return self._completion(content)
+
+
+class SyncToolCallingRuntime:
+    """Blocking wrapper around `ToolCallingRuntime` for scripts, on a private event loop."""
+
+    def __init__(self, **kwargs):
+        self._loop = asyncio.new_event_loop()
+        self.runtime = ToolCallingRuntime(**kwargs)
+        self._loop.run_until_complete(self.runtime.warmup())
+
+    def completion(self, content: str) -> tuple[str | None, str]:
+        return self._loop.run_until_complete(self.runtime.completion(content))
+
+    def close(self) -> None:
+        self._loop.run_until_complete(self.runtime.aclose())
+        self._loop.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
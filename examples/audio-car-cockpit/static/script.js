@@ -3,6 +3,11 @@
     return Math.min(max, Math.max(min, value));
   }
 
+  // Binary /ws-audio frames, keep in sync with src/audio_frames.py
+  const AUDIO_FRAME_HEADER_BYTES = 12;
+  const AUDIO_FRAME_PCM_S16LE = 1;
+  const AUDIO_FRAME_FLAG_LAST = 0x01;
+
   /* ========================================================================
      CAPTION - overlay of the transcribed audio
      ======================================================================== */
@@ -134,9 +139,11 @@
         isRecording: false,
         isProcessing: false,
         isPlayingAudio: false,
-        mediaRecorder: null,
-        audioChunks: [],
-        recordedBlob: null,
+        capture: null, // Microphone stream and audio nodes while recording
+        uploadSequence: 0,
+        pendingFrames: [], // Frames captured before the socket opened
+        resamplePos: 0,
+        resampleLast: 0, // Last input sample of the previous block, read when resamplePos < 0
         audioWs: null,
         selectedVoice: 'US female',
         audioContext: null,
@@ -668,17 +675,27 @@
 
       try {
         const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
-        this.audio.mediaRecorder = new MediaRecorder(stream);
-        this.audio.audioChunks = [];
-
-        this.audio.mediaRecorder.ondataavailable = (e) => this.audio.audioChunks.push(e.data);
-        this.audio.mediaRecorder.onstop = () => {
-          this.audio.recordedBlob = new Blob(this.audio.audioChunks, { type: 'audio/webm' });
-          stream.getTracks().forEach(track => track.stop());
-          this.audioSendRequest();
+
+        // Open the socket now so audio is uploaded while the user is talking
+        this.audioOpenSocket();
+        this.audio.uploadSequence = 0;
+        this.audio.pendingFrames = [];
+        this.audio.resamplePos = 0;
+        this.audio.resampleLast = 0;
+
+        // Capture raw PCM at the device rate, resampled to 16 kHz per block
+        const context = new AudioContext();
+        const source = context.createMediaStreamSource(stream);
+        const processor = context.createScriptProcessor(4096, 1, 1);
+        processor.onaudioprocess = (e) => {
+          if (!this.audio.isRecording) return;
+          const samples = this.resampleTo16k(e.inputBuffer.getChannelData(0), context.sampleRate);
+          this.audioSendFrame(this.floatToPcm16(samples), false);
         };
+        source.connect(processor);
+        processor.connect(context.destination);
 
-        this.audio.mediaRecorder.start();
+        this.audio.capture = { stream, context, source, processor };
         this.audio.isRecording = true;
         this.renderAudio();
         return true;
@@ -689,18 +706,19 @@
     }
 
     audioStopRecording() {
-      if (!this.audio.isRecording || !this.audio.mediaRecorder) return false;
+      if (!this.audio.isRecording || !this.audio.capture) return false;
 
-      if (this.audio.mediaRecorder.state === 'recording') {
-        this.audio.mediaRecorder.stop();
-        this.audio.isRecording = false;
-        this.renderAudio();
-      }
-      return true;
-    }
+      const { stream, context, source, processor } = this.audio.capture;
+      processor.onaudioprocess = null;
+      source.disconnect();
+      processor.disconnect();
+      stream.getTracks().forEach(track => track.stop());
+      context.close();
+      this.audio.capture = null;
+      this.audio.isRecording = false;
 
-    async audioSendRequest() {
-      if (!this.audio.recordedBlob) return;
+      // Empty last frame: tells the server to start ASR on what it received
+      this.audioSendFrame(new ArrayBuffer(0), true);
 
       this.audio.isProcessing = true;
       this.audio.transcribedText = '';
@@ -711,31 +729,51 @@
       this.audio.nextStartTime = 0;
       this.audio.scheduledSources = [];
       this.renderAudio();
+      return true;
+    }
 
+    audioSendFrame(pcmBuffer, last) {
+      const frame = this.encodeAudioFrame(AUDIO_FRAME_PCM_S16LE, 16000, this.audio.uploadSequence++, pcmBuffer, last);
+      const ws = this.audio.audioWs;
+      if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(frame);
+      } else {
+        // Socket still connecting: flushed in onopen
+        this.audio.pendingFrames.push(frame);
+      }
+    }
+
+    audioOpenSocket() {
       try {
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
         // Connect to main server's audio endpoint
         const url = `${protocol}//${window.location.host}/ws-audio`;
 
         this.audio.audioWs = new WebSocket(url);
-
-        this.audio.audioWs.onopen = async () => {
-          // Convert to WAV and send
-          const wavBlob = await this.convertToWav(this.audio.recordedBlob);
-          const reader = new FileReader();
-          reader.onload = () => {
-            const audioB64 = reader.result.split(',')[1];
-            const payload = {
-              mode: 'asr',
-              audio: audioB64,
-              voice: this.audio.selectedVoice
-            };
-            this.audio.audioWs.send(JSON.stringify(payload));
+        this.audio.audioWs.binaryType = 'arraybuffer';
+
+        this.audio.audioWs.onopen = () => {
+          // Announce the upload, then send the audio captured so far
+          const payload = {
+            mode: 'asr',
+            stream_audio: true,
+            voice: this.audio.selectedVoice
           };
-          reader.readAsDataURL(wavBlob);
+          this.audio.audioWs.send(JSON.stringify(payload));
+          for (const frame of this.audio.pendingFrames) {
+            this.audio.audioWs.send(frame);
+          }
+          this.audio.pendingFrames = [];
         };
 
         this.audio.audioWs.onmessage = (e) => {
+          if (e.data instanceof ArrayBuffer) {
+            // Synthesized audio, played while the rest is still being generated
+            const frame = this.decodeAudioFrame(e.data);
+            this.queueAudioChunk(new Float32Array(frame.payload), frame.sampleRate);
+            return;
+          }
+
           const msg = JSON.parse(e.data);
 
           if (msg.type === 'text') {
@@ -748,9 +786,6 @@
             } else if (msg.role === 'model') {
               this.captions.updateModel(msg.text, msg.tool, msg.tool_valid);
             }
-          } else if (msg.type === 'audio') {
-            // Queue audio chunk for streaming playback
-            this.queueAudioChunk(msg.data, msg.sample_rate);
           } else if (msg.type === 'done') {
             // Server has completed the full pipeline (ASR → Tool Calling → TTS)
             if (this.audio.transcribedText) {
@@ -782,7 +817,7 @@
           }
         };
       } catch (err) {
-        console.error('Error sending audio:', err);
+        console.error('Error opening audio socket:', err);
         this.audio.isProcessing = false;
         this.renderAudio();
       }
@@ -803,57 +838,61 @@
       this.audio.audioWs.send(JSON.stringify(payload));
     }
 
-    async convertToWav(blob) {
-      const audioContext = new AudioContext({ sampleRate: 16000 });
-      const arrayBuffer = await blob.arrayBuffer();
-      const audioBuffer = await audioContext.decodeAudioData(arrayBuffer);
-
-      const samples = audioBuffer.getChannelData(0);
-      const wavBuffer = this.encodeWav(samples, 16000);
-      return new Blob([wavBuffer], { type: 'audio/wav' });
+    resampleTo16k(samples, inputRate) {
+      if (inputRate === 16000) return Float32Array.from(samples);
+
+      // Linear interpolation; the read position carries over between blocks and
+      // can start in [-1, 0), between the previous block's last sample and ours
+      const step = inputRate / 16000;
+      const out = [];
+      let pos = this.audio.resamplePos;
+      while (pos < samples.length - 1) {
+        const i = Math.floor(pos);
+        const frac = pos - i;
+        const left = i < 0 ? this.audio.resampleLast : samples[i];
+        out.push(left * (1 - frac) + samples[i + 1] * frac);
+        pos += step;
+      }
+      this.audio.resamplePos = pos - samples.length;
+      if (samples.length > 0) this.audio.resampleLast = samples[samples.length - 1];
+      return Float32Array.from(out);
     }
 
-    encodeWav(samples, sampleRate) {
-      const buffer = new ArrayBuffer(44 + samples.length * 2);
+    floatToPcm16(samples) {
+      const buffer = new ArrayBuffer(samples.length * 2);
       const view = new DataView(buffer);
-
-      const writeString = (offset, string) => {
-        for (let i = 0; i < string.length; i++) {
-          view.setUint8(offset + i, string.charCodeAt(i));
-        }
-      };
-
-      // WAV header
-      writeString(0, 'RIFF');
-      view.setUint32(4, 36 + samples.length * 2, true);
-      writeString(8, 'WAVE');
-      writeString(12, 'fmt ');
-      view.setUint32(16, 16, true);
-      view.setUint16(20, 1, true);
-      view.setUint16(22, 1, true);
-      view.setUint32(24, sampleRate, true);
-      view.setUint32(28, sampleRate * 2, true);
-      view.setUint16(32, 2, true);
-      view.setUint16(34, 16, true);
-      writeString(36, 'data');
-      view.setUint32(40, samples.length * 2, true);
-
-      // Convert float to 16-bit PCM
-      let offset = 44;
       for (let i = 0; i < samples.length; i++) {
         const s = Math.max(-1, Math.min(1, samples[i]));
-        view.setInt16(offset, s < 0 ? s * 0x8000 : s * 0x7FFF, true);
-        offset += 2;
+        view.setInt16(i * 2, s < 0 ? s * 0x8000 : s * 0x7FFF, true);
       }
-
       return buffer;
     }
 
-    queueAudioChunk(base64Data, sampleRate) {
-      // Decode PCM data
-      const pcmBytes = Uint8Array.from(atob(base64Data), c => c.charCodeAt(0));
-      const floatArray = new Float32Array(pcmBytes.buffer);
+    encodeAudioFrame(format, sampleRate, sequence, payload, last) {
+      // Header layout: see src/audio_frames.py
+      const frame = new Uint8Array(AUDIO_FRAME_HEADER_BYTES + payload.byteLength);
+      const view = new DataView(frame.buffer);
+      view.setUint8(0, format);
+      view.setUint8(1, last ? AUDIO_FRAME_FLAG_LAST : 0);
+      view.setUint16(2, 0, true);
+      view.setUint32(4, sampleRate, true);
+      view.setUint32(8, sequence, true);
+      frame.set(new Uint8Array(payload), AUDIO_FRAME_HEADER_BYTES);
+      return frame.buffer;
+    }
 
+    decodeAudioFrame(buffer) {
+      const view = new DataView(buffer);
+      return {
+        format: view.getUint8(0),
+        last: (view.getUint8(1) & AUDIO_FRAME_FLAG_LAST) !== 0,
+        sampleRate: view.getUint32(4, true),
+        sequence: view.getUint32(8, true),
+        payload: buffer.slice(AUDIO_FRAME_HEADER_BYTES),
+      };
+    }
+
+    queueAudioChunk(floatArray, sampleRate) {
       // Calculate chunk duration in seconds
       const durationSec = floatArray.length / sampleRate;
 
@@ -942,7 +981,8 @@
 
     playAudio(base64Data, sampleRate) {
       // Legacy method for compatibility - now uses queue
-      this.queueAudioChunk(base64Data, sampleRate);
+      const pcmBytes = Uint8Array.from(atob(base64Data), c => c.charCodeAt(0));
+      this.queueAudioChunk(new Float32Array(pcmBytes.buffer), sampleRate);
     }
 
     audioTerminate() {
@@ -968,6 +1008,7 @@
       }
 
       // Clear audio queue and buffering state
+      this.audio.pendingFrames = [];
       this.audio.audioQueue = [];
       this.audio.isPlayingQueue = false;
       this.audio.totalBufferedMs = 0;
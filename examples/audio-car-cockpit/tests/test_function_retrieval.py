@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.function_retrieval import FunctionIndex
+
+
+@pytest.fixture(scope="module")
+def index() -> FunctionIndex:
+    functions = json.loads((Path(__file__).parent.parent / "functions.json").read_bytes())["functions"]
+    return FunctionIndex(functions)
+
+
+def test_radio_command_offers_media_functions(index: FunctionIndex):
+    selection = index.select("turn off the radio")
+
+    assert not selection.fallback
+    assert "media.pause" in selection.names
+    assert not any(name.startswith("navigation.") for name in selection.names)
+
+
+def test_temperature_command_offers_only_climate_functions(index: FunctionIndex):
+    selection = index.select("set the temperature to 22")
+
+    assert "climate.setTarget" in selection.names
+    assert {name.split(".")[0] for name in selection.names} == {"climate", "system"}
+
+
+def test_best_match_brings_its_whole_namespace(index: FunctionIndex):
+    selection = index.select("skip this song")
+
+    media = {f["name"] for f in index.functions if f["name"].startswith("media.")}
+    assert media <= set(selection.names)
+    assert "system.getState" in selection.names
+
+
+def test_unknown_command_falls_back_to_all_functions(index: FunctionIndex):
+    selection = index.select("turn on the lights")
+
+    assert selection.fallback
+    assert selection.functions == index.functions
+
+
+def test_selection_keeps_functions_json_order(index: FunctionIndex):
+    order = [f["name"] for f in index.functions]
+    names = index.select("pause the music").names
+
+    assert names == sorted(names, key=order.index)
@@ -1,5 +1,6 @@
 """Audio preprocessing module for LFM2 model compatibility."""
 
+import io
 import tempfile
 from collections.abc import Iterator
 
@@ -57,18 +58,27 @@ class AudioChunker:
         info = sf.info(audio_file_path)
         return info.duration, info.samplerate, info.frames
 
-    def create_chunks(self, audio_file_path: str) -> Iterator[tuple[str, float, float]]:
+    def create_chunks(
+        self, audio_file_path: str
+    ) -> Iterator[tuple[np.ndarray, float, float]]:
         """
-        Create audio chunks from file with timing information.
+        Create overlapping audio chunks from file with timing information.
+
+        The file is opened and decoded once, sequentially, into a single
+        chunk-sized float32 buffer. The overlap is carried over inside that
+        buffer, so no frame is decoded twice and memory stays bounded by one
+        chunk regardless of the file length.
 
         Args:
             audio_file_path: Path to audio file
 
         Yields:
-            Tuple of (chunk_file_path, start_time, end_time)
+            Tuple of (chunk_audio, start_time, end_time). chunk_audio is a view
+            into the reused buffer and is only valid until the next chunk is
+            requested; copy it, or encode it with chunk_to_wav_bytes, to keep it.
         """
         # Get audio info
-        total_duration, sample_rate, total_frames = self.get_audio_info(audio_file_path)
+        total_duration, sample_rate, _ = self.get_audio_info(audio_file_path)
 
         print(f"📊 Audio file: {total_duration:.1f}s, {sample_rate}Hz")
 
@@ -77,58 +87,49 @@ class AudioChunker:
         overlap_frames = int(self.overlap * sample_rate)
         step_frames = chunk_frames - overlap_frames
 
-        current_frame = 0
-        chunk_index = 0
-
-        while current_frame < total_frames:
-            # Calculate chunk boundaries
-            start_frame = current_frame
-            end_frame = min(current_frame + chunk_frames, total_frames)
+        with sf.SoundFile(audio_file_path) as audio_file:
+            mono = audio_file.channels == 1
+            buffer = np.zeros((chunk_frames, audio_file.channels), dtype=np.float32)
 
-            # Calculate timing
-            start_time = start_frame / sample_rate
-            end_time = end_frame / sample_rate
+            start_frame = 0
+            filled = 0  # Frames carried over from the previous chunk
 
-            # Read audio chunk
-            audio_chunk, _ = sf.read(
-                audio_file_path, start=start_frame, frames=end_frame - start_frame
-            )
+            while True:
+                frames_read = len(
+                    audio_file.read(
+                        dtype="float32", always_2d=True, out=buffer[filled:]
+                    )
+                )
+                if frames_read == 0:
+                    break
 
-            # Save chunk as temporary file
-            chunk_path = self._save_chunk(audio_chunk, sample_rate, chunk_index)
+                end = filled + frames_read
+                chunk = buffer[:end, 0] if mono else buffer[:end]
 
-            yield chunk_path, start_time, end_time
+                chunk_end = (start_frame + end) / sample_rate
+                yield chunk, start_frame / sample_rate, chunk_end
 
-            # Move to next chunk
-            current_frame += step_frames
-            chunk_index += 1
+                # Break if we've reached the end
+                if end < chunk_frames:
+                    break
 
-            # Break if we've reached the end
-            if end_frame >= total_frames:
-                break
+                # Carry the overlap to the front of the buffer and move on
+                buffer[:overlap_frames] = buffer[step_frames:end]
+                filled = overlap_frames
+                start_frame += step_frames
 
-    def _save_chunk(
-        self, audio_data: np.ndarray, sample_rate: int, chunk_index: int
-    ) -> str:
-        """
-        Save audio chunk as temporary WAV file.
 
-        Args:
-            audio_data: Audio data for this chunk
-            sample_rate: Sample rate
-            chunk_index: Index of this chunk
-
-        Returns:
-            Path to temporary chunk file
-        """
-        fd, temp_path = tempfile.mkstemp(
-            suffix=f"_chunk_{chunk_index}.wav", prefix="audio_chunk_"
-        )
-        import os
-
-        os.close(fd)
+def chunk_to_wav_bytes(audio_data: np.ndarray, sample_rate: int) -> bytes:
+    """
+    Encode an audio chunk as an in-memory 16-bit PCM WAV file.
 
-        # Save chunk
-        sf.write(temp_path, audio_data, sample_rate, subtype="PCM_16")
+    Args:
+        audio_data: Audio samples
+        sample_rate: Sample rate of the audio data
 
-        return temp_path
+    Returns:
+        Complete WAV file contents
+    """
+    buffer = io.BytesIO()
+    sf.write(buffer, audio_data, sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
@@ -0,0 +1,262 @@
+"""Long-lived audio model server, so the GGUF model is loaded once per session."""
+
+import base64
+import json
+import socket
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+
+
+@dataclass
+class ServerMetrics:
+    """Timing and reliability counters for the audio model server."""
+
+    startup_s: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    restarts: int = 0
+    total_request_s: float = 0.0
+    last_request_s: float = 0.0
+
+    @property
+    def mean_request_s(self) -> float:
+        return self.total_request_s / self.requests if self.requests else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"startup {self.startup_s:.1f}s | {self.requests} requests, "
+            f"mean {self.mean_request_s * 1000:.0f} ms | "
+            f"{self.failures} failures | {self.restarts} restarts"
+        )
+
+
+class AudioServerUnavailable(RuntimeError):
+    """The server could not be started, or crashed more often than allowed."""
+
+
+def _find_free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+class AudioModelServer:
+    """
+    Persistent llama.cpp audio server that receives chunks over a local socket.
+
+    The server keeps the model, the audio encoder and the decoder in memory and
+    exposes an OpenAI-compatible chat completions endpoint on 127.0.0.1. Each
+    chunk is sent as base64 WAV in an ``input_audio`` message, so transcribing
+    a chunk no longer pays the process start and model load.
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        asr_prompt: str,
+        host: str = "127.0.0.1",
+        startup_timeout: float = 120.0,
+        request_timeout: float = 30.0,
+        max_restarts: int = 3,
+    ):
+        """
+        Initialize the server handle. The process is started lazily.
+
+        Args:
+            command: Server command line without host/port arguments
+            asr_prompt: System prompt for the ASR task
+            host: Interface the server binds to
+            startup_timeout: Seconds to wait for the server to report healthy
+            request_timeout: Seconds to wait for a single transcription
+            max_restarts: Crash restarts allowed before giving up
+        """
+        self.command = command
+        self.asr_prompt = asr_prompt
+        self.host = host
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+        self.max_restarts = max_restarts
+
+        self.port: int | None = None
+        self.metrics = ServerMetrics()
+        self._process: subprocess.Popen | None = None
+        # Serializes start/restart when several workers share the server
+        self._lifecycle_lock = threading.Lock()
+        # Guards the request counters, which workers update concurrently
+        self._metrics_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def is_running(self) -> bool:
+        """Return True if the server process is alive."""
+        return self._process is not None and self._process.poll() is None
+
+    def is_healthy(self) -> bool:
+        """Return True if the server answers 200 on /health (503 while loading)."""
+        if not self.is_running():
+            return False
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/health", timeout=1.0) as r:
+                return r.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def start(self) -> None:
+        """
+        Start the server process and wait until it is healthy.
+
+        Raises:
+            AudioServerUnavailable: If the server exits or does not become
+                healthy in time
+        """
+        if self.is_running():
+            return
+
+        self.port = _find_free_port(self.host)
+        cmd = [*self.command, "--host", self.host, "--port", str(self.port)]
+
+        start_time = time.time()
+        try:
+            self._process = subprocess.Popen(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            raise AudioServerUnavailable(f"Failed to start audio server: {e}") from e
+
+        deadline = start_time + self.startup_timeout
+        delay = 0.1
+        while time.time() < deadline:
+            if not self.is_running():
+                raise AudioServerUnavailable(
+                    f"Audio server exited with code {self._process.returncode}"
+                )
+            if self.is_healthy():
+                self.metrics.startup_s = time.time() - start_time
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+        self.stop()
+        raise AudioServerUnavailable(
+            f"Audio server not healthy after {self.startup_timeout:.0f}s"
+        )
+
+    def restart(self) -> None:
+        """Restart the server after a crash."""
+        if self.metrics.restarts >= self.max_restarts:
+            raise AudioServerUnavailable(
+                f"Audio server crashed {self.metrics.restarts} times, giving up"
+            )
+        self.metrics.restarts += 1
+        self.stop()
+        self.start()
+
+    def stop(self) -> None:
+        """Terminate the server process."""
+        if self._process is None:
+            return
+        try:
+            self._process.terminate()
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    def transcribe_wav_bytes(self, wav_bytes: bytes) -> str:
+        """
+        Transcribe one WAV-encoded chunk.
+
+        A failed request (HTTP error, timeout or crash) is retried once,
+        after restarting the server if it is no longer running.
+
+        Args:
+            wav_bytes: Complete WAV file contents
+
+        Returns:
+            Raw text content produced by the model
+
+        Raises:
+            AudioServerUnavailable: If the server cannot be (re)started
+            RuntimeError: If the retry fails as well
+        """
+        self._ensure_running()
+
+        try:
+            return self._request(wav_bytes)
+        except (urllib.error.URLError, OSError):
+            self._count_failure()
+
+        self._ensure_running()
+        try:
+            return self._request(wav_bytes)
+        except (urllib.error.URLError, OSError) as e:
+            self._count_failure()
+            raise RuntimeError(f"Audio server request failed: {e}") from e
+
+    def _count_failure(self) -> None:
+        with self._metrics_lock:
+            self.metrics.failures += 1
+
+    def _ensure_running(self) -> None:
+        with self._lifecycle_lock:
+            if self.is_running():
+                return
+            if self._process is None:
+                self.start()
+            else:
+                self.restart()
+
+    def _request(self, wav_bytes: bytes) -> str:
+        payload = {
+            "model": "",
+            "messages": [
+                {"role": "system", "content": self.asr_prompt},
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_audio",
+                            "input_audio": {
+                                "data": base64.b64encode(wav_bytes).decode("ascii"),
+                                "format": "wav",
+                            },
+                        }
+                    ],
+                },
+            ],
+            "max_tokens": 512,
+        }
+        request = urllib.request.Request(
+            f"{self.base_url}/v1/chat/completions",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+
+        start_time = time.time()
+        with urllib.request.urlopen(request, timeout=self.request_timeout) as r:
+            response = json.loads(r.read())
+        elapsed = time.time() - start_time
+
+        with self._metrics_lock:
+            self.metrics.requests += 1
+            self.metrics.total_request_s += elapsed
+            self.metrics.last_request_s = elapsed
+
+        choices = response.get("choices") or []
+        if not choices:
+            return ""
+        return choices[0].get("message", {}).get("content") or ""
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -38,6 +38,35 @@ class Config(BaseSettings):
         default="llama-lfm2-audio", description="Name of the llama binary"
     )
 
+    # Persistent audio server settings
+    audio_server_enabled: bool = Field(
+        default=True,
+        description="Keep the model loaded in a long-lived server instead of "
+        "starting the CLI binary for every chunk (falls back to the CLI if the "
+        "server binary is missing or fails to start)",
+    )
+    audio_server_startup_timeout: float = Field(
+        default=120.0, description="Seconds to wait for the audio server to be healthy"
+    )
+    audio_server_request_timeout: float = Field(
+        default=30.0, description="Seconds to wait for a single chunk transcription"
+    )
+    audio_server_max_restarts: int = Field(
+        default=3, description="Crash restarts allowed before giving up"
+    )
+    audio_server_max_failures: int = Field(
+        default=3,
+        description="Consecutive failed chunks before the audio server is given up",
+    )
+
+    # Real-time pipeline settings
+    pipeline_workers: int = Field(
+        default=1, description="Number of chunk transcription worker threads"
+    )
+    pipeline_queue_size: int = Field(
+        default=4, description="Maximum audio chunks waiting for a worker"
+    )
+
     # Audio settings
     sample_rate: int = Field(default=48000, description="Audio sample rate in Hz")
     channels: int = Field(default=1, description="Number of audio channels")
@@ -64,6 +93,12 @@ class Config(BaseSettings):
     text_cleaning_temperature: float = Field(
         default=0.3, description="Temperature for text cleaning inference"
     )
+    text_cleaning_window_chunks: int = Field(
+        default=3, description="Number of transcribed chunks cleaned together"
+    )
+    text_cleaning_cache_size: int = Field(
+        default=256, description="Number of cleaned fragments kept in memory"
+    )
     text_cleaner_system_prompt: str = Field(
         default="""You are an AI assistant that cleans raw text transcripts. Your goal is to take the input text, which may contain repetitions or disfluencies, and produce a grammatically correct, coherent, and natural-sounding cleaned version. Do not add new information or alter the original meaning. The output should be a single, continuous paragraph.""",
         description="System prompt for the text cleaner model",
@@ -32,6 +32,7 @@ class ModelDownloader:
         )
         self.audiodecoder_filename = f"audiodecoder-LFM2-Audio-1.5B-{quantization}.gguf"
         self.llama_binary_name = "llama-lfm2-audio"
+        self.llama_server_binary_name = "llama-liquid-audio-server"
         self.asr_prompt = "Perform ASR."
 
         self._warm_up_llama_cpp()
@@ -41,6 +42,11 @@ class ModelDownloader:
         """Return the path to the llama-lfm2-audio binary for the current platform."""
         return Path(self.target_dir) / "runners" / self.platform / f"lfm2-audio-{self.platform}"
 
+    @property
+    def llama_server_binary_path(self) -> Path:
+        """Return the path to the persistent audio server binary, if shipped for this platform."""
+        return self.llama_cpp_binary_dir / self.llama_server_binary_name
+
     @property
     def model_path(self) -> Path:
         """Return the path to the main model file."""
@@ -124,6 +130,25 @@ class ModelDownloader:
             audio_file_path,
         ]
     
+    def get_server_command(self) -> list[str]:
+        """
+        Get command line arguments for the persistent audio server.
+
+        Host and port are appended by AudioModelServer.
+
+        Returns:
+            List of command arguments
+        """
+        return [
+            str(self.llama_server_binary_path),
+            "-m",
+            str(self.model_path),
+            "--mmproj",
+            str(self.mmproj_path),
+            "-mv",
+            str(self.audiodecoder_path),
+        ]
+
     def _validate_existing_download(self) -> bool:
         """Check if the target directory contains a valid download."""
         target_path = Path(self.target_dir)
@@ -2,12 +2,15 @@
 
 import os
 import subprocess
+import threading
 import time
 from pathlib import Path
 
-from .audio_preprocessing import AudioChunker
+from .audio_preprocessing import AudioChunker, chunk_to_wav_bytes
+from .audio_server import AudioModelServer, AudioServerUnavailable
 from .config import Config
 from .model_downloader import ModelDownloader
+from .pipeline import PipelineStats, TranscriptionPipeline, merge_overlap
 
 class LFM2AudioWrapper:
     """Wrapper for llama-lfm2-audio binary."""
@@ -22,6 +25,31 @@ class LFM2AudioWrapper:
         self.model_downloader = model_downloader
         self.config = config
 
+        # Persistent server, started on the first chunk. None means every chunk
+        # runs the CLI binary as a one-off subprocess.
+        self._server: AudioModelServer | None = None
+        # Set once the server can't be (re)started or has failed
+        # `audio_server_max_failures` chunks in a row; the server itself is only
+        # stopped by close(), so other workers never see it vanish.
+        self._server_failed = False
+        self._server_failures = 0  # consecutive chunks the server failed
+        self._server_lock = threading.Lock()
+        if config.audio_server_enabled:
+            server_binary = model_downloader.llama_server_binary_path
+            if server_binary.is_file():
+                self._server = AudioModelServer(
+                    command=model_downloader.get_server_command(),
+                    asr_prompt=model_downloader.asr_prompt,
+                    startup_timeout=config.audio_server_startup_timeout,
+                    request_timeout=config.audio_server_request_timeout,
+                    max_restarts=config.audio_server_max_restarts,
+                )
+            else:
+                print(
+                    f"⚠️ Audio server binary not found ({server_binary}), "
+                    "running the CLI binary per chunk"
+                )
+
         # # Validate configuration
         # if not self.model_downloader.validate_paths():
         #     raise ValueError("Invalid configuration: missing required files")
@@ -45,6 +73,13 @@ class LFM2AudioWrapper:
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
+        if self._active_server() is not None:
+            with open(audio_path, "rb") as f:
+                wav_bytes = f.read()
+            transcription = self._transcribe_with_server(wav_bytes)
+            if transcription is not None:
+                return transcription
+
         # Get command arguments
         # cmd = self.config.get_model_command(audio_path)
         cmd = self.model_downloader.get_model_command(audio_path)
@@ -75,6 +110,62 @@ class LFM2AudioWrapper:
         except Exception as e:
             raise RuntimeError(f"Model execution failed: {str(e)}")
 
+    def _transcribe_with_server(self, wav_bytes: bytes) -> str | None:
+        """
+        Transcribe a WAV chunk with the persistent server.
+
+        Args:
+            wav_bytes: Complete WAV file contents
+
+        Returns:
+            Transcribed text, or None if the server is unavailable and the
+            caller should fall back to the CLI binary
+        """
+        server = self._active_server()
+        if server is None:
+            return None
+        try:
+            content = server.transcribe_wav_bytes(wav_bytes)
+        except RuntimeError as e:
+            # This chunk falls back to the CLI binary; the server is only given
+            # up on when it can't be restarted or keeps failing.
+            with self._server_lock:
+                self._server_failures += 1
+                already_failed = self._server_failed
+                self._server_failed = already_failed or (
+                    isinstance(e, AudioServerUnavailable)
+                    or self._server_failures >= self.config.audio_server_max_failures
+                )
+                disabled_now = self._server_failed and not already_failed
+            if disabled_now:
+                print(f"\n⚠️ Audio server unavailable ({e}), falling back to CLI binary")
+            return None
+
+        with self._server_lock:
+            self._server_failures = 0
+
+        # Same filtering as the CLI path, so both produce identical text.
+        return self._parse_output(content.encode("utf-8"))
+
+    def _active_server(self) -> AudioModelServer | None:
+        """The persistent server, or None once it has failed or was never started."""
+        with self._server_lock:
+            return None if self._server_failed else self._server
+
+    def close(self) -> None:
+        """Stop the persistent audio server, if any. Call once all workers are done."""
+        with self._server_lock:
+            server, self._server = self._server, None
+        if server is not None:
+            print(f"📈 Audio server: {server.metrics.summary()}")
+            server.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def _parse_output(self, output: bytes) -> str:
         """
         Parse model output to extract transcription.
@@ -183,10 +274,17 @@ class LFM2AudioWrapper:
         Returns:
             Transcribed text
         """
+        if self._active_server() is not None:
+            # In-memory PCM: no filesystem round trip per chunk
+            wav_bytes = chunk_to_wav_bytes(audio_data, sample_rate)
+            transcription = self._transcribe_with_server(wav_bytes)
+            if transcription is not None:
+                return transcription
+
         # Import here to avoid circular imports
         from .audio_preprocessing import save_raw_audio_as_wav
 
-        # Save audio data to temporary file
+        # The CLI binary only reads files: save audio data to temporary file
         temp_file = save_raw_audio_as_wav(audio_data, sample_rate)
 
         try:
@@ -267,7 +365,7 @@ class LFM2AudioWrapper:
         chunker = AudioChunker(chunk_duration=chunk_duration, overlap=overlap)
 
         # Get audio info
-        total_duration, _, _ = chunker.get_audio_info(audio_path)
+        total_duration, sample_rate, _ = chunker.get_audio_info(audio_path)
 
         print(f"🎵 Starting real-time transcription of {audio_path}")
         print(f"📊 Duration: {total_duration:.1f}s | Chunk size: {chunk_duration}s")
@@ -277,8 +375,6 @@ class LFM2AudioWrapper:
 
         raw_transcription_parts = []  # Store raw chunks for context
         already_displayed_parts = []  # Track what's shown on console
-        chunk_files_to_cleanup = []
-        cleaning_line_count = 0  # Track console lines used for cleaning output
 
         # Initialize text cleaner BEFORE audio to minimize delay
         text_cleaner = None
@@ -321,78 +417,82 @@ class LFM2AudioWrapper:
                 print("🔊 Starting audio playback...")
                 audio_player.start_playback()
 
-        # Start timing after all initialization is complete
-        start_time = time.time()
+        pipeline = TranscriptionPipeline(
+            self.transcribe_audio_data,
+            num_workers=self.config.pipeline_workers,
+            queue_size=self.config.pipeline_queue_size,
+        )
+        stats = PipelineStats(audio_duration=total_duration)
+        previous_chunk = ""  # Raw text of the last non-empty chunk
 
-        # Process all chunks in unified loop
-        for chunk_path, chunk_start, chunk_end in chunker.create_chunks(audio_path):
-            chunk_files_to_cleanup.append(chunk_path)
+        cleaning_service = None
+        if text_cleaner:
+            from .text_cleaner import CleaningService
 
-            # Calculate when this chunk should be processed (real-time simulation)
-            expected_time = start_time + chunk_start
-            current_time = time.time()
+            cleaning_service = CleaningService(
+                text_cleaner, window_size=self.config.text_cleaning_window_chunks
+            )
 
-            # Wait if we're processing too fast (maintain real-time pace)
-            if current_time < expected_time:
-                wait_time = expected_time - current_time
-                time.sleep(wait_time)
+        def display(new_content: str) -> None:
+            """Append new content to the console line."""
+            if not new_content:
+                return
+            if typewriter_effect:
+                # Use typewriter effect for displaying new content
+                self._typewriter_display(
+                    " " + new_content,
+                    speed=self.config.typewriter_speed,
+                    respect_words=self.config.typewriter_respect_words,
+                )
+            else:
+                # Standard immediate display
+                print(" " + new_content, end="", flush=True)
+            already_displayed_parts.append(new_content)
 
-            # Process chunk
-            # breakpoint()
-            chunk_transcription = self.transcribe_audio_file(chunk_path)
+        # Start timing after all initialization is complete
+        start_time = time.time()
 
+        # Chunks are cut at real-time pace and transcribed in background
+        # threads; results come back here in chunk order for display.
+        chunks = chunker.create_chunks(audio_path)
+        for result in pipeline.run(chunks, sample_rate, start_time):
             # Log incremental transcription if logger is available
-            if raw_transcript_logger and chunk_transcription.strip():
-                raw_transcript_logger.log_incremental_chunk(chunk_transcription)
+            if raw_transcript_logger and result.text.strip():
+                raw_transcript_logger.log_incremental_chunk(result.text)
+
+            # Drop the words repeated from the overlap with the previous chunk
+            chunk_transcription = merge_overlap(previous_chunk, result.text)
+            if result.text.strip():
+                previous_chunk = result.text
 
             if chunk_transcription.strip():
                 # Accumulate raw transcription for context
                 raw_transcription_parts.append(chunk_transcription)
 
-                # Clean with context of last 2 chunks + current if text cleaner available
-                new_content = ""
-                if text_cleaner:
-                    raise Exception("Not implemented yet")
+                if cleaning_service:
+                    # Cleaned windows are displayed as the cleaner finishes them
+                    cleaning_service.submit(chunk_transcription)
+                    new_parts = cleaning_service.ready()
+                else:
+                    # No text cleaner - use raw chunk
+                    new_parts = [chunk_transcription]
 
-                    # Use context window: last 2 chunks + current chunk
-                    if len(raw_transcription_parts) >= 3:
-                        context_chunks = raw_transcription_parts[-3:]
-                    else:
-                        context_chunks = raw_transcription_parts
+                for new_content in new_parts:
+                    display(new_content)
 
-                    context_text = " ".join(context_chunks)
-                    cleaned_context = text_cleaner.clean_text(context_text)
+            stats.record(result, time.time())
 
-                    # Extract only new content
-                    new_content = self._extract_new_content(
-                        cleaned_context, already_displayed_parts, chunk_transcription
-                    )
-                else:
-                    # No text cleaner - use raw chunk
-                    new_content = chunk_transcription
-
-                # Append new content to console if we have any
-                if new_content:
-                    if typewriter_effect:
-                        # Use typewriter effect for displaying new content
-                        self._typewriter_display(
-                            " " + new_content,
-                            speed=self.config.typewriter_speed,
-                            respect_words=self.config.typewriter_respect_words,
-                        )
-                    else:
-                        # Standard immediate display
-                        print(" " + new_content, end="", flush=True)
-                    already_displayed_parts.append(new_content)
+        # Clean the last partial window
+        if cleaning_service:
+            for new_content in cleaning_service.close():
+                display(new_content)
+
+        stats.wall_s = time.time() - start_time
 
         # Stop audio playback
         if audio_player:
             audio_player.stop_playback()
 
-        # Clean up chunk files
-        for chunk_file in chunk_files_to_cleanup:
-            os.unlink(chunk_file)
-
         # Get final transcription from displayed parts or raw parts as fallback
         full_transcription = (
             " ".join(already_displayed_parts)
@@ -402,6 +502,7 @@ class LFM2AudioWrapper:
         print(f"\n{'-' * 60}")
         print(f"✅ Complete transcription ({time.time() - start_time:.1f}s):")
         print(f"📄 {full_transcription}")
+        print(f"⏱️ {stats.summary()}")
 
         return full_transcription
 
@@ -440,18 +541,3 @@ class LFM2AudioWrapper:
         """Clear previous console output lines."""
         for _ in range(line_count):
             print("\033[A\033[K", end="")  # Move up one line and clear it
-
-    def _extract_new_content(
-        self, cleaned_text: str, displayed_parts: list, raw_chunk: str = ""
-    ) -> str:
-        """Extract only new content from cleaned text."""
-        if not displayed_parts:
-            return cleaned_text
-
-        existing_text = " ".join(displayed_parts)
-        if cleaned_text.startswith(existing_text.strip()):
-            new_content = cleaned_text[len(existing_text) :].strip()
-            return new_content
-        else:
-            # Fallback: use raw chunk if cleaning changed too much
-            return raw_chunk
@@ -0,0 +1,224 @@
+"""Pipelined transcription: reader -> chunk queue -> workers -> ordered output."""
+
+import queue
+import re
+import statistics
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+import numpy as np
+
+_SENTINEL = object()
+
+
+@dataclass
+class ChunkResult:
+    """Transcription of one chunk, with its timing."""
+
+    index: int
+    text: str
+    chunk_start: float
+    chunk_end: float
+    released_at: float  # Wall-clock time the chunk was cut and queued
+    inference_s: float
+
+
+@dataclass
+class PipelineStats:
+    """Real-time factor and end-to-end lag of one pipelined run."""
+
+    audio_duration: float = 0.0
+    wall_s: float = 0.0
+    inference_s: list[float] = field(default_factory=list)
+    lags_s: list[float] = field(default_factory=list)
+
+    def record(self, result: ChunkResult, displayed_at: float) -> None:
+        self.inference_s.append(result.inference_s)
+        self.lags_s.append(displayed_at - result.released_at)
+
+    @property
+    def real_time_factor(self) -> float:
+        """Model time per second of audio; below 1.0 keeps up with real time."""
+        if not self.audio_duration:
+            return 0.0
+        return sum(self.inference_s) / self.audio_duration
+
+    def summary(self) -> str:
+        if not self.lags_s:
+            return "no chunks processed"
+        lags_ms = sorted(lag * 1000 for lag in self.lags_s)
+        p95 = lags_ms[min(len(lags_ms) - 1, int(0.95 * len(lags_ms)))]
+        return (
+            f"RTF {self.real_time_factor:.2f} | "
+            f"lag p50 {statistics.median(lags_ms):.0f} ms, "
+            f"p95 {p95:.0f} ms, max {lags_ms[-1]:.0f} ms | "
+            f"{len(self.lags_s)} chunks in {self.wall_s:.1f}s"
+        )
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def merge_overlap(previous: str, current: str, max_words: int = 8) -> str:
+    """
+    Drop the words of `current` that repeat the end of `previous`.
+
+    Consecutive chunks overlap in time, so the model often transcribes the
+    same words at the end of one chunk and the start of the next. The longest
+    run (up to `max_words`) where the tail of `previous` equals the head of
+    `current`, ignoring case and punctuation, is removed from `current`.
+
+    Args:
+        previous: Text already emitted for the previous chunk
+        current: Text for the current chunk
+
+    Returns:
+        The new part of `current`
+    """
+    prev_words = [_normalize_word(w) for w in previous.split()]
+    curr_raw = current.split()
+    curr_words = [_normalize_word(w) for w in curr_raw]
+
+    for n in range(min(max_words, len(prev_words), len(curr_words)), 0, -1):
+        if prev_words[-n:] == curr_words[:n] and any(curr_words[:n]):
+            return " ".join(curr_raw[n:])
+    return current
+
+
+class TranscriptionPipeline:
+    """
+    Runs chunk transcription off the display path.
+
+    An audio reader thread cuts chunks at real-time pace into a bounded
+    queue, `num_workers` inference threads transcribe them, and `run()`
+    yields the results back in chunk order. A slow chunk therefore delays
+    only its own output instead of the cutting of every chunk after it.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray, int], str],
+        num_workers: int = 1,
+        queue_size: int = 4,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            transcribe: Function mapping (audio chunk, sample rate) to text
+            num_workers: Number of inference threads
+            queue_size: Maximum chunks waiting for a worker
+        """
+        self.transcribe = transcribe
+        self.num_workers = max(1, num_workers)
+        self.queue_size = queue_size
+
+    def run(
+        self,
+        chunks: Iterator[tuple[np.ndarray, float, float]],
+        sample_rate: int,
+        start_time: float,
+    ) -> Iterator[ChunkResult]:
+        """
+        Transcribe chunks concurrently and yield results in order.
+
+        Args:
+            chunks: Iterator of (chunk_audio, chunk_start, chunk_end)
+            sample_rate: Sample rate of the chunks
+            start_time: Wall-clock time matching audio position 0
+
+        Yields:
+            ChunkResult for every chunk, in chunk order
+        """
+        chunk_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        result_queue: queue.Queue = queue.Queue()
+        stop = threading.Event()
+
+        def put(q: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def reader() -> None:
+            try:
+                for index, (chunk_audio, chunk_start, chunk_end) in enumerate(chunks):
+                    # Wait if we're cutting too fast (maintain real-time pace)
+                    wait_time = start_time + chunk_start - time.time()
+                    if wait_time > 0 and stop.wait(wait_time):
+                        return
+                    # Chunks are views into the chunker's buffer: copy before queueing
+                    job = (
+                        index,
+                        chunk_audio.copy(),
+                        chunk_start,
+                        chunk_end,
+                        time.time(),
+                    )
+                    if not put(chunk_queue, job):
+                        return
+            except Exception as e:
+                result_queue.put(e)
+            finally:
+                for _ in range(self.num_workers):
+                    put(chunk_queue, _SENTINEL)
+
+        def worker() -> None:
+            try:
+                while not stop.is_set():
+                    try:
+                        job = chunk_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if job is _SENTINEL:
+                        return
+                    index, chunk_audio, chunk_start, chunk_end, released_at = job
+                    inference_start = time.time()
+                    text = self.transcribe(chunk_audio, sample_rate)
+                    result_queue.put(
+                        ChunkResult(
+                            index=index,
+                            text=text,
+                            chunk_start=chunk_start,
+                            chunk_end=chunk_end,
+                            released_at=released_at,
+                            inference_s=time.time() - inference_start,
+                        )
+                    )
+            except Exception as e:
+                result_queue.put(e)
+            finally:
+                result_queue.put(_SENTINEL)
+
+        threads = [threading.Thread(target=reader, daemon=True)]
+        threads += [
+            threading.Thread(target=worker, daemon=True)
+            for _ in range(self.num_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        pending: dict[int, ChunkResult] = {}
+        next_index = 0
+        workers_done = 0
+        try:
+            while workers_done < self.num_workers:
+                item = result_queue.get()
+                if item is _SENTINEL:
+                    workers_done += 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                pending[item.index] = item
+                # Ordered reassembly: release every result that is next in line
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            stop.set()
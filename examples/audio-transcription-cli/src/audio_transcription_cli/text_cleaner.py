@@ -1,6 +1,13 @@
 """Text cleaning module for post-processing transcriptions."""
 
+import difflib
+import hashlib
+import queue
+import string
+import threading
 import time
+from collections import OrderedDict
+from itertools import pairwise
 
 from llama_cpp import Llama
 
@@ -20,6 +27,9 @@ class TextCleaner:
         self.config = config
         self._llama: Llama | None = None
         self._model_loaded = False
+        # Cleaned text keyed by a hash of each raw fragment, least recently used first
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self.cache_hits = 0
 
         # Validate text cleaner model exists
         if not self.config.text_cleaner_model_path.exists():
@@ -44,6 +54,7 @@ class TextCleaner:
             )
 
             self._model_loaded = True
+            self._warm_up()
             print("✅ Text cleaning model loaded successfully")
             return True
 
@@ -66,45 +77,92 @@ class TextCleaner:
         """
         if not raw_text or not raw_text.strip():
             return raw_text
+        return self.clean_fragments([raw_text.strip()])[0]
 
-        if not self._model_loaded:
-            if not self.load_model():
-                raise RuntimeError("Failed to load text cleaning model")
+    def clean_fragments(self, fragments: list[str]) -> list[str]:
+        """
+        Clean consecutive transcript fragments, caching the result per fragment.
 
-        try:
-            # Get messages for chat completion
-            messages = self._get_messages(raw_text)
-
-            # Generate cleaned text
-            start_time = time.time()
-
-            # Reset model state if available
-            if hasattr(self._llama, "reset"):
-                self._llama.reset()
-
-            response = self._llama.create_chat_completion(
-                messages=messages,
-                # TODO: extract these parameters to config
-                temperature=0.1,
-                min_p=0.15,
-                repeat_penalty=1.05,
-                max_tokens=512,
-            )
+        When every fragment is in the cache the model is not called. Otherwise
+        the whole window is cleaned as one passage, cached neighbours
+        included, so the model keeps the context around the new fragments.
+        The cleaned passage is split back per fragment by aligning its words
+        with the raw words.
 
-            # response = self._llama.create_chat_completion(messages=messages, temperature=0.1, min_p=0.15, repeat_penalty=1.05)
+        Args:
+            fragments: Raw transcript fragments, in order
 
-            # Extract cleaned text from response
-            cleaned_text = self._extract_cleaned_text(response)
+        Returns:
+            Cleaned text of each fragment, in the same order
 
-            elapsed_time = time.time() - start_time
-            # print(f"🧹 Text cleaning completed in {elapsed_time:.1f}s")
+        Raises:
+            RuntimeError: If model is not loaded
+        """
+        keys = [
+            hashlib.sha1(f.strip().encode("utf-8")).hexdigest() for f in fragments
+        ]
+        if all(key in self._cache for key in keys):
+            for key in keys:
+                self._cache.move_to_end(key)
+            self.cache_hits += len(keys)
+            return [self._cache[key] for key in keys]
 
-            return cleaned_text
+        if not self._model_loaded:
+            if not self.load_model():
+                raise RuntimeError("Failed to load text cleaning model")
 
+        try:
+            parts = _split_cleaned(fragments, self._complete(" ".join(fragments)))
         except Exception as e:
             print(f"⚠️ Text cleaning failed: {e}")
             print("📝 Falling back to raw transcription")
-            return raw_text
+            return list(fragments)
+
+        for key, part in zip(keys, parts, strict=True):
+            self._cache[key] = part
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.config.text_cleaning_cache_size:
+                self._cache.popitem(last=False)
+        return parts
+
+    def _complete(self, raw_text: str) -> str:
+        """Run the model on one passage and return the cleaned text."""
+        # Get messages for chat completion
+        messages = self._get_messages(raw_text)
+
+        # Generate cleaned text
+        start_time = time.time()
+
+        # No reset between calls: llama-cpp keeps the evaluated tokens and
+        # only re-evaluates what differs from the previous prompt, so the
+        # system prompt prefix is reused instead of recomputed.
+        response = self._llama.create_chat_completion(
+            messages=messages,
+            # TODO: extract these parameters to config
+            temperature=0.1,
+            min_p=0.15,
+            repeat_penalty=1.05,
+            max_tokens=512,
+        )
+
+        # response = self._llama.create_chat_completion(messages=messages, temperature=0.1, min_p=0.15, repeat_penalty=1.05)
+
+        # Extract cleaned text from response
+        cleaned_text = self._extract_cleaned_text(response)
+
+        elapsed_time = time.time() - start_time
+        # print(f"🧹 Text cleaning completed in {elapsed_time:.1f}s")
+
+        return cleaned_text
+
+    def _warm_up(self) -> None:
+        """Evaluate the system prompt once so later requests start from it."""
+        try:
+            self._llama.create_chat_completion(
+                messages=self._get_messages(""), temperature=0.1, max_tokens=1
+            )
+        except Exception as e:
+            print(f"⚠️ Text cleaner warm-up failed: {e}")
 
     def _get_messages(self, raw_text: str) -> list[dict[str, str]]:
         """
@@ -161,6 +219,137 @@ class TextCleaner:
         self._model_loaded = False
 
 
+class CleaningService:
+    """
+    Cleans transcript fragments in windows on a background thread.
+
+    Fragments are submitted as soon as they are transcribed and grouped into
+    windows of `window_size` fragments, which gives the model enough context
+    for a coherent sentence while calling it once per window instead of once
+    per fragment. Cleaned windows are collected with `ready()` without
+    blocking the transcription loop.
+    """
+
+    _CLOSE = object()
+
+    def __init__(self, cleaner: TextCleaner, window_size: int = 3):
+        """
+        Start the cleaning thread.
+
+        Args:
+            cleaner: Loaded text cleaner
+            window_size: Number of fragments cleaned together
+        """
+        self.cleaner = cleaner
+        self.window_size = max(1, window_size)
+        self._inbox: queue.Queue = queue.Queue()
+        self._outbox: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, fragment: str) -> None:
+        """Queue a raw transcript fragment for cleaning."""
+        if fragment and fragment.strip():
+            self._inbox.put(fragment.strip())
+
+    def ready(self) -> list[str]:
+        """Return the cleaned windows finished so far, in order."""
+        cleaned = []
+        while True:
+            try:
+                cleaned.append(self._outbox.get_nowait())
+            except queue.Empty:
+                return cleaned
+
+    def close(self, timeout: float | None = None) -> list[str]:
+        """
+        Clean the last partial window and stop the thread.
+
+        Args:
+            timeout: Seconds to wait for pending windows
+
+        Returns:
+            Cleaned windows not yet returned by `ready()`
+        """
+        self._inbox.put(self._CLOSE)
+        self._thread.join(timeout)
+        return self.ready()
+
+    def _run(self) -> None:
+        window: list[str] = []
+        while True:
+            item = self._inbox.get()
+            closing = item is self._CLOSE
+            if not closing:
+                window.append(item)
+
+            if window and (closing or len(window) >= self.window_size):
+                raw_text = " ".join(window)
+                try:
+                    cleaned = " ".join(
+                        part for part in self.cleaner.clean_fragments(window) if part
+                    )
+                except Exception as e:
+                    print(f"⚠️ Text cleaning failed: {e}")
+                    cleaned = raw_text
+                self._outbox.put(cleaned or raw_text)
+                window = []
+
+            if closing:
+                return
+
+
+def _split_cleaned(fragments: list[str], cleaned: str) -> list[str]:
+    """
+    Split a cleaned passage back into the fragments it was made from.
+
+    Each fragment boundary in the raw words is mapped to the cleaned word
+    aligned with the first matching raw word at or after it; words the model
+    rewrote stay with the fragment before the boundary.
+
+    Args:
+        fragments: Raw fragments that were joined and cleaned
+        cleaned: Cleaned text of the joined fragments
+
+    Returns:
+        Cleaned text of each fragment
+    """
+    if len(fragments) == 1:
+        return [cleaned]
+
+    raw_words: list[str] = []
+    boundaries = []
+    for fragment in fragments:
+        boundaries.append(len(raw_words))
+        raw_words.extend(fragment.split())
+    cleaned_words = cleaned.split()
+
+    def norm(word: str) -> str:
+        return word.strip(string.punctuation).lower()
+
+    matcher = difflib.SequenceMatcher(
+        None,
+        [norm(w) for w in raw_words],
+        [norm(w) for w in cleaned_words],
+        autojunk=False,
+    )
+    # Cleaned position of every raw word that survived cleaning
+    aligned: dict[int, int] = {}
+    for a, b, size in matcher.get_matching_blocks():
+        for k in range(size):
+            aligned[a + k] = b + k
+
+    cuts = [0]
+    for boundary in boundaries[1:]:
+        cut = next(
+            (aligned[i] for i in range(boundary, len(raw_words)) if i in aligned),
+            len(cleaned_words),
+        )
+        cuts.append(max(cut, cuts[-1]))
+    cuts.append(len(cleaned_words))
+    return [" ".join(cleaned_words[start:end]) for start, end in pairwise(cuts)]
+
+
 def create_text_cleaner(config: Config) -> TextCleaner | None:
     """
     Create text cleaner with fallback for missing dependencies or model files.
@@ -18,6 +18,7 @@ def main(
     log_partial_transcripts: str = None,
     typewriter_effect: bool = False,
     typewriter_speed: float = None,
+    workers: int = None,
 ):
     """Test real-time transcription functionality."""
     config = Config()
@@ -38,6 +39,8 @@ def main(
     # Override typewriter settings if provided
     if typewriter_speed is not None:
         config.typewriter_speed = typewriter_speed
+    if workers is not None:
+        config.pipeline_workers = workers
 
     model = LFM2AudioWrapper(model_downloader, config)
 
@@ -68,6 +71,8 @@ def main(
     except Exception as e:
         print(f"❌ Error during transcription: {e}")
         raise e
+    finally:
+        model.close()
 
 
 def cli():
@@ -102,6 +107,12 @@ def cli():
         default=0.01,
         help="Speed of typewriter effect in seconds per character (default: 0.01)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of chunk transcription workers (default: from config, 1)",
+    )
     args = parser.parse_args()
 
     main(
@@ -111,6 +122,7 @@ def cli():
         args.log_partial_transcripts,
         args.typewriter,
         args.typewriter_speed,
+        args.workers,
     )
 
 
@@ -1,43 +1,149 @@
-from typing import List, Tuple
-from PIL import Image
+import math
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
 import datasets
+from PIL import Image
+from torch.utils.data import Dataset as TorchDataset
 
 from .config import EvaluationConfig
 
 
-def create_batches(dataset: datasets.Dataset, config: EvaluationConfig) -> List[Tuple[List[Image.Image], List[str]]]:
+class LazyImageDataset(TorchDataset):
+    """
+    Map-style view over a HuggingFace dataset that decodes one image per access.
+
+    Nothing is decoded up front, so memory stays bounded by what the consumer
+    keeps alive. With `max_image_size` images are downscaled to fit in a
+    square of that size; with `cache_dir` the downscaled images are written
+    to disk once and read back on later runs instead of decoding the original.
+    """
+
+    def __init__(
+        self,
+        dataset: datasets.Dataset,
+        image_column: str,
+        label_column: str,
+        label_mapping: Optional[dict[Any, str]] = None,
+        max_image_size: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        self.dataset = dataset
+        self.image_column = image_column
+        self.label_column = label_column
+        self.label_mapping = label_mapping
+        self.max_image_size = max_image_size
+
+        self.cache_dir: Optional[Path] = None
+        if cache_dir is not None:
+            # One directory per dataset version and target size
+            fingerprint = getattr(dataset, "_fingerprint", None) or "dataset"
+            self.cache_dir = Path(cache_dir) / f"{fingerprint}_{max_image_size or 'full'}"
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    @cached_property
+    def labels(self) -> list:
+        # Reading a single column does not decode any image
+        return self.dataset[self.label_column]
+
+    def __getitem__(self, index: int) -> Tuple[Image.Image, str]:
+        cache_path = self.cache_dir / f"{index}.png" if self.cache_dir is not None else None
+        if cache_path is not None and cache_path.exists():
+            image = Image.open(cache_path)
+            image.load()
+            label = self.labels[index]
+        else:
+            sample = self.dataset[index]
+            image = sample[self.image_column]
+            label = sample[self.label_column]
+
+            if self.max_image_size is not None:
+                image = image.copy()
+                image.thumbnail((self.max_image_size, self.max_image_size))
+            if cache_path is not None:
+                # Write then rename, so a concurrent reader never sees a partial file
+                tmp_path = cache_path.with_suffix(".tmp")
+                image.save(tmp_path, format="PNG")
+                tmp_path.replace(cache_path)
+
+        if self.label_mapping is not None:
+            label = self.label_mapping[label]
+        return image, label
+
+
+class StreamingBatches:
+    """
+    Iterable of (batch_images, batch_labels) decoded on worker threads.
+
+    Samples for the next `prefetch_batches` batches are decoded in the
+    background while the current batch is being evaluated. At most
+    `(prefetch_batches + 1) * batch_size` decoded images are alive at once.
     """
-    Create batches of images and labels from dataset.
-    
+
+    def __init__(
+        self,
+        samples: LazyImageDataset,
+        batch_size: int,
+        num_workers: int = 4,
+        prefetch_batches: int = 2,
+    ):
+        self.samples = samples
+        self.batch_size = max(1, batch_size)
+        self.num_workers = max(1, num_workers)
+        self.prefetch_batches = max(0, prefetch_batches)
+
+    def __len__(self) -> int:
+        return math.ceil(len(self.samples) / self.batch_size)
+
+    def __iter__(self) -> Iterator[Tuple[List[Image.Image], List[str]]]:
+        max_in_flight = (self.prefetch_batches + 1) * self.batch_size
+        indices = iter(range(len(self.samples)))
+        pending: deque[Future] = deque()
+
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+
+            def fill() -> None:
+                while len(pending) < max_in_flight:
+                    index = next(indices, None)
+                    if index is None:
+                        return
+                    pending.append(executor.submit(self.samples.__getitem__, index))
+
+            fill()
+            while pending:
+                batch = [pending.popleft().result() for _ in range(min(self.batch_size, len(pending)))]
+                fill()
+                yield [image for image, _ in batch], [label for _, label in batch]
+
+
+def create_batches(dataset: datasets.Dataset, config: EvaluationConfig) -> StreamingBatches:
+    """
+    Create lazily decoded batches of images and labels from dataset.
+
     Args:
         dataset: HuggingFace dataset
-        config: Evaluation configuration containing batch_size, column names and label mapping
-    
+        config: Evaluation configuration containing batch_size, column names, label mapping and loader settings
+
     Returns:
-        List of tuples, where each tuple contains (batch_images, batch_labels)
+        Iterable of tuples, where each tuple contains (batch_images, batch_labels)
     """
-    batches = []
-    current_batch_images = []
-    current_batch_labels = []
-    
-    for sample in dataset:
-        image = sample[config.image_column]
-        
-        if config.label_mapping is not None:
-            label = config.label_mapping[sample[config.label_column]]
-        else:
-            label = sample[config.label_column]
-        
-        current_batch_images.append(image)
-        current_batch_labels.append(label)
-        
-        if len(current_batch_images) == config.batch_size:
-            batches.append((current_batch_images, current_batch_labels))
-            current_batch_images = []
-            current_batch_labels = []
-    
-    # Add remaining samples as last batch
-    if current_batch_images:
-        batches.append((current_batch_images, current_batch_labels))
-    
-    return batches
\ No newline at end of file
+    samples = LazyImageDataset(
+        dataset,
+        image_column=config.image_column,
+        label_column=config.label_column,
+        label_mapping=config.label_mapping,
+        max_image_size=config.max_image_size,
+        cache_dir=config.image_cache_dir,
+    )
+    return StreamingBatches(
+        samples,
+        batch_size=config.batch_size,
+        num_workers=config.loader_workers,
+        prefetch_batches=config.prefetch_batches,
+    )
@@ -30,7 +30,9 @@ class FineTuningConfig(BaseSettings):
     dataset_splits: list[str] = ["train"]
     label_mapping: Optional[dict[Any, str]] = None
     train_split_ratio: float
-    preprocessing_workers: int = 2
+    preprocessing_workers: int = 2  # DataLoader workers decoding images during training
+    max_image_size: Optional[int] = None
+    image_cache_dir: Optional[str] = None
 
     system_prompt: str
     user_prompt: str
@@ -122,6 +124,12 @@ class EvaluationConfig(BaseSettings):
     # Batch processing parameters
     batch_size: int = 1
 
+    # Data loading: images are decoded on worker threads, a few batches ahead
+    loader_workers: int = 4
+    prefetch_batches: int = 2
+    max_image_size: Optional[int] = None  # downscale to fit in a square of this size
+    image_cache_dir: Optional[str] = None  # on-disk cache of the (resized) images
+
     # Weights and Biases configuration
     wandb_project_name: str = "car-maker-identification-evals"
 
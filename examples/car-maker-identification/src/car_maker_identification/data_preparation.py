@@ -1,6 +1,9 @@
 from typing import Any
 
 from datasets import Dataset
+from torch.utils.data import Dataset as TorchDataset
+
+from .batching import LazyImageDataset
 
 
 def split_dataset(
@@ -15,34 +18,28 @@ def split_dataset(
     return split["train"], split["test"]
 
 
-def format_dataset_as_conversation(
-    dataset: Dataset,
-    system_prompt: str,
-    user_prompt: str,
-    image_column: str,
-    label_column: str,
-    label_mapping: dict[Any, str],
-) -> Dataset:
-    """Formats a dataset into a conversation format suitable for SFT training."""
+class ConversationDataset(TorchDataset):
+    """Lazily formats samples as SFT conversations; images are decoded in the DataLoader workers."""
+
+    def __init__(self, samples: LazyImageDataset, system_prompt: str, user_prompt: str):
+        self.samples = samples
+        self.system_prompt = system_prompt
+        self.user_prompt = user_prompt
 
-    def format_sample(sample):
-        # Format the label as JSON according to CatsVsDogsClassificationOutputType
-        # label_json = CatsVsDogsClassificationOutputType.from_pred_class(label_mapping[sample[label_column]])
-        if label_mapping is None:
-            label_json = sample[label_column]
-        else:
-            label_json = label_mapping[sample[label_column]]
+    def __len__(self) -> int:
+        return len(self.samples)
 
-        # print(f'Image type: {type(sample[image_column]).__name__}')
+    def __getitem__(self, index: int) -> list[dict]:
+        image, label_json = self.samples[index]
 
         return [
-            {"role": "system", "content": [{"type": "text", "text": system_prompt}]},
+            {"role": "system", "content": [{"type": "text", "text": self.system_prompt}]},
             {
                 "role": "user",
                 "content": [
-                    {"type": "image", "image": sample[image_column]},
+                    {"type": "image", "image": image},
                     # {"type": "text", "text": sample["question"]},
-                    {"type": "text", "text": user_prompt},
+                    {"type": "text", "text": self.user_prompt},
                 ],
             },
             {
@@ -51,6 +48,28 @@ def format_dataset_as_conversation(
             },
         ]
 
-    dataset = [format_sample(s) for s in dataset]
 
-    return dataset
+def format_dataset_as_conversation(
+    dataset: Dataset,
+    system_prompt: str,
+    user_prompt: str,
+    image_column: str,
+    label_column: str,
+    label_mapping: dict[Any, str],
+    max_image_size: int | None = None,
+    image_cache_dir: str | None = None,
+) -> ConversationDataset:
+    """Formats a dataset into a conversation format suitable for SFT training.
+
+    Samples are built on access instead of up front, so the decoded images of
+    the whole split are never held in memory at once.
+    """
+    samples = LazyImageDataset(
+        dataset,
+        image_column=image_column,
+        label_column=label_column,
+        label_mapping=label_mapping,
+        max_image_size=max_image_size,
+        cache_dir=image_cache_dir,
+    )
+    return ConversationDataset(samples, system_prompt=system_prompt, user_prompt=user_prompt)
@@ -15,7 +15,7 @@ import tempfile
 import matplotlib.pyplot as plt
 
 from .config import EvaluationConfig
-from .inference import get_model_output, get_structured_model_output
+from .inference import get_model_output, get_structured_model_output_batch
 from .loaders import load_dataset, load_model_and_processor
 from .modal_infra import (
     get_docker_image,
@@ -28,6 +28,26 @@ from .report import EvalReport  # , save_predictions_to_disk
 from .output_types import CarIdentificationOutputType
 from .batching import create_batches
 
+
+def summarize_batch_timings(timings: list[tuple[int, float]]) -> list[dict]:
+    """
+    Aggregates (batch size, seconds) measurements into latency and throughput per batch size.
+    """
+    by_size: dict[int, list[float]] = {}
+    for batch_size, seconds in timings:
+        by_size.setdefault(batch_size, []).append(seconds)
+
+    return [
+        {
+            "batch_size": batch_size,
+            "calls": len(durations),
+            "mean_latency_s": sum(durations) / len(durations),
+            "images_per_second": batch_size * len(durations) / sum(durations),
+        }
+        for batch_size, durations in sorted(by_size.items())
+    ]
+
+
 app = get_modal_app("car-maker-identification")
 image = get_docker_image()
 datasets_volume = get_volume("datasets")
@@ -87,22 +107,25 @@ def evaluate(
     
     # Process batches
     accurate_predictions: int = 0
+    batch_timings: list[tuple[int, float]] = []  # (batch length, seconds) per batch
     for batch_images, batch_labels in tqdm(batches, desc="Processing batches"):
         
         if config.structured_generation:
-            # Use structured generation with batching
-            if len(batch_images) == 1:
-                # Single image case
-                model_outputs = get_structured_model_output(
-                    model, processor, config.system_prompt, config.user_prompt, batch_images[0]
+            # Use structured generation with batching, grouped by image resolution
+            try:
+                batch_start = time.perf_counter()
+                model_outputs = get_structured_model_output_batch(
+                    model,
+                    processor,
+                    config.system_prompt,
+                    config.user_prompt,
+                    batch_images,
                 )
-                model_outputs = [model_outputs] if model_outputs is not None else [None]
-            else:
-                # Batch case
-                model_outputs = get_structured_model_output(
-                    model, processor, config.system_prompt, config.user_prompt, batch_images
-                )
-            
+                batch_timings.append((len(batch_images), time.perf_counter() - batch_start))
+            except Exception as e:
+                print(f"Error in batch processing: {e}")
+                model_outputs = None
+
             # Process results
             if model_outputs is not None:
                 for image, label, model_output in zip(batch_images, batch_labels, model_outputs):
@@ -140,6 +163,24 @@ def evaluate(
     # Log accuracy to wandb
     wandb.log({"accuracy": accuracy})
 
+    # Throughput and latency per batch size
+    if batch_timings:
+        batch_stats = summarize_batch_timings(batch_timings)
+        print("Batch size | calls | mean latency (s) | throughput (img/s)")
+        for stats in batch_stats:
+            print(
+                f"{stats['batch_size']:>10} | {stats['calls']:>5} | "
+                f"{stats['mean_latency_s']:>16.3f} | {stats['images_per_second']:>18.2f}"
+            )
+        wandb.log(
+            {
+                "batch_performance": wandb.Table(
+                    columns=list(batch_stats[0].keys()),
+                    data=[list(stats.values()) for stats in batch_stats],
+                )
+            }
+        )
+
     # Generate and log confusion matrix
     with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
         # Create confusion matrix plot
@@ -178,7 +219,7 @@ def main(
 
     eval_report = evaluate.remote(config)
 
-    output_path = eval_report.to_csv()
+    output_path = eval_report.to_parquet(model=config.model)
     print(f"Predictions saved to {output_path}")
 
 
@@ -91,6 +91,8 @@ def fine_tune(
         image_column=config.dataset_image_column,
         label_column=config.dataset_label_colum,
         label_mapping=config.label_mapping,
+        max_image_size=config.max_image_size,
+        image_cache_dir=config.image_cache_dir,
     )
     eval_dataset = format_dataset_as_conversation(
         eval_dataset,
@@ -99,6 +101,8 @@ def fine_tune(
         image_column=config.dataset_image_column,
         label_column=config.dataset_label_colum,
         label_mapping=config.label_mapping,
+        max_image_size=config.max_image_size,
+        image_cache_dir=config.image_cache_dir,
     )
 
     print("✅ SFT Dataset formatted:")
@@ -153,6 +157,10 @@ def fine_tune(
         save_steps=config.eval_steps,  # Save every 1000 steps
         load_best_model_at_end=True,  # Load best model after training
         metric_for_best_model="eval_loss",  # Metric to determine best model
+        # Decode images in background workers, a couple of batches ahead
+        dataloader_num_workers=config.preprocessing_workers,
+        dataloader_prefetch_factor=2 if config.preprocessing_workers > 0 else None,
+        dataloader_persistent_workers=config.preprocessing_workers > 0,
     )
 
     # Create callbacks
@@ -2,12 +2,67 @@ import outlines
 from PIL import Image
 from typing import Union, List
 
+from outlines import Generator
 from outlines.inputs import Image as OutlinesImage, Chat
+from pydantic import BaseModel
 from transformers import AutoModelForImageTextToText, AutoProcessor
 
 from .output_types import CarIdentificationOutputType
 
 
+# Attribute holding each model's structured generators, keyed by output type.
+# Building one compiles the output schema into a regex/FSM, so it is done once
+# per model. The generators live on the model rather than in a module-level
+# dict: they reference the model themselves, so a global cache (even a weak
+# one keyed on the model) would keep every model ever used alive.
+_GENERATORS_ATTR = "_structured_generators"
+
+
+def get_structured_generator(
+    model: AutoModelForImageTextToText,
+    processor: AutoProcessor,
+    output_type: type[BaseModel] = CarIdentificationOutputType,
+) -> Generator:
+    """
+    Returns the cached Outlines generator for this model and output schema, building it on first use.
+    """
+    generators: dict[type, tuple[AutoProcessor, Generator]] = model.__dict__.setdefault(_GENERATORS_ATTR, {})
+    cached = generators.get(output_type)
+    if cached is None or cached[0] is not processor:
+        outlines_model = outlines.from_transformers(model, processor)
+        generators[output_type] = (processor, Generator(outlines_model, output_type))
+    return generators[output_type][1]
+
+
+def _build_prompt(system_prompt: str, user_prompt: str, image: Image.Image) -> Chat:
+    return Chat(
+        [
+            {
+                "role": "system",
+                "content": system_prompt,
+            },
+            {
+                "role": "user",
+                "content": [
+                    {"type": "image", "image": OutlinesImage(image)},
+                    {"type": "text", "text": user_prompt},
+                ],
+            },
+        ]
+    )
+
+
+def _parse_response(response: str, index: int | None = None) -> CarIdentificationOutputType | None:
+    try:
+        # Parse the response into the structured output type
+        return CarIdentificationOutputType.model_validate_json(response)
+    except Exception as e:
+        suffix = "" if index is None else f" {index}"
+        print(f"Error parsing response{suffix}: {e}")
+        print(f"Raw model output{suffix}: {response}")
+        return None
+
+
 def get_structured_model_output(
     model: AutoModelForImageTextToText,
     processor: AutoProcessor,
@@ -30,78 +85,32 @@ def get_structured_model_output(
     Returns:
         Single CarIdentificationOutputType or list of CarIdentificationOutputType, or None if error
     """
-    outlines_model = outlines.from_transformers(model, processor)
-
     # Handle both single image and batch of images
     if isinstance(images, Image.Image):
         # Single image case
-        prompt = Chat(
-            [
-                {
-                    "role": "system",
-                    "content": system_prompt,
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "image", "image": OutlinesImage(images)},
-                        {"type": "text", "text": user_prompt},
-                    ],
-                },
-            ]
+        generator = get_structured_generator(model, processor)
+        prompt = _build_prompt(system_prompt, user_prompt, images)
+        response: str = generator(prompt, max_new_tokens=max_new_tokens)
+        return _parse_response(response)
+
+    # Batch case
+    try:
+        return get_structured_model_output_batch(
+            model, processor, system_prompt, user_prompt, images, max_new_tokens
         )
+    except Exception as e:
+        print("Error in batch processing: ", e)
+        return None
 
-        response: str = outlines_model(prompt, CarIdentificationOutputType, max_new_tokens=max_new_tokens)
 
-        try:
-            # Parse the response into the structured output type
-            parsed_response = CarIdentificationOutputType.model_validate_json(response)
-            return parsed_response
-        except Exception as e:
-            print("Error generating structured output: ", e)
-            print("Raw model output: ", response)
-            return None
-    
-    else:
-        # Batch case
-        prompts = []
-        for image in images:
-            prompt = Chat(
-                [
-                    {
-                        "role": "system",
-                        "content": system_prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "image", "image": OutlinesImage(image)},
-                            {"type": "text", "text": user_prompt},
-                        ],
-                    },
-                ]
-            )
-            prompts.append(prompt)
-
-        try:
-            # Use batch processing with output type specified
-            responses: List[str] = outlines_model.batch(prompts, output_type=CarIdentificationOutputType, max_new_tokens=max_new_tokens)
-            
-            parsed_responses = []
-            for i, response in enumerate(responses):
-                try:
-                    parsed_response = CarIdentificationOutputType.model_validate_json(response)
-                    parsed_responses.append(parsed_response)
-                except Exception as e:
-                    print(f"Error parsing response {i}: {e}")
-                    print(f"Raw model output {i}: {response}")
-                    parsed_responses.append(None)
-            
-            return parsed_responses
-        
-        except Exception as e:
-            print("Error in batch processing: ", e)
-            return None
+def group_by_resolution(images: List[Image.Image]) -> dict[tuple[int, int], List[int]]:
+    """
+    Groups image indices by (width, height), so each group yields image tensors of the same shape.
+    """
+    groups: dict[tuple[int, int], List[int]] = {}
+    for i, image in enumerate(images):
+        groups.setdefault(image.size, []).append(i)
+    return groups
 
 
 def get_structured_model_output_batch(
@@ -114,6 +123,10 @@ def get_structured_model_output_batch(
 ) -> List[CarIdentificationOutputType | None]:
     """
     Dedicated batch processing function for structured model output.
+
+    Images are grouped by resolution and each group is sent through
+    `Generator.batch`, so images in one forward pass share their shape and
+    need no padding to the largest image.
     
     Args:
         model: The model to use for inference
@@ -124,11 +137,23 @@ def get_structured_model_output_batch(
         max_new_tokens: Maximum number of tokens to generate
     
     Returns:
-        List of CarIdentificationOutputType or None for each image
+        List of CarIdentificationOutputType or None for each image, in input order
     """
-    return get_structured_model_output(
-        model, processor, system_prompt, user_prompt, images, max_new_tokens
-    )
+    generator = get_structured_generator(model, processor)
+    outputs: List[CarIdentificationOutputType | None] = [None] * len(images)
+
+    for indices in group_by_resolution(images).values():
+        prompts = [_build_prompt(system_prompt, user_prompt, images[i]) for i in indices]
+
+        if len(prompts) == 1:
+            responses: List[str] = [generator(prompts[0], max_new_tokens=max_new_tokens)]
+        else:
+            responses = generator.batch(prompts, max_new_tokens=max_new_tokens)
+
+        for i, response in zip(indices, responses):
+            outputs[i] = _parse_response(response, i)
+
+    return outputs
 
 def get_model_output(
     model: AutoModelForImageTextToText,
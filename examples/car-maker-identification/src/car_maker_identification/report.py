@@ -1,5 +1,6 @@
 import base64
 import csv
+import hashlib
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
@@ -8,44 +9,109 @@ from typing import Self
 from PIL import Image
 import numpy as np
 import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 from .paths import get_path_to_evals
 
 
+REPORT_COLUMNS = ["run_id", "model", "image_hash", "ground_truth", "predicted", "correct"]
+
+
+def get_path_to_images() -> Path:
+    """Content-addressed store of evaluated images, shared by all runs."""
+    path = Path(get_path_to_evals()) / "images"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 class EvalReport:
+    """
+    Predictions of one evaluation run.
+
+    Each record only references its image by the sha256 of its PNG bytes. Images
+    are stored once under evals/images/<hash>.png, no matter how many runs
+    evaluated them, and are only read from disk when a record is displayed.
+    """
+
     def __init__(self):
         self.records = []
+        # PNGs added in this process and not yet written to the image store
+        self._images: dict[str, bytes] = {}
 
     def add_record(self, image: Image.Image, ground_truth: str, predicted: str):
         buffered = BytesIO()
         image.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
+        png = buffered.getvalue()
+        image_hash = hashlib.sha256(png).hexdigest()
+        self._images.setdefault(image_hash, png)
 
         self.records.append(
             {
-                "image_base64": img_str,
+                "image_hash": image_hash,
                 "ground_truth": ground_truth,
                 "predicted": predicted,
                 "correct": ground_truth == predicted,
             }
         )
 
-    def to_csv(self) -> str:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        csv_file_name = f"predictions_{timestamp}.csv"
-        csv_file_path = str(Path(get_path_to_evals()) / csv_file_name)
+    def get_image(self, record: dict) -> Image.Image:
+        if "image_base64" in record:
+            # Reports saved as CSV embed the image
+            return Image.open(BytesIO(base64.b64decode(record["image_base64"])))
+        png = self._images.get(record["image_hash"])
+        if png is not None:
+            return Image.open(BytesIO(png))
+        return Image.open(get_path_to_images() / f"{record['image_hash']}.png")
+
+    def to_parquet(self, model: str | None = None) -> str:
+        """
+        Save the images that are not in the image store yet and the predictions
+        as evals/predictions_<timestamp>.parquet.
+        """
+        images_path = get_path_to_images()
+        for image_hash, png in self._images.items():
+            image_path = images_path / f"{image_hash}.png"
+            if image_path.exists():
+                continue
+            # Write then rename, so a concurrent reader never sees a partial file
+            tmp_path = image_path.with_suffix(".tmp")
+            tmp_path.write_bytes(png)
+            tmp_path.replace(image_path)
+        self._images.clear()
+
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        table = pa.table(
+            {
+                "run_id": pa.array([run_id] * len(self.records), pa.string()),
+                "model": pa.array([model] * len(self.records), pa.string()),
+                "image_hash": pa.array([r["image_hash"] for r in self.records], pa.string()),
+                "ground_truth": pa.array([r["ground_truth"] for r in self.records], pa.string()),
+                "predicted": pa.array([r["predicted"] for r in self.records], pa.string()),
+                "correct": pa.array([r["correct"] for r in self.records], pa.bool_()),
+            }
+        )
+        file_path = str(Path(get_path_to_evals()) / f"predictions_{run_id}.parquet")
+        pq.write_table(table, file_path)
 
-        with open(csv_file_path, "w", newline="") as csvfile:
-            fieldnames = ["image_base64", "ground_truth", "predicted", "correct"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        return file_path
 
-            writer.writeheader()
-            writer.writerows(self.records)
+    @classmethod
+    def from_table(cls, table: pa.Table) -> Self:
+        report = cls()
+        report.records = table.select(["image_hash", "ground_truth", "predicted", "correct"]).to_pylist()
+        return report
 
-        return csv_file_path
+    @classmethod
+    def from_parquet(cls, file_name: str, only_misclassified: bool = False) -> Self:
+        file_path = str(Path(get_path_to_evals()) / file_name)
+        filters = [("correct", "=", False)] if only_misclassified else None
+        return cls.from_table(pq.read_table(file_path, filters=filters))
 
     @classmethod
     def from_csv(cls, file_name: str) -> Self:
+        """Load a report saved by older versions, with base64 images inline."""
         file_path = str(Path(get_path_to_evals()) / file_name)
         report = cls()
         csv.field_size_limit(10 * 1024 * 1024)
@@ -57,6 +123,22 @@ class EvalReport:
                 report.records.append(row)
         return report
 
+    @classmethod
+    def from_last(cls) -> Self:
+        evals_path = Path(get_path_to_evals())
+        files = sorted(
+            [*evals_path.glob("predictions_*.parquet"), *evals_path.glob("predictions_*.csv")],
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+
+        if not files:
+            raise FileNotFoundError("No prediction files found in evals directory")
+
+        if files[0].suffix == ".csv":
+            return cls.from_csv(files[0].name)
+        return cls.from_parquet(files[0].name)
+
     @classmethod
     def from_last_csv(cls) -> Self:
         evals_path = Path(get_path_to_evals())
@@ -89,10 +171,7 @@ class EvalReport:
         axes = axes.flatten() if n_images >= 1 else [axes]
 
         for idx, record in enumerate(records_to_show):
-            img_data = base64.b64decode(record["image_base64"])
-            img = Image.open(BytesIO(img_data))
-
-            # breakpoint()
+            img = self.get_image(record)
 
             axes[idx].imshow(img)
             axes[idx].axis("off")
@@ -161,12 +240,56 @@ class EvalReport:
         print(f"Accuracy: {np.trace(cm) / len(ground_truth):.3f}")
 
 
+def load_runs(
+    pattern: str = "predictions_*.parquet",
+    filters: list[tuple] | None = None,
+) -> pa.Table:
+    """
+    Load the predictions of every run matching `pattern` into one Arrow table.
+
+    Only the prediction columns are read, never the images, so loading many runs
+    is cheap. `filters` are pushed down to the Parquet reader, e.g.
+    [("correct", "=", False)] to keep the misclassifications only.
+    """
+    evals_path = Path(get_path_to_evals())
+    files = sorted(evals_path.glob(pattern))
+    if not files:
+        raise FileNotFoundError(f"No files matching {pattern} found in evals directory")
+
+    return pa.concat_tables(
+        [pq.read_table(f, columns=REPORT_COLUMNS, filters=filters) for f in files],
+        promote_options="permissive",
+    )
+
+
+def confusion_counts(runs: pa.Table, by_run: bool = True) -> pa.Table:
+    """
+    Count (ground_truth, predicted) pairs among the misclassified rows, most
+    frequent first. With `by_run` counts are kept separate per run and model.
+    """
+    keys = ["run_id", "model", "ground_truth", "predicted"] if by_run else ["ground_truth", "predicted"]
+    errors = runs.filter(pc.invert(runs["correct"]))
+    counts = errors.group_by(keys).aggregate([("image_hash", "count")])
+    counts = counts.rename_columns(["count" if n == "image_hash_count" else n for n in counts.column_names])
+    return counts.sort_by([("count", "descending")])
+
+
+def accuracy_by_run(runs: pa.Table) -> pa.Table:
+    """Accuracy and number of predictions of every run."""
+    correct = pc.cast(runs["correct"], pa.float64())
+    runs = runs.set_column(runs.schema.get_field_index("correct"), "correct", correct)
+    stats = runs.group_by(["run_id", "model"]).aggregate([("correct", "mean"), ("correct", "count")])
+    return stats.rename_columns(
+        [{"correct_mean": "accuracy", "correct_count": "predictions"}.get(n, n) for n in stats.column_names]
+    ).sort_by("run_id")
+
+
 if __name__ == "__main__":
     from .report import EvalReport
 
-    eval_report = EvalReport.from_last_csv()
-    # eval_report = EvalReport.from_csv("predictions_20250924_151458.csv")
-    print(f"Loaded {len(eval_report.records)} records from the latest CSV")
+    eval_report = EvalReport.from_last()
+    # eval_report = EvalReport.from_parquet("predictions_20250924_151458.parquet")
+    print(f"Loaded {len(eval_report.records)} records from the latest run")
 
     eval_report.print(only_misclassified=True)
 
@@ -2,6 +2,8 @@ import ast
 import json
 import os
 import re
+import time
+from functools import lru_cache
 from dotenv import load_dotenv
 from openai import OpenAI
 from app.tools.schemas import TOOL_SCHEMAS
@@ -9,7 +11,14 @@ from app.tools.handlers import TOOL_HANDLERS
 
 load_dotenv()
 
-local_client  = OpenAI(base_url="http://localhost:8080/v1", api_key="unused")
+
+@lru_cache(maxsize=None)
+def get_local_client(port: int = 8080) -> OpenAI:
+    """One client per llama-server port, so its HTTP connection pool is reused across requests."""
+    return OpenAI(base_url=f"http://localhost:{port}/v1", api_key="unused")
+
+
+local_client  = get_local_client(8080)
 openai_client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""))
 
 BACKENDS = {
@@ -31,6 +40,15 @@ SYSTEM_PROMPT = (
     "or unsupported_device (refers to a device or feature not available, e.g. brightness, TV, music)."
 )
 
+# llama-server KV cache slot used by the agent loop. Every request starts with
+# the same system prompt and tool schemas (rendered by the chat template into
+# the prompt prefix), and with cache_prompt the server reuses that prefix and
+# the shared history, only evaluating the tokens appended since the previous
+# call. None lets the server pick the idle slot whose cached prompt matches
+# best, so concurrent conversations run on separate slots instead of queueing
+# behind one; set a slot id to pin every request to it.
+LOCAL_SLOT_ID: int | None = None
+
 
 def _extract_lfm2_tool_calls(content: str) -> list[dict] | None:
     """Parse tool calls from LFM2 text-format content.
@@ -80,11 +98,63 @@ def _extract_lfm2_tool_calls(content: str) -> list[dict] | None:
 
 
 
+def _chat_completion(client, model: str, messages: list[dict], backend: str, slot_id: int | None, timings_out: list | None, **kwargs):
+    """Sends one chat completion request and records its timings.
+
+    The request always carries the full TOOL_SCHEMAS list, even when
+    tool_choice="none", so the templated prefix stays byte-identical across
+    calls and the server can serve it from the KV cache.
+    """
+    extra_body = None
+    if backend == "local":
+        extra_body = {"cache_prompt": True}
+        if slot_id is not None:
+            extra_body["id_slot"] = slot_id
+
+    start = time.perf_counter()
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        tools=TOOL_SCHEMAS,
+        extra_body=extra_body,
+        **kwargs,
+    )
+    wall_ms = 1000 * (time.perf_counter() - start)
+
+    if timings_out is not None:
+        timings_out.append(_extract_timings(response, wall_ms))
+    return response
+
+
+def _extract_timings(response, wall_ms: float) -> dict:
+    """Splits one completion call into prompt-eval and generation timings.
+
+    llama-server attaches a non-standard `timings` block to each response;
+    other backends only report token usage, so the ms fields are None there.
+    `prompt_total_n` is the whole prompt, cached tokens included, and
+    `prompt_n` only the tokens this call evaluated.
+    """
+    timings = (response.model_extra or {}).get("timings") or {}
+    usage = response.usage
+    cached = None
+    if usage is not None and getattr(usage, "prompt_tokens_details", None) is not None:
+        cached = usage.prompt_tokens_details.cached_tokens
+    evaluated = usage.prompt_tokens - cached if usage and cached is not None else None
+    return {
+        "prompt_total_n": usage.prompt_tokens if usage else None,
+        "prompt_n":       timings.get("prompt_n", evaluated),
+        "cache_n":        timings.get("cache_n", cached),
+        "prompt_ms":      timings.get("prompt_ms"),
+        "predicted_n":    timings.get("predicted_n", usage.completion_tokens if usage else None),
+        "predicted_ms":   timings.get("predicted_ms"),
+        "wall_ms":        wall_ms,
+    }
+
+
 def get_model_name(backend: str, port: int = 8080) -> str:
     if backend == "local":
         try:
-            client = OpenAI(base_url=f"http://localhost:{port}/v1", api_key="unused")
-            models = client.models.list()
+            models = get_local_client(port).models.list()
             return models.data[0].id.split("_", 2)[-1] if models.data else "unknown"
         except Exception:
             return "unknown"
@@ -100,11 +170,17 @@ def run_agent(
     temperature: float = 0.0,
     raw_tool_call_parsing: bool = False,
     port: int = 8080,
+    slot_id: int | None = LOCAL_SLOT_ID,
+    timings_out: list | None = None,
 ) -> str:
-    """Runs the agent loop and returns the final text response."""
+    """Runs the agent loop and returns the final text response.
+
+    When `timings_out` is given, one timings dict per model call (see
+    `_extract_timings`) is appended to it, in call order.
+    """
 
     if backend == "local":
-        client = OpenAI(base_url=f"http://localhost:{port}/v1", api_key="unused")
+        client = get_local_client(port)
         model = "local"
     else:
         backend_cfg = BACKENDS[backend]
@@ -121,10 +197,8 @@ def run_agent(
     max_iter = 5
     final_response = None
     for _ in range(max_iter):
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=TOOL_SCHEMAS,
+        response = _chat_completion(
+            client, model, messages, backend, slot_id, timings_out,
             tool_choice="auto",
             temperature=temperature,
             max_tokens=512,
@@ -240,10 +314,8 @@ def run_agent(
     if final_response is None:
         # Forced text-only call: model summarises what it just did.
         # Reached when the model loops on duplicate tool calls or hits max_iter.
-        final = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=TOOL_SCHEMAS,
+        final = _chat_completion(
+            client, model, messages, backend, slot_id, timings_out,
             tool_choice="none",
             temperature=temperature,
             max_tokens=256,
@@ -0,0 +1,176 @@
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# How many llama-server processes may stay loaded at once. Switching back to
+# a resident model is instant; loading one more evicts the least recently used.
+MAX_RESIDENT_MODELS = 2
+BASE_PORT = 8080
+READY_TIMEOUT_S = 180
+
+
+@dataclass
+class LlamaInstance:
+    model: dict
+    port: int
+    proc: subprocess.Popen | None = None
+    status: str = "starting"        # starting | ready | error
+    error: str | None = None
+    last_used: float = field(default_factory=time.time)
+    stopped: bool = False
+
+    def stop(self) -> None:
+        self.stopped = True
+        _terminate(self.proc)
+
+
+def _terminate(proc: subprocess.Popen | None) -> None:
+    if proc is None:
+        return
+    try:
+        proc.terminate()
+        proc.wait(timeout=10)
+    except Exception:
+        proc.kill()
+
+
+def is_healthy(port: int) -> bool:
+    """Readiness probe: llama-server answers 200 on /health once the model is loaded (503 while loading)."""
+    try:
+        with urllib.request.urlopen(f"http://localhost:{port}/health", timeout=2) as resp:
+            return resp.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+class LlamaServerManager:
+    """Keeps recently used local models warm, one llama-server process per model.
+
+    Each resident model gets its own port. Activating a model that is already
+    resident only swaps the active pointer; activating a new one starts a
+    process in a background thread and, when more than `max_resident` models
+    would be loaded, evicts the least recently used one.
+    """
+
+    def __init__(self, max_resident: int = MAX_RESIDENT_MODELS, base_port: int = BASE_PORT) -> None:
+        self.max_resident = max_resident
+        self.base_port = base_port
+        self._instances: OrderedDict[str, LlamaInstance] = OrderedDict()
+        self._active_id: str | None = None
+        self._lock = threading.Lock()
+
+    # ── Queries ────────────────────────────────────────────────────────────
+
+    @property
+    def active(self) -> LlamaInstance | None:
+        with self._lock:
+            return self._instances.get(self._active_id) if self._active_id else None
+
+    def use_active(self) -> tuple[str, str | None, str | None, int | None]:
+        """Status, model id, error and port of the active model, read in one locked step.
+
+        Also marks the model as most recently used, so a concurrent `activate`
+        evicts another model first and the returned port stays its own.
+        """
+        with self._lock:
+            inst = self._instances.get(self._active_id) if self._active_id else None
+            if inst is None:
+                return "idle", None, None, None
+            self._instances.move_to_end(inst.model["id"])
+            inst.last_used = time.time()
+            return inst.status, inst.model["id"], inst.error, inst.port
+
+    def resident(self) -> list[dict]:
+        with self._lock:
+            return [
+                {"model_id": model_id, "port": inst.port, "status": inst.status}
+                for model_id, inst in self._instances.items()
+            ]
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────
+
+    def activate(self, model: dict) -> LlamaInstance:
+        """Make `model` the active local model, starting llama-server if needed."""
+        evicted = []
+        with self._lock:
+            inst = self._instances.get(model["id"])
+            if inst is not None and inst.status != "error":
+                self._instances.move_to_end(model["id"])
+                inst.last_used = time.time()
+                self._active_id = model["id"]
+                return inst
+
+            if inst is not None:
+                # A previous start failed: drop it and start again on the first free
+                # port (ports run from base_port to base_port + max_resident).
+                self._instances.pop(model["id"])
+                evicted.append(inst)
+
+            while len(self._instances) >= self.max_resident:
+                _, lru = self._instances.popitem(last=False)
+                evicted.append(lru)
+
+            used_ports = {i.port for i in self._instances.values()}
+            port = next(p for p in range(self.base_port, self.base_port + self.max_resident + 1) if p not in used_ports)
+            inst = LlamaInstance(model=model, port=port)
+            self._instances[model["id"]] = inst
+            self._active_id = model["id"]
+
+        for old in evicted:
+            old.stop()
+        threading.Thread(target=self._start, args=(inst,), daemon=True).start()
+        return inst
+
+    def _start(self, inst: LlamaInstance) -> None:
+        cmd = [
+            "llama-server",
+            "--hf-repo", inst.model["hf_repo"],
+            "--hf-file", inst.model["hf_file"],
+            "--port", str(inst.port),
+            "--ctx-size", "4096",
+            "--n-gpu-layers", "99",
+        ]
+        try:
+            inst.proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            inst.status = "error"
+            inst.error = str(e)
+            return
+        if inst.stopped:
+            # Evicted while the process was being spawned.
+            _terminate(inst.proc)
+            return
+
+        deadline = time.time() + READY_TIMEOUT_S
+        delay = 0.25
+        while time.time() < deadline and not inst.stopped:
+            if inst.proc.poll() is not None:
+                inst.status = "error"
+                inst.error = f"llama-server exited with code {inst.proc.returncode}"
+                return
+            if is_healthy(inst.port):
+                inst.status = "ready"
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+        if inst.stopped:
+            return
+        inst.status = "error"
+        inst.error = f"llama-server did not become ready within {READY_TIMEOUT_S}s"
+
+    def deactivate(self) -> None:
+        with self._lock:
+            self._active_id = None
+
+    def stop_all(self) -> None:
+        with self._lock:
+            instances = list(self._instances.values())
+            self._instances.clear()
+            self._active_id = None
+        for inst in instances:
+            inst.stop()
@@ -1,7 +1,3 @@
-import subprocess
-import threading
-import time
-import urllib.request
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -9,7 +5,8 @@ from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
-from app.agent import local_client, run_agent
+from app.agent import get_local_client, run_agent
+from app.llama_manager import LlamaServerManager
 from app.state import home_state
 
 # ── Model registry ─────────────────────────────────────────────────────────────
@@ -50,57 +47,15 @@ LOCAL_MODELS = [
 conversation_history: list[dict] = []
 active_backend: str = "local"
 
-llama_proc: subprocess.Popen | None = None
-llama_status: str = "idle"          # idle | starting | ready | error
-llama_active_model_id: str | None = None
-llama_error: str | None = None
+llama_manager = LlamaServerManager()
 
 
-# ── Background thread helper ───────────────────────────────────────────────────
-
-def _start_llama_server_bg(model: dict) -> None:
-    global llama_proc, llama_status, llama_active_model_id, llama_error, active_backend
-
-    llama_status = "starting"
-    llama_active_model_id = model["id"]
-    llama_error = None
-
-    if llama_proc is not None:
-        try:
-            llama_proc.terminate()
-            llama_proc.wait(timeout=10)
-        except Exception:
-            llama_proc.kill()
-        llama_proc = None
-
-    cmd = [
-        "llama-server",
-        "--hf-repo", model["hf_repo"],
-        "--hf-file", model["hf_file"],
-        "--port", "8080",
-        "--ctx-size", "4096",
-        "--n-gpu-layers", "99",
-    ]
-
-    try:
-        llama_proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except Exception as e:
-        llama_status = "error"
-        llama_error = str(e)
-        return
-
-    deadline = time.time() + 180
-    while time.time() < deadline:
-        try:
-            urllib.request.urlopen("http://localhost:8080/v1/models", timeout=2)
-            llama_status = "ready"
-            active_backend = "local"
-            return
-        except Exception:
-            time.sleep(2)
-
-    llama_status = "error"
-    llama_error = "llama-server did not become ready within 180s"
+def _local_status() -> tuple[str, str | None, str | None]:
+    """Status, model id and error of the active local model."""
+    inst = llama_manager.active
+    if inst is None:
+        return "idle", None, None
+    return inst.status, inst.model["id"], inst.error
 
 
 # ── Lifespan ───────────────────────────────────────────────────────────────────
@@ -108,13 +63,7 @@ def _start_llama_server_bg(model: dict) -> None:
 @asynccontextmanager
 async def lifespan(app_: FastAPI):
     yield
-    global llama_proc
-    if llama_proc is not None:
-        try:
-            llama_proc.terminate()
-            llama_proc.wait(timeout=10)
-        except Exception:
-            llama_proc.kill()
+    llama_manager.stop_all()
 
 
 # ── App ────────────────────────────────────────────────────────────────────────
@@ -133,10 +82,11 @@ def serve_index():
 @app.get("/model")
 def get_model():
     global active_backend
-    if active_backend == "openai":
-        return JSONResponse({"name": "gpt-4o-mini"})
+    inst = llama_manager.active
+    if active_backend == "openai" or inst is None:
+        return JSONResponse({"name": "gpt-4o-mini" if active_backend == "openai" else "unknown"})
     try:
-        models = local_client.models.list()
+        models = get_local_client(inst.port).models.list()
         name = models.data[0].id.split("_", 2)[-1] if models.data else "unknown"
     except Exception:
         name = "unknown"
@@ -182,10 +132,12 @@ def get_local_models():
 
 @app.get("/local-model-status")
 def get_local_model_status():
+    status, model_id, error = _local_status()
     return JSONResponse({
-        "status": llama_status,
-        "model_id": llama_active_model_id,
-        "error": llama_error,
+        "status": status,
+        "model_id": model_id,
+        "error": error,
+        "resident": llama_manager.resident(),
     })
 
 
@@ -195,25 +147,19 @@ class LocalModelRequest(BaseModel):
 
 @app.post("/local-model")
 def start_local_model(req: LocalModelRequest):
+    global active_backend
     model = next((m for m in LOCAL_MODELS if m["id"] == req.model_id), None)
     if model is None:
         return JSONResponse({"error": "unknown model_id"}, status_code=400)
-    threading.Thread(target=_start_llama_server_bg, args=(model,), daemon=True).start()
-    return JSONResponse({"status": "starting"})
+    inst = llama_manager.activate(model)
+    active_backend = "local"
+    return JSONResponse({"status": inst.status})
 
 
 @app.delete("/local-model")
 def stop_local_model():
-    global llama_proc, llama_status, llama_active_model_id, active_backend
-    if llama_proc is not None:
-        try:
-            llama_proc.terminate()
-            llama_proc.wait(timeout=10)
-        except Exception:
-            llama_proc.kill()
-        llama_proc = None
-    llama_status = "idle"
-    llama_active_model_id = None
+    global active_backend
+    llama_manager.stop_all()
     active_backend = "openai"
     return JSONResponse({"status": "idle"})
 
@@ -226,25 +172,29 @@ class ChatRequest(BaseModel):
 
 @app.post("/chat")
 def chat(req: ChatRequest):
-    if active_backend == "local" and llama_status != "ready":
+    backend = active_backend
+    status, _, error, local_port = llama_manager.use_active()
+    if backend == "local" and status != "ready":
         msg = {
             "starting": "Model is still loading, please wait.",
             "idle": "No local model loaded. Select a model from the LFM Local dropdown.",
-            "error": f"Local model failed to start: {llama_error}",
-        }.get(llama_status, "Local model is not ready.")
+            "error": f"Local model failed to start: {error}",
+        }.get(status, "Local model is not ready.")
         return JSONResponse({"text": msg, "tool_calls": []}, status_code=503)
 
     events = []
+    timings = []
 
     def on_tool_call(name, args, result):
         events.append({"name": name, "args": args, "result": result})
 
     try:
-        text = run_agent(req.message, history=conversation_history, backend=active_backend, on_tool_call=on_tool_call)
+        port = local_port if backend == "local" else 8080
+        text = run_agent(req.message, history=conversation_history, backend=backend, on_tool_call=on_tool_call, port=port, timings_out=timings)
     except Exception as e:
         return JSONResponse({"text": f"Error: {e}", "tool_calls": events}, status_code=500)
 
     conversation_history.append({"role": "user",      "content": req.message})
     conversation_history.append({"role": "assistant", "content": text})
 
-    return JSONResponse({"text": text, "tool_calls": events})
+    return JSONResponse({"text": text, "tool_calls": events, "timings": timings})
@@ -37,8 +37,10 @@ import copy
 import json
 import math
 import os
+import random
 import re
 import sys
+import zlib
 from collections import defaultdict
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
@@ -289,34 +291,124 @@ class ContaminationGuard:
     """
     Three-layer check to prevent benchmark data leakage into training.
 
-    Layer 1: exact match (case-insensitive)
+    Layer 1: exact match (case-insensitive), via a hash set
     Layer 2: substring containment (either direction)
     Layer 3: character trigram Jaccard similarity > 0.5
+
+    Benchmark prompts are normalized and shingled once at construction.
+    Layer 2 checks "prompt inside utterance" through a shingle index. Each
+    prompt is posted under its rarest trigram, which any utterance containing
+    the prompt must also contain. So only prompts whose anchor trigram occurs
+    in the utterance are verified with a real substring test.
+
+    Layer 3 looks up candidates in a MinHash LSH index (NUM_PERM hashes split
+    into BANDS bands) and only computes the exact Jaccard for those, so each
+    check costs roughly O(candidates) instead of O(benchmark size). With
+    2-row bands a pair at the 0.5 threshold collides with probability
+    1 - (1 - 0.5**2)**32 > 0.9999.
+
+    The guard is built once in the parent process and shipped to the
+    ProcessPoolExecutor workers via `to_state()` / `from_state()`.
     """
 
-    def __init__(self) -> None:
-        self._prompts: list[str] = [t.prompt for t in TASKS]
+    NUM_PERM = 64
+    BANDS = 32
+    THRESHOLD = 0.5
+    _PRIME = (1 << 61) - 1
+    _SEED = 1234
+
+    def __init__(self, prompts: list[str] | None = None) -> None:
+        prompts = [t.prompt for t in TASKS] if prompts is None else prompts
+        self._prompts: list[str] = [p.lower() for p in prompts]
+        self._exact: set[str] = set(self._prompts)
+        # NUL never appears in generated utterances, so a single search over
+        # the joined text answers "is u inside any prompt" without false hits.
+        self._joined: str = "\0".join(self._prompts)
+        self._shingles: list[set[str]] = [self._trigrams(p) for p in self._prompts]
+        self._perms = self._permutations()
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+        for idx, shingles in enumerate(self._shingles):
+            for key in self._band_keys(shingles):
+                self._buckets[key].append(idx)
+        self._anchors, self._short = self._anchor_index(self._shingles)
+
+    @staticmethod
+    def _anchor_index(shingles: list[set[str]]) -> tuple[dict[str, list[int]], list[int]]:
+        """Post each prompt under its rarest trigram; prompts under 3 chars have none."""
+        frequency: dict[str, int] = defaultdict(int)
+        for prompt_shingles in shingles:
+            for tri in prompt_shingles:
+                frequency[tri] += 1
+        anchors: dict[str, list[int]] = defaultdict(list)
+        short: list[int] = []
+        for idx, prompt_shingles in enumerate(shingles):
+            if not prompt_shingles:
+                short.append(idx)
+                continue
+            anchors[min(prompt_shingles, key=lambda tri: (frequency[tri], tri))].append(idx)
+        return dict(anchors), short
 
-    def _trigrams(self, s: str) -> set[str]:
+    @staticmethod
+    def _trigrams(s: str) -> set[str]:
         s = s.lower()
         return {s[i:i + 3] for i in range(len(s) - 2)} if len(s) >= 3 else set()
 
+    @classmethod
+    def _permutations(cls) -> list[tuple[int, int]]:
+        rng = random.Random(cls._SEED)
+        return [(rng.randrange(1, cls._PRIME), rng.randrange(0, cls._PRIME)) for _ in range(cls.NUM_PERM)]
+
+    def _band_keys(self, shingles: set[str]) -> list[tuple[int, tuple[int, ...]]]:
+        if not shingles:
+            return []
+        # crc32 rather than hash(): str hashes are salted per process.
+        hashed = [zlib.crc32(s.encode()) for s in shingles]
+        signature = [min((a * h + b) % self._PRIME for h in hashed) for a, b in self._perms]
+        rows = self.NUM_PERM // self.BANDS
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.BANDS)]
+
+    def to_state(self) -> dict:
+        """Return a picklable snapshot of the index."""
+        return {
+            "prompts": self._prompts,
+            "shingles": self._shingles,
+            "buckets": dict(self._buckets),
+            "anchors": self._anchors,
+            "short": self._short,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ContaminationGuard":
+        """Rebuild a guard from `to_state()` output without re-hashing any prompt."""
+        guard = cls.__new__(cls)
+        guard._prompts = state["prompts"]
+        guard._exact = set(guard._prompts)
+        guard._joined = "\0".join(guard._prompts)
+        guard._shingles = state["shingles"]
+        guard._perms = cls._permutations()
+        guard._buckets = defaultdict(list, state["buckets"])
+        guard._anchors = state["anchors"]
+        guard._short = state["short"]
+        return guard
+
     def is_contaminated(self, utterance: str) -> bool:
         u = utterance.lower()
-        u_tri = self._trigrams(utterance)
-        for bp in self._prompts:
-            bp_l = bp.lower()
-            if u == bp_l:
-                return True
-            if bp_l in u or u in bp_l:
+        if u in self._exact:
+            return True
+        if u in self._joined:
+            return True
+
+        u_tri = self._trigrams(u)
+        contains = {idx for tri in u_tri for idx in self._anchors.get(tri, ())}
+        if any(self._prompts[idx] in u for idx in (*contains, *self._short)):
+            return True
+        if not u_tri:
+            return False
+        candidates = {idx for key in self._band_keys(u_tri) for idx in self._buckets.get(key, ())}
+        for idx in candidates:
+            bp_tri = self._shingles[idx]
+            if bp_tri and len(u_tri & bp_tri) / len(u_tri | bp_tri) > self.THRESHOLD:
                 return True
-            if u_tri:
-                bp_tri = self._trigrams(bp)
-                if bp_tri:
-                    inter = len(u_tri & bp_tri)
-                    union = len(u_tri | bp_tri)
-                    if inter / union > 0.5:
-                        return True
         return False
 
 
@@ -471,9 +563,18 @@ def _format_record(utterance: str, assistant_msg: dict, cell: dict) -> dict:
 # Per-cell worker (runs in a subprocess)
 # ---------------------------------------------------------------------------
 
+_worker_guard: ContaminationGuard | None = None
+
+
+def _init_worker(guard_state: dict) -> None:
+    """ProcessPoolExecutor initializer: load the prebuilt guard once per worker."""
+    global _worker_guard
+    _worker_guard = ContaminationGuard.from_state(guard_state)
+
+
 def _process_cell(cell: dict, quota: int) -> dict:
     """Process one taxonomy cell and return picklable results."""
-    guard = ContaminationGuard()
+    guard = _worker_guard if _worker_guard is not None else ContaminationGuard()
 
     local_stats: dict[str, int] = {
         "total_generated": 0,
@@ -796,9 +897,15 @@ def generate(
     }
     coverage: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
 
+    guard_state = ContaminationGuard().to_state()
+
     data_path = output / "data.jsonl"
     with open(data_path, "w") as jsonl_file:
-        with ProcessPoolExecutor(max_workers=min(workers, len(GENERATION_SPEC))) as executor:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(GENERATION_SPEC)),
+            initializer=_init_worker,
+            initargs=(guard_state,),
+        ) as executor:
             future_to_label = {
                 executor.submit(_process_cell, cell, quota): f"{cell['capability']}/{cell['phrasing']}/{cell['depth']}"
                 for cell, quota in cell_jobs
@@ -46,6 +46,7 @@ class AggregatedResult:
     std_dev: float
     mean_duration_s: float
     n_runs: int
+    timings: list[dict]     # per model call, across all runs
 
 
 def _deep_merge(base: dict, override: dict) -> dict:
@@ -74,9 +75,41 @@ def aggregate_results(task, results: list[TaskResult]) -> AggregatedResult:
         std_dev=std_dev,
         mean_duration_s=mean_dur,
         n_runs=len(results),
+        timings=[t for r in results for t in r.timings],
     )
 
 
+def format_timings(agg_results: list[AggregatedResult]) -> str:
+    """Summarise prompt-eval vs generation cost over every model call.
+
+    Only llama-server reports per-phase timings; for other backends the
+    token counts are shown and the ms columns read N/A.
+    """
+    calls = [t for r in agg_results for t in r.timings]
+    if not calls:
+        return "No timings recorded."
+
+    def _total(key: str) -> float | None:
+        values = [t[key] for t in calls if t.get(key) is not None]
+        return sum(values) if values else None
+
+    def _per_call(key: str, fmt: str) -> str:
+        total = _total(key)
+        return format(total / len(calls), fmt) if total is not None else "N/A"
+
+    lines = [
+        f"  model calls         {len(calls)}",
+        f"  prompt tokens/call  {_per_call('prompt_total_n', '.1f')} total, {_per_call('prompt_n', '.1f')} evaluated, {_per_call('cache_n', '.1f')} from cache",
+        f"  prompt eval/call    {_per_call('prompt_ms', '.1f')} ms",
+        f"  generation/call     {_per_call('predicted_n', '.1f')} tokens, {_per_call('predicted_ms', '.1f')} ms",
+        f"  wall time/call      {_per_call('wall_ms', '.1f')} ms",
+    ]
+    prompt_ms, predicted_ms = _total("prompt_ms"), _total("predicted_ms")
+    if prompt_ms is not None and predicted_ms is not None and prompt_ms + predicted_ms > 0:
+        lines.append(f"  prompt eval share   {100 * prompt_ms / (prompt_ms + predicted_ms):.1f}%")
+    return "\n".join(lines)
+
+
 def _wait_for_server(timeout: int = 600, port: int = 8080) -> None:
     """Poll http://localhost:<port>/v1/models until the server responds or timeout."""
     deadline = time.time() + timeout
@@ -129,12 +162,15 @@ def run_task(task, backend: str = "local", n: int = 1, reset_state: bool = True,
             tool_calls_seen.append({"name": name, "args": args})
 
         messages_out = [] if debug else None
+        timings = []
         start = time.time()
-        run_agent(task.prompt, history=getattr(task, "history", []), backend=backend, on_tool_call=capture, messages_out=messages_out, raw_tool_call_parsing=raw_tool_call_parsing, port=port)
+        run_agent(task.prompt, history=getattr(task, "history", []), backend=backend, on_tool_call=capture, messages_out=messages_out, raw_tool_call_parsing=raw_tool_call_parsing, port=port, timings_out=timings)
         duration = time.time() - start
 
         final_state = copy.deepcopy(home_state)
-        results.append(task.verifier(tool_calls_seen, duration, final_state))
+        result = task.verifier(tool_calls_seen, duration, final_state)
+        result.timings = timings
+        results.append(result)
 
         if debug:
             last_assistant_turns = [m for m in messages_out if m.get("role") == "assistant"]
@@ -211,6 +247,9 @@ def format_results(agg_results: list[AggregatedResult], backend: str, model_name
             avg = sum(r.pass_rate for r in group) / len(group)
             lines.append(f"  {depth:<10} {avg * 100:>5.1f}%  ({len(group)} tasks)")
 
+    lines.append("\nTimings:")
+    lines.append(format_timings(agg_results))
+
     return "\n".join(lines)
 
 
@@ -330,6 +369,8 @@ def save_results(agg_results: list[AggregatedResult], backend: str, model_name:
 
     breakdown_section = "## Breakdown\n\n" + "\n".join(breakdown_lines)
 
+    timings_section = "## Timings\n\n```\n" + format_timings(agg_results) + "\n```"
+
     # --- Task table ---
     table_lines = []
     if multi:
@@ -360,6 +401,7 @@ def save_results(agg_results: list[AggregatedResult], backend: str, model_name:
         f"{params_section}\n\n"
         f"{score_section}\n\n"
         f"{breakdown_section}\n\n"
+        f"{timings_section}\n\n"
         f"{tasks_section}\n"
     )
     out_path.write_text(content)
@@ -86,6 +86,7 @@ class TaskResult:
     tool_called: bool
     args_correct: bool
     duration_s: float
+    timings: list[dict] = field(default_factory=list)   # per model call, filled in by run.py
 
 
 # ---------------------------------------------------------------------------
@@ -48,12 +48,19 @@ class TaskResult:
     n_turns: int
     stdout: str
     error: str | None
+    # Prompt size per model call, as reported by the backend
+    prompt_tokens_per_call: list[int] = field(default_factory=list)
+    compactions: int = 0
+    truncated_outputs: int = 0
+    # Time spent converting requests to the backend's format (local backend only)
+    translation_ms: float = 0.0
+    first_token_s: list[float] = field(default_factory=list)
 
 
 # ── Instrumented LLM wrapper ──────────────────────────────────────────────────
 
 class InstrumentedLLMClient:
-    """Wraps any LLMClient to capture per-task token counts and call counts."""
+    """Wraps any LLMClient to capture per-task token counts, call counts and translation overhead."""
 
     def __init__(self, inner) -> None:
         self._inner = inner
@@ -61,9 +68,17 @@ class InstrumentedLLMClient:
         self.output_tokens = 0
         self.n_turns = 0
         self.tool_calls: list[str] = []
-
-    def chat(self, messages: list[dict], tools: list[dict], system: str) -> LLMResponse:
-        response = self._inner.chat(messages=messages, tools=tools, system=system)
+        self.translation_s = 0.0
+        self.first_token_s: list[float] = []
+
+    def chat(self, messages: list[dict], tools: list[dict], system: str, on_text=None) -> LLMResponse:
+        # Backends that translate requests (LlamaClient) keep cumulative counters
+        translation_before = getattr(self._inner, "translation_time_s", 0.0)
+        response = self._inner.chat(messages=messages, tools=tools, system=system, on_text=on_text)
+        self.translation_s += getattr(self._inner, "translation_time_s", 0.0) - translation_before
+        first_token_s = getattr(self._inner, "time_to_first_token_s", None)
+        if first_token_s is not None:
+            self.first_token_s.append(first_token_s)
         self.n_turns += 1
         self.input_tokens += response.input_tokens
         self.output_tokens += response.output_tokens
@@ -77,6 +92,8 @@ class InstrumentedLLMClient:
         self.output_tokens = 0
         self.n_turns = 0
         self.tool_calls = []
+        self.translation_s = 0.0
+        self.first_token_s = []
 
 
 # ── Task runner ───────────────────────────────────────────────────────────────
@@ -119,6 +136,8 @@ def run_task(
         if p.exists():
             p.unlink()
 
+    context_stats = agent.context.stats
+
     return TaskResult(
         task_id=task.id,
         task_name=task.name,
@@ -131,6 +150,11 @@ def run_task(
         n_turns=instrumented.n_turns,
         stdout=stdout,
         error=error,
+        prompt_tokens_per_call=[c["prompt_tokens"] for c in context_stats.calls],
+        compactions=context_stats.compactions,
+        truncated_outputs=context_stats.truncated_outputs,
+        translation_ms=round(instrumented.translation_s * 1000, 3),
+        first_token_s=[round(t, 3) for t in instrumented.first_token_s],
     )
 
 
@@ -145,7 +169,7 @@ def print_summary(
     col_task = 40
     header = (
         f"{'#':<4} {'Task':<{col_task}} {'Pass':<6} {'Time':>8}  "
-        f"{'In/Out tokens':>18}  {'Turns':>5}"
+        f"{'In/Out tokens':>18}  {'Turns':>5}  {'Peak prompt':>11}  {'Compact':>7}"
     )
     sep = "-" * len(header)
     print(header)
@@ -154,20 +178,29 @@ def print_summary(
     for r in results:
         sym = "\u2713" if r.passed else "\u2717"
         tokens = f"{r.input_tokens}/{r.output_tokens}"
+        peak_prompt = max(r.prompt_tokens_per_call, default=0)
         print(
             f"{r.task_id:<4} {r.task_name:<{col_task}} {sym:<6} "
-            f"{r.duration_s:>7.1f}s  {tokens:>18}  {r.n_turns:>5}"
+            f"{r.duration_s:>7.1f}s  {tokens:>18}  {r.n_turns:>5}  "
+            f"{peak_prompt:>11}  {r.compactions:>7}"
         )
 
     print(sep)
     n_passed = sum(1 for r in results if r.passed)
     total_tokens = sum(r.input_tokens + r.output_tokens for r in results)
     avg_time = sum(r.duration_s for r in results) / len(results) if results else 0.0
+    total_translation_ms = sum(r.translation_ms for r in results)
+    first_tokens = [t for r in results for t in r.first_token_s]
     print(
         f"\nScore: {n_passed}/{len(results)}  |  "
         f"Total tokens: {total_tokens}  |  "
         f"Avg time: {avg_time:.1f}s"
     )
+    if first_tokens:
+        print(
+            f"Request translation: {total_translation_ms:.1f}ms total  |  "
+            f"Avg time to first token: {sum(first_tokens) / len(first_tokens):.2f}s"
+        )
 
 
 def save_results(
@@ -1,7 +1,9 @@
+import json
+
 from .config import Config
 from .context import ContextManager, SYSTEM_PROMPT
 from .llm.base import LLMClient
-from .tools import TOOLS, execute_tool
+from .tools import TOOLS, execute_tool_calls
 
 
 class Agent:
@@ -9,7 +11,18 @@ class Agent:
 
     def __init__(self, llm: LLMClient, config: Config) -> None:
         self._llm = llm
-        self._context = ContextManager(max_messages=config.max_context_messages)
+        self._max_parallel_tools = config.max_parallel_tools
+        self._context = ContextManager(
+            max_messages=config.max_context_messages,
+            max_tokens=config.max_context_tokens,
+            max_tool_output_chars=config.max_tool_output_chars,
+            max_stashed_chars=config.max_stashed_output_chars,
+            fixed_prompt=SYSTEM_PROMPT + json.dumps(TOOLS),
+        )
+
+    @property
+    def context(self) -> ContextManager:
+        return self._context
 
     def run_turn(self, user_input: str) -> None:
         """Process one user message, running the inner loop until end_turn."""
@@ -17,14 +30,26 @@ class Agent:
 
         while True:
             if self._context.should_compact():
+                before = self._context.estimated_tokens()
                 self._context.compact()
-                print("[context compacted]")
+                print(f"[context compacted: ~{before} -> ~{self._context.estimated_tokens()} tokens]")
+
+            # Print the response text live, as the backend produces it
+            printed: list[str] = []
+
+            def on_text(delta: str) -> None:
+                printed.append(delta)
+                print(delta, end="", flush=True)
 
             response = self._llm.chat(
                 messages=self._context.get_messages(),
                 tools=TOOLS,
                 system=SYSTEM_PROMPT,
+                on_text=on_text,
             )
+            if printed:
+                print()
+            self._context.record_usage(response.input_tokens)
 
             # Add assistant response to history
             self._context.add({"role": "assistant", "content": response.content})
@@ -32,23 +57,26 @@ class Agent:
             tool_calls = [b for b in response.content if b["type"] == "tool_use"]
 
             if not tool_calls:
-                # End of turn — print the final text response
-                for block in response.content:
-                    if block["type"] == "text":
-                        print(block["text"])
+                # End of turn — the final text response was already printed
                 break
 
-            # Execute all tool calls and collect results
-            tool_results = []
+            # Execute all tool calls (independent reads concurrently) and collect results
             for call in tool_calls:
                 args_preview = ", ".join(f"{k}={v!r}" for k, v in call["input"].items())
                 print(f"  [tool] {call['name']}({args_preview})")
-                result = execute_tool(call["name"], call["input"])
-                tool_results.append({
+            results = execute_tool_calls(
+                tool_calls,
+                max_workers=self._max_parallel_tools,
+                extra_tools={"read_output": self._context.read_output},
+            )
+            tool_results = [
+                {
                     "type": "tool_result",
                     "tool_use_id": call["id"],
                     "content": result,
-                })
+                }
+                for call, result in zip(tool_calls, results)
+            ]
 
             # Feed results back as a user message and loop
             self._context.add({"role": "user", "content": tool_results})
@@ -22,10 +22,15 @@ class Config:
     local_api_key: str = "sk-no-key"  # llama.cpp server ignores this
     local_ctx_size: int = 32768
     local_n_gpu_layers: int = 99
+    local_stream: bool = True  # stream responses from the local server
 
     # Agent behavior
     max_tokens: int = 8192
     max_context_messages: int = 40  # before compaction triggers
+    max_context_tokens: int = 24000  # estimated prompt size before compaction triggers
+    max_tool_output_chars: int = 8000  # longer tool outputs are truncated in the history
+    max_stashed_output_chars: int = 2_000_000  # full text of truncated outputs kept for read_output
+    max_parallel_tools: int = 4  # concurrent read-only tool calls per turn
     working_directory: str = "."
 
 
@@ -39,7 +44,12 @@ def load_config() -> Config:
         local_model=os.getenv("LCA_LOCAL_MODEL", "local"),
         local_ctx_size=int(os.getenv("LCA_LOCAL_CTX_SIZE", "32768")),
         local_n_gpu_layers=int(os.getenv("LCA_LOCAL_GPU_LAYERS", "99")),
+        local_stream=os.getenv("LCA_LOCAL_STREAM", "1") != "0",
         max_tokens=int(os.getenv("LCA_MAX_TOKENS", "8192")),
         max_context_messages=int(os.getenv("LCA_MAX_CONTEXT_MESSAGES", "40")),
+        max_context_tokens=int(os.getenv("LCA_MAX_CONTEXT_TOKENS", "24000")),
+        max_tool_output_chars=int(os.getenv("LCA_MAX_TOOL_OUTPUT_CHARS", "8000")),
+        max_stashed_output_chars=int(os.getenv("LCA_MAX_STASHED_OUTPUT_CHARS", "2000000")),
+        max_parallel_tools=int(os.getenv("LCA_MAX_PARALLEL_TOOLS", "4")),
         working_directory=os.getenv("LCA_WORKING_DIR", "."),
     )
@@ -1,3 +1,9 @@
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
 SYSTEM_PROMPT = """\
 You are a local coding assistant running in a terminal.
 You help users understand, create, and modify code.
@@ -7,6 +13,7 @@ You have access to these tools:
 - write_file: create or overwrite a file with new content
 - list_directory: list files in a directory
 - run_bash: run any shell command (git, grep, python, tests, etc.)
+- read_output: read the rest of a tool output that was truncated
 
 Guidelines:
 - Before making changes, read the relevant files first
@@ -16,38 +23,210 @@ Guidelines:
 - When writing files, always write the complete file content, not just the changed parts
 """
 
+CHECKPOINT_PREFIX = "[Context checkpoint"
+_CHECKPOINT_COUNTS = re.compile(r"(\d+) older messages replaced by this summary(?:; (\d+) earliest entries omitted)?")
+
+# Starting guess for the estimator; calibrated against the token counts the backend reports
+_CHARS_PER_TOKEN = 4.0
+
+
+@dataclass
+class ContextStats:
+    """Prompt size per model call, plus how often the history had to be shrunk."""
+
+    # One entry per call: {"messages", "estimated_tokens", "prompt_tokens"}
+    calls: list[dict] = field(default_factory=list)
+    compactions: int = 0
+    truncated_outputs: int = 0
+
 
 class ContextManager:
     """
     Manages the conversation history passed to the model.
 
-    Simple compaction strategy: when message count exceeds the limit,
-    keep the first 2 messages (original task context) and the most recent
-    half, inserting a notice where messages were dropped.
+    Compaction is token-budgeted: when the estimated prompt (system prompt,
+    tools and history) exceeds `max_tokens`, or the history exceeds
+    `max_messages`, the middle of the history is replaced by a checkpoint
+    message summarizing it, until the prompt is back under half the budget.
+    The first message (the original task) is always kept, and the kept tail
+    starts at an assistant message so tool calls and their results stay paired.
+
+    Tool outputs longer than `max_tool_output_chars` are truncated when added;
+    the full text stays retrievable through the read_output tool, until the
+    stashed outputs exceed `max_stashed_chars` and the least recently read
+    ones are dropped.
     """
 
-    def __init__(self, max_messages: int = 40) -> None:
+    def __init__(
+        self,
+        max_messages: int = 40,
+        max_tokens: int = 24000,
+        max_tool_output_chars: int = 8000,
+        max_stashed_chars: int = 2_000_000,
+        fixed_prompt: str = SYSTEM_PROMPT,
+    ) -> None:
         self._messages: list[dict] = []
+        self._sizes: list[int] = []  # serialized length of each message, in chars
         self._max_messages = max_messages
+        self._max_tokens = max_tokens
+        self._max_tool_output_chars = max_tool_output_chars
+        # Full text of truncated tool outputs by handle, least recently used first.
+        # read_output calls run concurrently, hence the lock.
+        self._stash: OrderedDict[str, str] = OrderedDict()
+        self._stash_chars = 0
+        self._stash_count = 0
+        self._max_stashed_chars = max_stashed_chars
+        self._stash_lock = threading.Lock()
+        self._fixed_chars = len(fixed_prompt)
+        self._chars_per_token = _CHARS_PER_TOKEN
+        self.stats = ContextStats()
 
     def add(self, message: dict) -> None:
+        message = self._truncate_tool_results(message)
         self._messages.append(message)
+        self._sizes.append(len(json.dumps(message)))
 
     def get_messages(self) -> list[dict]:
         return self._messages.copy()
 
+    def estimated_tokens(self) -> int:
+        """Estimated prompt size of the next call, in tokens."""
+        return self._to_tokens(self._fixed_chars + sum(self._sizes))
+
+    def record_usage(self, prompt_tokens: int) -> None:
+        """Record the prompt size the backend reported for the last call and recalibrate."""
+        estimated = self.estimated_tokens()
+        self.stats.calls.append({
+            "messages": len(self._messages),
+            "estimated_tokens": estimated,
+            "prompt_tokens": prompt_tokens,
+        })
+        if prompt_tokens > 0:
+            observed = (self._fixed_chars + sum(self._sizes)) / prompt_tokens
+            # Smooth, so one odd call (e.g. a prompt-cache hit) doesn't swing the estimate
+            self._chars_per_token = 0.7 * self._chars_per_token + 0.3 * observed
+
+    def read_output(self, handle: str, offset: int = 0, limit: int = 4000) -> str:
+        """Return a slice of a tool output that was truncated in the conversation."""
+        with self._stash_lock:
+            text = self._stash.get(handle)
+            if text is not None:
+                self._stash.move_to_end(handle)
+        if text is None:
+            return f"[error] Unknown or expired output handle: {handle}"
+        chunk = text[offset:offset + limit]
+        return f"{chunk}\n[chars {offset}-{offset + len(chunk)} of {len(text)}]"
+
     def should_compact(self) -> bool:
-        return len(self._messages) > self._max_messages
+        return len(self._messages) > self._max_messages or self.estimated_tokens() > self._max_tokens
 
     def compact(self) -> None:
-        """Drop the middle of the history, preserving head and tail."""
+        """Replace the middle of the history with a checkpoint, preserving head and tail."""
         if not self.should_compact():
             return
+
         keep_recent = self._max_messages // 2
-        head = self._messages[:2]
-        tail = self._messages[-keep_recent:]
-        notice = {
-            "role": "user",
-            "content": "[Context compacted: older messages removed to stay within limits]",
-        }
-        self._messages = head + [notice] + tail
+        reserve = self._to_tokens(self._fixed_chars + self._sizes[0]) + 500  # room for the checkpoint
+        budget = self._max_tokens // 2 - reserve
+
+        # Walk back from the newest message; the tail may only start at an assistant message
+        start = None
+        used = 0
+        for i in range(len(self._messages) - 1, 0, -1):
+            used += self._to_tokens(self._sizes[i])
+            if start is not None and (used > budget or len(self._messages) - i > keep_recent):
+                break
+            if self._messages[i]["role"] == "assistant":
+                start = i
+        dropped = self._messages[1:start] if start is not None else []
+        if not dropped or (len(dropped) == 1 and _is_checkpoint(dropped[0])):
+            return
+
+        checkpoint = {"role": "user", "content": _summarize(dropped)}
+        self._messages = [self._messages[0], checkpoint] + self._messages[start:]
+        self._sizes = [self._sizes[0], len(json.dumps(checkpoint))] + self._sizes[start:]
+        self.stats.compactions += 1
+
+    def _to_tokens(self, chars: int) -> int:
+        return int(chars / self._chars_per_token)
+
+    def _stash_output(self, text: str) -> str:
+        """Keep the full text of a truncated tool output and return its handle."""
+        with self._stash_lock:
+            self._stash_count += 1
+            handle = f"out-{self._stash_count}"
+            self._stash[handle] = text
+            self._stash_chars += len(text)
+            # Always keep the newest output, even if it alone is over the cap
+            while self._stash_chars > self._max_stashed_chars and len(self._stash) > 1:
+                _, dropped = self._stash.popitem(last=False)
+                self._stash_chars -= len(dropped)
+        return handle
+
+    def _truncate_tool_results(self, message: dict) -> dict:
+        content = message.get("content")
+        if not isinstance(content, list):
+            return message
+
+        blocks = []
+        for block in content:
+            text = block.get("content") if block.get("type") == "tool_result" else None
+            if isinstance(text, str) and len(text) > self._max_tool_output_chars:
+                handle = self._stash_output(text)
+                head = text[: self._max_tool_output_chars * 2 // 3]
+                tail = text[-(self._max_tool_output_chars // 3):]
+                omitted = len(text) - len(head) - len(tail)
+                notice = (
+                    f"\n[... {omitted} chars omitted. Full output ({len(text)} chars): "
+                    f"read_output(handle={handle!r}, offset={len(head)})]\n"
+                )
+                block = {**block, "content": head + notice + tail}
+                self.stats.truncated_outputs += 1
+            blocks.append(block)
+        return {**message, "content": blocks}
+
+
+def _is_checkpoint(message: dict) -> bool:
+    content = message["content"]
+    return isinstance(content, str) and content.startswith(CHECKPOINT_PREFIX)
+
+
+def _summarize(messages: list[dict], max_lines: int = 40) -> str:
+    """Short, deterministic digest of dropped messages: user requests, assistant text and tool calls."""
+    lines: list[str] = []
+    replaced = omitted = 0
+    for msg in messages:
+        content = msg["content"]
+        if _is_checkpoint(msg):
+            # Carry forward the previous checkpoint's digest and counts
+            header, *digest = content.splitlines()
+            lines.extend(digest)
+            counts = _CHECKPOINT_COUNTS.search(header)
+            if counts:
+                replaced += int(counts.group(1))
+                omitted += int(counts.group(2) or 0)
+            else:
+                replaced += 1
+            continue
+        replaced += 1
+        if isinstance(content, str):
+            lines.append(f"- User: {_shorten(content, 200)}")
+            continue
+        for block in content:
+            if block.get("type") == "text":
+                lines.append(f"- Assistant: {_shorten(block['text'], 200)}")
+            elif block.get("type") == "tool_use":
+                args = ", ".join(f"{k}={v!r}" for k, v in block["input"].items())
+                lines.append(f"- Called {block['name']}({_shorten(args, 120)})")
+
+    omitted += max(0, len(lines) - max_lines)
+    lines = lines[-max_lines:]
+    header = f"{CHECKPOINT_PREFIX}: {replaced} older messages replaced by this summary"
+    if omitted > 0:
+        header += f"; {omitted} earliest entries omitted"
+    return "\n".join([header + "]"] + lines)
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
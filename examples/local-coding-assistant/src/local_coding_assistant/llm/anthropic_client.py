@@ -1,3 +1,5 @@
+from collections.abc import Callable
+
 import anthropic
 
 from ..config import Config
@@ -12,7 +14,13 @@ class AnthropicClient:
         self._model = config.anthropic_model
         self._max_tokens = config.max_tokens
 
-    def chat(self, messages: list[dict], tools: list[dict], system: str) -> LLMResponse:
+    def chat(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        system: str,
+        on_text: Callable[[str], None] | None = None,
+    ) -> LLMResponse:
         # Translate neutral tool schema (parameters) -> Anthropic format (input_schema)
         anthropic_tools = [
             {
@@ -36,6 +44,8 @@ class AnthropicClient:
         for block in response.content:
             if block.type == "text":
                 content.append({"type": "text", "text": block.text})
+                if on_text:
+                    on_text(block.text)
             elif block.type == "tool_use":
                 content.append({
                     "type": "tool_use",
@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -14,6 +15,9 @@ class LLMClient(Protocol):
     """
     Minimal protocol that both Anthropic and llama.cpp backends implement.
     The agentic loop only talks to this interface.
+
+    `on_text`, if given, is called with the response text as it arrives:
+    delta by delta when the backend streams, in one piece otherwise.
     """
 
     def chat(
@@ -21,4 +25,5 @@ class LLMClient(Protocol):
         messages: list[dict],
         tools: list[dict],
         system: str,
+        on_text: Callable[[str], None] | None = None,
     ) -> LLMResponse: ...
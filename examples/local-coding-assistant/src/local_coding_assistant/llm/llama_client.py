@@ -1,4 +1,6 @@
 import json
+import time
+from collections.abc import Callable
 
 from openai import OpenAI
 
@@ -6,8 +8,67 @@ from ..config import Config
 from .base import LLMResponse
 
 
+def translate_tools(tools: list[dict]) -> list[dict]:
+    """Neutral tool schema -> OpenAI format, which wraps it in {"type": "function", "function": {...}}."""
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": t["name"],
+                "description": t["description"],
+                "parameters": t["parameters"],
+            },
+        }
+        for t in tools
+    ]
+
+
+def translate_message(msg: dict) -> list[dict]:
+    """Translate one Anthropic-style message into one or more OpenAI-style messages."""
+    if isinstance(msg.get("content"), list):
+        blocks = msg["content"]
+        # tool_result blocks (Anthropic format) -> tool role messages (OpenAI format)
+        if blocks and blocks[0].get("type") == "tool_result":
+            return [
+                {
+                    "role": "tool",
+                    "tool_call_id": block["tool_use_id"],
+                    "content": block["content"],
+                }
+                for block in blocks
+            ]
+        # Assistant message with content blocks -> extract text + tool_calls
+        if blocks and blocks[0].get("type") in ("text", "tool_use"):
+            text_parts = [b["text"] for b in blocks if b["type"] == "text"]
+            tool_calls = [
+                {
+                    "id": b["id"],
+                    "type": "function",
+                    "function": {
+                        "name": b["name"],
+                        "arguments": json.dumps(b["input"]),
+                    },
+                }
+                for b in blocks
+                if b["type"] == "tool_use"
+            ]
+            openai_msg: dict = {"role": "assistant", "content": " ".join(text_parts) or None}
+            if tool_calls:
+                openai_msg["tool_calls"] = tool_calls
+            return [openai_msg]
+    return [msg]
+
+
 class LlamaClient:
-    """llama.cpp backend via OpenAI-compatible REST API."""
+    """
+    llama.cpp backend via OpenAI-compatible REST API.
+
+    Translation to OpenAI format is cached: the tool list is translated once
+    per list object, and each history message once per message object, so a
+    call only converts the messages added since the previous one. Responses
+    are streamed unless `config.local_stream` is off, and text deltas are
+    passed to `on_text` as they arrive.
+    """
 
     def __init__(self, config: Config) -> None:
         self._client = OpenAI(
@@ -16,89 +77,138 @@ class LlamaClient:
         )
         self._model = config.local_model
         self._max_tokens = config.max_tokens
+        self._stream = config.local_stream
+
+        self._tools_source: list[dict] | None = None
+        self._openai_tools: list[dict] = []
+        # id(message) -> (message, translation); the message is kept so its id can't be reused
+        self._translated: dict[int, tuple[dict, list[dict]]] = {}
+
+        # Cumulative time spent translating requests, and the last call's time to first token
+        self.translation_time_s = 0.0
+        self.time_to_first_token_s: float | None = None
+
+    def _translate(self, messages: list[dict], tools: list[dict], system: str) -> tuple[list[dict], list[dict]]:
+        if tools is not self._tools_source:
+            self._tools_source = tools
+            self._openai_tools = translate_tools(tools)
 
-    def chat(self, messages: list[dict], tools: list[dict], system: str) -> LLMResponse:
+        cache: dict[int, tuple[dict, list[dict]]] = {}
         # OpenAI format: system message prepended to the messages list
-        openai_messages = [{"role": "system", "content": system}] + messages
-
-        # Translate tool_result blocks (Anthropic format) to tool role messages (OpenAI format)
-        translated: list[dict] = []
-        for msg in openai_messages:
-            if isinstance(msg.get("content"), list):
-                # Check if this is a list of tool_result blocks
-                blocks = msg["content"]
-                if blocks and blocks[0].get("type") == "tool_result":
-                    for block in blocks:
-                        translated.append({
-                            "role": "tool",
-                            "tool_call_id": block["tool_use_id"],
-                            "content": block["content"],
-                        })
-                    continue
-                # Assistant message with content blocks -> extract text + tool_calls
-                if blocks and blocks[0].get("type") in ("text", "tool_use"):
-                    text_parts = [b["text"] for b in blocks if b["type"] == "text"]
-                    tool_calls = [
-                        {
-                            "id": b["id"],
-                            "type": "function",
-                            "function": {
-                                "name": b["name"],
-                                "arguments": json.dumps(b["input"]),
-                            },
-                        }
-                        for b in blocks
-                        if b["type"] == "tool_use"
-                    ]
-                    openai_msg: dict = {"role": "assistant", "content": " ".join(text_parts) or None}
-                    if tool_calls:
-                        openai_msg["tool_calls"] = tool_calls
-                    translated.append(openai_msg)
-                    continue
-            translated.append(msg)
-
-        # OpenAI tools format wraps schema in {"type": "function", "function": {...}}
-        openai_tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": t["name"],
-                    "description": t["description"],
-                    "parameters": t["parameters"],
-                },
-            }
-            for t in tools
-        ]
+        translated: list[dict] = [{"role": "system", "content": system}]
+        for msg in messages:
+            entry = self._translated.get(id(msg))
+            if entry is None or entry[0] is not msg:
+                entry = (msg, translate_message(msg))
+            cache[id(msg)] = entry
+            translated.extend(entry[1])
+        # Only keep messages still in the history (compaction drops the rest)
+        self._translated = cache
+        return translated, self._openai_tools
 
-        response = self._client.chat.completions.create(
-            model=self._model,
-            max_tokens=self._max_tokens,
-            messages=translated,  # type: ignore[arg-type]
-            tools=openai_tools,  # type: ignore[arg-type]
-        )
+    def chat(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        system: str,
+        on_text: Callable[[str], None] | None = None,
+    ) -> LLMResponse:
+        start = time.perf_counter()
+        translated, openai_tools = self._translate(messages, tools, system)
+        self.translation_time_s += time.perf_counter() - start
 
-        choice = response.choices[0]
-        msg = choice.message
+        if self._stream:
+            text, tool_calls, prompt_tokens, completion_tokens = self._chat_stream(translated, openai_tools, on_text)
+        else:
+            text, tool_calls, prompt_tokens, completion_tokens = self._chat_once(translated, openai_tools)
+            if text and on_text:
+                on_text(text)
 
         # Normalize to the same content block format used by AnthropicClient
         content: list[dict] = []
-        if msg.content:
-            content.append({"type": "text", "text": msg.content})
-        if msg.tool_calls:
-            for tc in msg.tool_calls:
-                content.append({
-                    "type": "tool_use",
-                    "id": tc.id,
-                    "name": tc.function.name,
-                    "input": json.loads(tc.function.arguments),
-                })
-
-        stop_reason = "tool_use" if msg.tool_calls else "end_turn"
+        if text:
+            content.append({"type": "text", "text": text})
+        for tc in tool_calls:
+            content.append({
+                "type": "tool_use",
+                "id": tc["id"],
+                "name": tc["name"],
+                "input": json.loads(tc["arguments"] or "{}"),
+            })
+
+        stop_reason = "tool_use" if tool_calls else "end_turn"
 
-        usage = response.usage
         return LLMResponse(
             stop_reason=stop_reason,
             content=content,
-            input_tokens=usage.prompt_tokens if usage else 0,
-            output_tokens=usage.completion_tokens if usage else 0,
+            input_tokens=prompt_tokens,
+            output_tokens=completion_tokens,
         )
+
+    def _chat_once(self, messages: list[dict], tools: list[dict]) -> tuple[str, list[dict], int, int]:
+        start = time.perf_counter()
+        response = self._client.chat.completions.create(
+            model=self._model,
+            max_tokens=self._max_tokens,
+            messages=messages,  # type: ignore[arg-type]
+            tools=tools,  # type: ignore[arg-type]
+        )
+        self.time_to_first_token_s = time.perf_counter() - start
+
+        msg = response.choices[0].message
+        tool_calls = [
+            {"id": tc.id, "name": tc.function.name, "arguments": tc.function.arguments}
+            for tc in msg.tool_calls or []
+        ]
+        usage = response.usage
+        return (
+            msg.content or "",
+            tool_calls,
+            usage.prompt_tokens if usage else 0,
+            usage.completion_tokens if usage else 0,
+        )
+
+    def _chat_stream(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        on_text: Callable[[str], None] | None,
+    ) -> tuple[str, list[dict], int, int]:
+        start = time.perf_counter()
+        stream = self._client.chat.completions.create(
+            model=self._model,
+            max_tokens=self._max_tokens,
+            messages=messages,  # type: ignore[arg-type]
+            tools=tools,  # type: ignore[arg-type]
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        self.time_to_first_token_s = None
+        text_parts: list[str] = []
+        # Tool calls arrive in fragments keyed by index; arguments are streamed as partial JSON
+        tool_calls: dict[int, dict] = {}
+        prompt_tokens = completion_tokens = 0
+        for chunk in stream:
+            if chunk.usage:
+                prompt_tokens = chunk.usage.prompt_tokens
+                completion_tokens = chunk.usage.completion_tokens
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if self.time_to_first_token_s is None and (delta.content or delta.tool_calls):
+                self.time_to_first_token_s = time.perf_counter() - start
+            if delta.content:
+                text_parts.append(delta.content)
+                if on_text:
+                    on_text(delta.content)
+            for tc in delta.tool_calls or []:
+                call = tool_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function and tc.function.name:
+                    call["name"] += tc.function.name
+                if tc.function and tc.function.arguments:
+                    call["arguments"] += tc.function.arguments
+
+        return "".join(text_parts), [tool_calls[i] for i in sorted(tool_calls)], prompt_tokens, completion_tokens
@@ -1,5 +1,6 @@
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Working directory for all tool calls. Set by the agent at startup.
@@ -126,8 +127,26 @@ TOOLS: list[dict] = [
             "required": ["command"],
         },
     },
+    {
+        "name": "read_output",
+        "description": "Read part of a tool output that was truncated in the conversation, using the handle given in the truncation notice.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Handle from the truncation notice, e.g. out-1"},
+                "offset": {"type": "integer", "description": "Character offset to start from (default: 0)"},
+                "limit": {"type": "integer", "description": "Number of characters to return (default: 4000)"},
+            },
+            "required": ["handle"],
+        },
+    },
 ]
 
+# Tools that don't change the filesystem. Consecutive calls to these run concurrently;
+# everything else (write_file, run_bash, unknown tools) runs alone, in order.
+READ_ONLY_TOOLS = {"read_file", "list_directory", "read_output"}
+
+# read_output is served by the agent's ContextManager, which keeps the truncated outputs
 TOOL_FUNCTIONS: dict[str, object] = {
     "read_file": read_file,
     "write_file": write_file,
@@ -136,12 +155,42 @@ TOOL_FUNCTIONS: dict[str, object] = {
 }
 
 
-def execute_tool(name: str, inputs: dict) -> str:
+def execute_tool(name: str, inputs: dict, extra_tools: dict[str, object] | None = None) -> str:
     """Dispatch a tool call by name and return the string result."""
-    fn = TOOL_FUNCTIONS.get(name)
+    fn = (extra_tools or {}).get(name) or TOOL_FUNCTIONS.get(name)
     if fn is None:
         return f"[error] Unknown tool: {name}"
     try:
         return fn(**inputs)  # type: ignore[operator]
     except Exception as e:
         return f"[error] {type(e).__name__}: {e}"
+
+
+def execute_tool_calls(
+    calls: list[dict],
+    max_workers: int = 4,
+    extra_tools: dict[str, object] | None = None,
+) -> list[str]:
+    """
+    Run a turn's tool calls and return their results in call order.
+
+    Runs of consecutive read-only calls execute concurrently (up to
+    `max_workers` at a time); a mutating call waits for the reads before it
+    and finishes before anything after it starts, so every call sees the
+    effects of the calls the model issued before it. `extra_tools` adds
+    tools bound to the caller's state, such as read_output.
+    """
+    results: list[str] = []
+    i = 0
+    while i < len(calls):
+        j = i
+        while j < len(calls) and calls[j]["name"] in READ_ONLY_TOOLS:
+            j += 1
+        if j - i > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, j - i)) as pool:
+                results.extend(pool.map(lambda c: execute_tool(c["name"], c["input"], extra_tools), calls[i:j]))
+        else:
+            j = max(j, i + 1)
+            results.extend(execute_tool(c["name"], c["input"], extra_tools) for c in calls[i:j])
+        i = j
+    return results
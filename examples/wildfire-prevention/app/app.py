@@ -4,19 +4,27 @@ Run from the project root:
     uv run streamlit run app/app.py
 """
 
-import base64
+import hashlib
+import sqlite3
+import tempfile
+import threading
 import time
 from pathlib import Path
 
 import plotly.graph_objects as go
 import pydeck as pdk
 import streamlit as st
+from PIL import Image
 
-from wildfire_prevention.db import fetch_all, init_db
+from wildfire_prevention.db import db_version, fetch_since, fetch_tile_daily, init_db
 from wildfire_prevention.locations import LOCATIONS, LOCATIONS_BY_ID
 
 DB_PATH = Path(__file__).parent.parent / "wildfire.db"
 DB_IMAGES_DIR = Path(__file__).parent.parent / "db_images"
+# Served by Streamlit at app/static/... (enableStaticServing in .streamlit/config.toml)
+STATIC_DIR = Path(__file__).parent / "static"
+THUMBS_DIR = STATIC_DIR / "thumbs"
+THUMB_SIZE_PX = 256
 
 _RISK_COLOR: dict[str, list[int]] = {
     "low":    [0, 180, 0, 200],
@@ -27,14 +35,84 @@ _RISK_SCORE: dict[str, float] = {"low": 1.0, "medium": 2.0, "high": 3.0}
 _DEFAULT_COLOR = [128, 128, 128, 200]
 
 
-def _to_data_url(path: str | None) -> str | None:
+class RowStore:
+    """Prediction rows loaded so far, shared by every session and extended incrementally.
+
+    Each refresh only reads rows with an id above the last one seen. If the
+    newest created_at in the DB is then still not the newest one loaded, rows
+    were upserted in place and the store is reloaded from scratch.
+    """
+
+    def __init__(self) -> None:
+        self.rows: dict[int, dict[str, object]] = {}
+        self.version: tuple[int, str] = (0, "")
+        self._max_id = 0
+        self._max_created_at = ""
+        self._lock = threading.Lock()
+
+    def _load(self, conn: sqlite3.Connection) -> None:
+        for row in fetch_since(conn, self._max_id):
+            self.rows[int(row["id"])] = row  # type: ignore[arg-type]
+            self._max_id = max(self._max_id, int(row["id"]))  # type: ignore[arg-type]
+            self._max_created_at = max(self._max_created_at, str(row["created_at"]))
+
+    def refresh(self, conn: sqlite3.Connection) -> tuple[int, str]:
+        with self._lock:
+            version = db_version(conn)
+            if version == self.version:
+                return version
+            self._load(conn)
+            if (self._max_id, self._max_created_at) != version:
+                self.rows.clear()
+                self._max_id, self._max_created_at = 0, ""
+                self._load(conn)
+            self.version = version
+            return version
+
+    def newest_first(self) -> list[dict[str, object]]:
+        with self._lock:
+            rows = list(self.rows.values())
+        return sorted(rows, key=lambda r: str(r.get("created_at", "")), reverse=True)
+
+
+@st.cache_resource
+def _row_store() -> RowStore:
+    return RowStore()
+
+
+def _thumbnail_url(path: str | None) -> str | None:
+    """URL of a small JPEG version of an image, generated on first use and kept on disk."""
     if not path:
         return None
-    p = Path(path)
-    if not p.exists():
+    source = Path(path)
+    try:
+        stat = source.stat()
+    except OSError:
         return None
-    data = base64.standard_b64encode(p.read_bytes()).decode()
-    return f"data:image/png;base64,{data}"
+    # Backfill re-runs overwrite images in place, so the name covers the file's version too
+    key = f"{source.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    name = hashlib.sha1(key.encode()).hexdigest()[:16] + ".jpg"
+    thumb = THUMBS_DIR / name
+    if not thumb.exists():
+        THUMBS_DIR.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as image:
+            image = image.convert("RGB")
+            image.thumbnail((THUMB_SIZE_PX, THUMB_SIZE_PX))
+            # Write to a unique temp file, then rename, so concurrent sessions never
+            # serve a partial file or write into each other's
+            with tempfile.NamedTemporaryFile(dir=THUMBS_DIR, suffix=".tmp", delete=False) as tmp:
+                image.save(tmp, format="JPEG", quality=80)
+            Path(tmp.name).replace(thumb)
+    return f"app/static/thumbs/{name}"
+
+
+def _latest_per_tile(rows: list[dict[str, object]]) -> list[dict[str, object]]:
+    """Keep the newest prediction of each tile; older ones would be drawn underneath it."""
+    latest: dict[tuple[float, float, float], dict[str, object]] = {}
+    for r in rows:  # newest first
+        key = (float(r["lon"]), float(r["lat"]), float(r.get("size_km") or 5.0))  # type: ignore[arg-type]
+        latest.setdefault(key, r)
+    return list(latest.values())
 
 
 def _tile_bounds(lon: float, lat: float, size_km: float) -> list[list[float]]:
@@ -47,6 +125,15 @@ def _location_view_state(location_id: str) -> pdk.ViewState:
     return pdk.ViewState(longitude=loc.lon, latitude=loc.lat, zoom=10, pitch=0)
 
 
+def _default_view_state(row: dict[str, object]) -> pdk.ViewState:
+    return pdk.ViewState(
+        longitude=float(row["lon"]),  # type: ignore[arg-type]
+        latitude=float(row["lat"]),  # type: ignore[arg-type]
+        zoom=4,
+        pitch=0,
+    )
+
+
 def _filter_rows(
     rows: list[dict[str, object]],
     risk_filter: list[str],
@@ -62,8 +149,9 @@ def _filter_rows(
             continue
         if model_filter and r.get("model") not in model_filter:
             continue
-        created = str(r.get("created_at", ""))[:10]
-        if created < start or created > end:
+        # Same day as the tile_daily_risk rollup behind the charts: the prediction's timestamp
+        day = str(r.get("timestamp", ""))[:10]
+        if day < start or day > end:
             continue
         if region_filter and r.get("region_id") != region_filter:
             continue
@@ -71,30 +159,79 @@ def _filter_rows(
     return out
 
 
-def _time_series_charts(rows: list[dict[str, object]]) -> None:
-    """Render per-tile lines and region-average chart for the given rows."""
-    # Group by tile key (rounded coordinates) and timestamp date.
-    tile_series: dict[str, dict[str, list[float]]] = {}
-    for r in rows:
+@st.cache_data(show_spinner=False)
+def _filter_options(version: tuple[int, str]) -> tuple[list[str], str | None, str | None]:
+    """(models, first day, last day) across all rows; recomputed only when the DB changes.
+
+    Days are prediction timestamps, not created_at: a backfill writes past
+    timestamps with created_at set to now.
+    """
+    rows = _row_store().newest_first()
+    models = sorted({str(r["model"]) for r in rows if r.get("model")})
+    days = [str(r["timestamp"])[:10] for r in rows if r.get("timestamp")]
+    return models, min(days, default=None), max(days, default=None)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _map_data(
+    version: tuple[int, str],
+    risk_filter: tuple[str, ...],
+    model_filter: tuple[str, ...],
+    date_range: tuple[str, ...],
+    region_filter: str | None,
+) -> tuple[list[dict[str, object]], list[dict[str, object]], dict[str, object] | None]:
+    """(bitmap data, scatter data, newest matching row) for the current filters.
+
+    Only the newest prediction per tile is drawn. Keyed by the DB version,
+    so reruns without new predictions are a cache hit.
+    """
+    rows = _filter_rows(
+        _row_store().newest_first(), list(risk_filter), list(model_filter), date_range, region_filter
+    )
+    if not rows:
+        return [], [], None
+
+    detail_row = rows[0]
+    bitmap_data = []
+    scatter_data = []
+    for r in _latest_per_tile(rows):
+        lon = float(r["lon"])  # type: ignore[arg-type]
+        lat = float(r["lat"])  # type: ignore[arg-type]
+        size_km = float(r.get("size_km") or 5.0)  # type: ignore[arg-type]
         risk = str(r.get("risk_level") or "")
-        score = _RISK_SCORE.get(risk)
-        if score is None:
-            continue
+        color = _RISK_COLOR.get(risk, _DEFAULT_COLOR)
+
+        thumb_url = _thumbnail_url(str(r.get("rgb_path") or ""))
+        if thumb_url:
+            bitmap_data.append({
+                "image": thumb_url,
+                "bounds": _tile_bounds(lon, lat, size_km),
+                "row_id": r["id"],
+            })
+
+        scatter_data.append({
+            "lon": lon,
+            "lat": lat,
+            "color": color,
+            "risk": risk,
+            "row_id": r["id"],
+            "timestamp": str(r.get("timestamp", "")),
+            "model": str(r.get("model", "")),
+        })
+    return bitmap_data, scatter_data, detail_row
+
+
+def _time_series_charts(daily: list[dict[str, object]]) -> None:
+    """Render per-tile lines and region-average chart from per-tile daily rollups."""
+    # Mean score per tile key (rounded coordinates) and date.
+    tile_means: dict[str, dict[str, float]] = {}
+    for r in daily:
         tile_key = f"{float(r['lon']):.3f},{float(r['lat']):.3f}"  # type: ignore[arg-type]
-        date = str(r.get("timestamp", ""))[:10]
-        if not date:
-            continue
-        tile_series.setdefault(tile_key, {}).setdefault(date, []).append(score)
+        tile_means.setdefault(tile_key, {})[str(r["day"])] = float(r["mean_score"])  # type: ignore[arg-type]
 
-    if not tile_series:
+    if not tile_means:
         return
 
-    # Compute per-tile mean score per date.
-    tile_means: dict[str, dict[str, float]] = {
-        key: {date: sum(scores) / len(scores) for date, scores in by_date.items()}
-        for key, by_date in tile_series.items()
-    }
-
     all_dates = sorted({d for by_date in tile_means.values() for d in by_date})
 
     # Region average and band across all tiles per date.
@@ -186,7 +323,9 @@ def main() -> None:
     st.title("Wildfire Risk Map")
 
     conn = init_db(DB_PATH)
-    all_rows = fetch_all(conn)
+    # Only rows newer than the last refresh are read from the DB
+    version = _row_store().refresh(conn)
+    all_models, first_day, last_day = _filter_options(version)
 
     # --- Sidebar ---
     with st.sidebar:
@@ -202,16 +341,15 @@ def main() -> None:
         risk_opts = ["low", "medium", "high"]
         risk_filter = st.multiselect("Risk level", risk_opts, default=risk_opts)
 
-        all_models = sorted({str(r["model"]) for r in all_rows if r.get("model")})
         model_filter = st.multiselect("Model", all_models, default=all_models)
 
         from datetime import date
-        dates = sorted(str(r["created_at"])[:10] for r in all_rows if r.get("created_at"))
-        min_date = date.fromisoformat(dates[0]) if dates else date(2020, 1, 1)
-        max_date = date.fromisoformat(dates[-1]) if dates else date.today()
+        min_date = date.fromisoformat(first_day) if first_day else date(2020, 1, 1)
+        max_date = date.fromisoformat(last_day) if last_day else date.today()
         date_range = st.date_input(
             "Date range",
             value=(min_date, max_date),
+            help="Date the satellite image was taken",
         )
 
         st.divider()
@@ -224,9 +362,15 @@ def main() -> None:
             st.rerun()
 
     # --- Main: map ---
-    rows = _filter_rows(all_rows, risk_filter, model_filter, date_range, region_filter)
+    bitmap_data, scatter_data, detail_row = _map_data(
+        version,
+        tuple(risk_filter),
+        tuple(model_filter),
+        tuple(str(d) for d in date_range),
+        region_filter,
+    )
 
-    if not rows:
+    if detail_row is None:
         st.info(
             "No predictions in the DB yet. "
             "Start `predict.py` to begin collecting live predictions, "
@@ -237,34 +381,6 @@ def main() -> None:
             st.rerun()
         return
 
-    bitmap_data = []
-    scatter_data = []
-
-    for r in rows:
-        lon = float(r["lon"])  # type: ignore[arg-type]
-        lat = float(r["lat"])  # type: ignore[arg-type]
-        size_km = float(r.get("size_km") or 5.0)  # type: ignore[arg-type]
-        risk = str(r.get("risk_level") or "")
-        color = _RISK_COLOR.get(risk, _DEFAULT_COLOR)
-
-        data_url = _to_data_url(str(r.get("rgb_path") or ""))
-        if data_url:
-            bitmap_data.append({
-                "image": data_url,
-                "bounds": _tile_bounds(lon, lat, size_km),
-                "row_id": r["id"],
-            })
-
-        scatter_data.append({
-            "lon": lon,
-            "lat": lat,
-            "color": color,
-            "risk": risk,
-            "row_id": r["id"],
-            "timestamp": str(r.get("timestamp", "")),
-            "model": str(r.get("model", "")),
-        })
-
     bitmap_layer = pdk.Layer(
         "BitmapLayer",
         data=bitmap_data,
@@ -285,12 +401,7 @@ def main() -> None:
     if region_filter:
         view_state = _location_view_state(region_filter)
     else:
-        view_state = pdk.ViewState(
-            longitude=float(scatter_data[0]["lon"]),
-            latitude=float(scatter_data[0]["lat"]),
-            zoom=4,
-            pitch=0,
-        )
+        view_state = _default_view_state(detail_row)
 
     deck = pdk.Deck(
         layers=[bitmap_layer, scatter_layer],
@@ -303,23 +414,32 @@ def main() -> None:
 
     # --- Time-series charts (shown when a region is selected) ---
     if region_filter:
-        _time_series_charts(rows)
+        start_day = str(date_range[0])
+        end_day = str(date_range[1]) if len(date_range) > 1 else start_day
+        _time_series_charts(
+            fetch_tile_daily(
+                conn,
+                region_id=region_filter,
+                models=model_filter,
+                start_day=start_day,
+                end_day=end_day,
+                risk_levels=risk_filter or None,
+            )
+        )
 
     # --- Detail panel: show most recent row by default ---
     st.subheader("Tile detail")
-    detail_row = rows[0]
-
     col1, col2 = st.columns(2)
     with col1:
-        rgb_url = _to_data_url(str(detail_row.get("rgb_path") or ""))
-        if rgb_url:
-            st.image(rgb_url, caption="RGB", use_container_width=True)
+        rgb_path = Path(str(detail_row.get("rgb_path") or ""))
+        if rgb_path.is_file():
+            st.image(str(rgb_path), caption="RGB", use_container_width=True)
         else:
             st.write("No RGB image.")
     with col2:
-        swir_url = _to_data_url(str(detail_row.get("swir_path") or ""))
-        if swir_url:
-            st.image(swir_url, caption="SWIR", use_container_width=True)
+        swir_path = Path(str(detail_row.get("swir_path") or ""))
+        if swir_path.is_file():
+            st.image(str(swir_path), caption="SWIR", use_container_width=True)
         else:
             st.write("No SWIR image.")
 
@@ -32,7 +32,7 @@ EVAL_FIELDS = [
 
 @st.cache_data
 def load_eval_run(run_id: str) -> tuple[dict[str, object], list[dict[str, object]]] | None:
-    """Return (meta, results) for a run, or None if no results.json exists."""
+    """Return (meta, results) for a finished run, or None if it has no results.json yet."""
     run_dir = EVALS_DIR / run_id
     results_path = run_dir / "results.json"
     meta_path = run_dir / "meta.json"
@@ -44,6 +44,9 @@ def load_eval_run(run_id: str) -> tuple[dict[str, object], list[dict[str, object
         if meta_path.exists()
         else {"eval_run_id": run_id, "model": "unknown", "dataset": "unknown"}
     )
+    # Only checkpoints of unfinished runs should be marked incomplete; never compare them
+    if meta.get("complete") is False:
+        return None
     return meta, results
 
 
@@ -361,7 +364,7 @@ def main() -> None:
         st.error(f"No eval runs found in {EVALS_DIR}. Run evaluate.py first.")
         return
 
-    # Separate runs with results.json from report-only runs
+    # Separate finished runs with results.json from report-only and unfinished runs
     runs_with_results = []
     runs_report_only = []
     loaded: dict[str, tuple[dict[str, object], list[dict[str, object]]]] = {}
@@ -387,9 +390,10 @@ def main() -> None:
             selected_run_ids = [options[lbl] for lbl in selected_labels]
 
         if runs_report_only:
-            with st.expander(f"Report-only runs ({len(runs_report_only)}, no results.json)"):
+            with st.expander(f"Runs without final results ({len(runs_report_only)})"):
                 for rid in runs_report_only:
-                    st.write(rid)
+                    unfinished = (EVALS_DIR / rid / "results.partial.jsonl").exists()
+                    st.write(f"{rid} (unfinished, resume with --resume {rid})" if unfinished else rid)
 
     if not runs_with_results:
         return
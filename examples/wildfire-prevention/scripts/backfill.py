@@ -25,7 +25,7 @@ from pathlib import Path
 
 import requests
 
-from wildfire_prevention.db import init_db, insert_prediction
+from wildfire_prevention.db import PredictionWriter, init_db, prediction_key
 from wildfire_prevention.evaluator import (
     PredictFn,
     anthropic_backend,
@@ -36,14 +36,14 @@ from wildfire_prevention.evaluator import (
     wait_for_server,
 )
 from wildfire_prevention.locations import LOCATIONS, LOCATIONS_BY_ID, Location
-from wildfire_prevention.simsat import fetch_rgb, fetch_swir
+from wildfire_prevention.simsat import fetch_rgb_swir
 
 DB_PATH = Path(__file__).parent.parent / "wildfire.db"
 DB_IMAGES_DIR = Path(__file__).parent.parent / "db_images"
 
 
-def _save_images(row_id: int, rgb_bytes: bytes, swir_bytes: bytes) -> tuple[str, str]:
-    tile_dir = DB_IMAGES_DIR / str(row_id)
+def _save_images(key: str, rgb_bytes: bytes, swir_bytes: bytes) -> tuple[str, str]:
+    tile_dir = DB_IMAGES_DIR / key
     tile_dir.mkdir(parents=True, exist_ok=True)
     rgb_path = tile_dir / "rgb.png"
     swir_path = tile_dir / "swir.png"
@@ -103,31 +103,27 @@ def run_backfill(args: argparse.Namespace, predict: PredictFn, mname: str) -> No
 
     def _process(loc: Location, timestamp: str) -> str:
         try:
-            with ThreadPoolExecutor(max_workers=2) as pool:
-                rgb_f = pool.submit(fetch_rgb, loc.lon, loc.lat, timestamp, args.size_km)
-                swir_f = pool.submit(fetch_swir, loc.lon, loc.lat, timestamp, args.size_km)
-                rgb_bytes = rgb_f.result()
-                swir_bytes = swir_f.result()
+            rgb_bytes, swir_bytes = fetch_rgb_swir(loc.lon, loc.lat, timestamp, args.size_km)
         except requests.HTTPError as exc:
             return f"SKIP ({exc.response.status_code})"
 
         prediction = predict(rgb_bytes, swir_bytes)
-        row_id = insert_prediction(
-            conn, loc.lon, loc.lat, timestamp, args.size_km,
+        rgb_path, swir_path = _save_images(
+            prediction_key(loc.lon, loc.lat, timestamp, args.size_km, mname), rgb_bytes, swir_bytes
+        )
+        writer.add(
+            loc.lon, loc.lat, timestamp, args.size_km,
             source="backfill",
-            rgb_path=None, swir_path=None,
+            rgb_path=rgb_path, swir_path=swir_path,
             prediction=prediction, model=mname,
             region_id=loc.id,
         )
-        rgb_path, swir_path = _save_images(row_id, rgb_bytes, swir_bytes)
-        conn.execute(
-            "UPDATE predictions SET rgb_path=?, swir_path=? WHERE id=?",
-            (rgb_path, swir_path, row_id),
-        )
-        conn.commit()
         return f"risk={prediction.get('risk_level', '?')}"
 
-    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+    # Rows are committed in batches; the writer flushes the rest on exit
+    with PredictionWriter(conn, batch_size=args.batch_size) as writer, ThreadPoolExecutor(
+        max_workers=args.concurrency
+    ) as pool:
         futures = {
             pool.submit(_process, loc, ts): (loc.id, ts[:10])
             for loc, ts in tasks
@@ -194,6 +190,12 @@ def main() -> None:
         default=7,
         help="Number of past days to cover per location (default: 7).",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=20,
+        help="Predictions committed to the DB per transaction (default: 20).",
+    )
     parser.add_argument(
         "--concurrency",
         type=int,
@@ -0,0 +1,105 @@
+"""Benchmark TileIndex lookups against the linear tile scan.
+
+Builds the tile grids of every region in REGIONS, then looks up random points
+around them and a simulated ground track crossing them, with both the linear
+scan (find_tile_scan) and the spatial index (TileIndex). Both must agree.
+
+Usage:
+    uv run scripts/benchmark_tile_index.py
+    uv run scripts/benchmark_tile_index.py --size-km 1 --points 20000
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+from wildfire_prevention.regions import REGIONS, TileIndex, find_tile_scan
+
+T = TypeVar("T")
+
+
+def _random_points(n: int, rng: random.Random) -> list[tuple[float, float]]:
+    """Points spread over the regions' bounding boxes, with a margin around each."""
+    regions = list(REGIONS.values())
+    points: list[tuple[float, float]] = []
+    for _ in range(n):
+        r = rng.choice(regions)
+        lon = rng.uniform(r.lon_min - 0.2, r.lon_max + 0.2)
+        lat = rng.uniform(r.lat_min - 0.2, r.lat_max + 0.2)
+        points.append((lon, lat))
+    return points
+
+
+def _ground_track(n: int) -> list[tuple[float, float]]:
+    """Straight pass from south-west Spain to Catalonia, through every region."""
+    lon0, lat0, lon1, lat1 = -7.0, 36.5, 3.0, 42.0
+    return [
+        (lon0 + (lon1 - lon0) * i / (n - 1), lat0 + (lat1 - lat0) * i / (n - 1))
+        for i in range(n)
+    ]
+
+
+def _scan(
+    points: list[tuple[float, float]], tiles: list[tuple[float, float]], size_km: float
+) -> list[tuple[float, float] | None]:
+    return [find_tile_scan(lon, lat, tiles, size_km) for lon, lat in points]
+
+
+def _time(
+    label: str, fn: Callable[..., T], points: list[tuple[float, float]], *args: object
+) -> tuple[float, T]:
+    """Run fn(points, *args) once and print its lookup rate."""
+    start = time.perf_counter()
+    result = fn(points, *args)
+    elapsed = time.perf_counter() - start
+    rate = len(points) / elapsed
+    print(f"  {label:<22} {elapsed * 1000:9.1f} ms  {rate:12,.0f} lookups/s")
+    return elapsed, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark TileIndex against the linear tile scan."
+    )
+    parser.add_argument(
+        "--size-km",
+        type=float,
+        default=2.0,
+        metavar="KM",
+        help="Tile edge length in km (default: 2.0).",
+    )
+    parser.add_argument(
+        "--points",
+        type=int,
+        default=5000,
+        help="Number of lookups per scenario (default: 5000).",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = TileIndex.for_regions(REGIONS, args.size_km)
+    build_ms = (time.perf_counter() - start) * 1000
+    # Scan the index's own tile list: overlapping tiles resolve to the first one
+    tiles = index.tiles
+    print(
+        f"{len(tiles)} tiles over {len(REGIONS)} regions at {args.size_km} km"
+        f"  |  index built in {build_ms:.1f} ms"
+    )
+
+    for name, points in [
+        ("random points", _random_points(args.points, random.Random(args.seed))),
+        ("ground track", _ground_track(args.points)),
+    ]:
+        print(f"{name} ({len(points)} lookups):")
+        t_scan, scan = _time("linear scan", _scan, points, tiles, args.size_km)
+        t_index, indexed = _time("TileIndex.find_many", index.find_many, points)
+        assert scan == indexed, "TileIndex disagrees with the linear scan"
+        hits = sum(hit is not None for hit in indexed)
+        print(f"  {hits} hits  |  speedup {t_scan / t_index:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
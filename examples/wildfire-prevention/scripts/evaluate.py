@@ -2,19 +2,32 @@
 
 --split is required: use 'test' to evaluate model quality, 'train' to check Opus self-consistency.
 
+Samples are streamed from disk and evaluated by an asyncio harness that keeps
+--concurrency requests in flight, spread over one or more llama-servers for the
+local backend. Each finished sample is appended to results.partial.jsonl, so
+an interrupted run can be finished with --resume <eval_run_id> (with the same
+dataset, backend, model and split). results.json is only written once every
+sample is done.
+
 Usage:
     uv run scripts/evaluate.py --hf-dataset Paulescu/wildfire-prevention --backend anthropic --split test
     uv run scripts/evaluate.py --hf-dataset Paulescu/wildfire-prevention --backend anthropic --split train
     uv run scripts/evaluate.py --hf-dataset Paulescu/wildfire-prevention --backend local --model LiquidAI/LFM2.5-VL-450M-GGUF --quant Q8_0 --split test
+    uv run scripts/evaluate.py --hf-dataset Paulescu/wildfire-prevention --backend local --model LiquidAI/LFM2.5-VL-450M-GGUF --quant Q8_0 --split test --num-servers 2 --concurrency 8
     uv run scripts/evaluate.py --dataset data/20260421_150039 --backend anthropic --split test
+    uv run scripts/evaluate.py --dataset data/20260421_150039 --backend anthropic --split test --resume 20260421_160512
 """
 
 import argparse
+import asyncio
 import json
 import shutil
+import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from collections.abc import Iterator
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import TypeAlias
 
@@ -23,16 +36,20 @@ from huggingface_hub import snapshot_download
 from wildfire_prevention.evaluator import (
     EVAL_FIELDS,
     EvalSummary,
+    PartialResultsWriter,
     SampleResult,
     anthropic_backend,
-    evaluate_sample,
-    llama_backend,
+    async_from_sync,
+    async_llama_backend,
+    evaluate_batch,
+    load_results,
     model_name,
     render_report,
+    run_eval_async,
     save_results,
     start_llama_server,
     stop_server,
-    transformers_backend,
+    transformers_batch_backend,
     wait_for_server,
 )
 
@@ -41,15 +58,20 @@ EVALS_DIR = Path(__file__).parent.parent / "evals"
 # (sample_id, rgb_bytes, swir_bytes, ground_truth)
 SampleData: TypeAlias = tuple[str, bytes, bytes, dict[str, object]]
 
+# (sample_id, rgb_path, swir_path, annotation) where annotation is the path
+# to annotation.json or the annotation JSON string itself. Cheap to list;
+# images are only read when the sample is evaluated.
+SampleRef: TypeAlias = tuple[str, Path, Path, Path | str]
+
 
-def load_local_samples(dataset_dir: Path, split: str) -> list[SampleData]:
-    """Load samples from a local run directory (train|test/{loc}/{tile}/ layout)."""
+def list_local_samples(dataset_dir: Path, split: str) -> list[SampleRef]:
+    """List samples of a local run directory (train|test/{loc}/{tile}/ layout)."""
     split_dir = dataset_dir / split
     if not split_dir.is_dir():
         print(f"Split '{split}' not found in {dataset_dir}")
         sys.exit(1)
 
-    samples: list[SampleData] = []
+    refs: list[SampleRef] = []
     for loc_dir in sorted(split_dir.iterdir()):
         if not loc_dir.is_dir():
             continue
@@ -63,39 +85,68 @@ def load_local_samples(dataset_dir: Path, split: str) -> list[SampleData]:
             if not (rgb_path.exists() and swir_path.exists() and annotation_path.exists()):
                 print(f"[{sample_id}] SKIP: missing files")
                 continue
-            ground_truth: dict[str, object] = json.loads(
-                annotation_path.read_text(encoding="utf-8")
-            )
-            samples.append((
-                sample_id,
-                rgb_path.read_bytes(),
-                swir_path.read_bytes(),
-                ground_truth,
-            ))
-    return samples
+            refs.append((sample_id, rgb_path, swir_path, annotation_path))
+    return refs
 
 
-def load_hf_samples(snapshot_dir: Path, split: str) -> list[SampleData]:
-    """Load samples from a HF snapshot (parquet + flat images/ layout)."""
+def list_hf_samples(snapshot_dir: Path, split: str) -> list[SampleRef]:
+    """List samples of a HF snapshot (parquet + flat images/ layout)."""
     from datasets import load_dataset
 
     ds = load_dataset(str(snapshot_dir), split=split)
-    samples: list[SampleData] = []
-    for row in ds:
+    refs: list[SampleRef] = []
+    for row in ds.select_columns(["region", "rgb_path", "swir_path", "output"]):
         region    = str(row["region"])
         rgb_path  = snapshot_dir / str(row["rgb_path"])
         swir_path = snapshot_dir / str(row["swir_path"])
         # derive tile key from filename: e.g. attica_greece_s00_t00_rgb.png → s00_t00
         tile_key  = Path(str(row["rgb_path"])).stem.removesuffix("_rgb")[len(region) + 1:]
         sample_id = f"{region}/{tile_key}"
-        ground_truth: dict[str, object] = json.loads(str(row["output"]))
-        samples.append((
-            sample_id,
-            rgb_path.read_bytes(),
-            swir_path.read_bytes(),
-            ground_truth,
-        ))
-    return samples
+        refs.append((sample_id, rgb_path, swir_path, str(row["output"])))
+    return refs
+
+
+def read_sample(ref: SampleRef) -> SampleData:
+    sample_id, rgb_path, swir_path, annotation = ref
+    raw = annotation.read_text(encoding="utf-8") if isinstance(annotation, Path) else annotation
+    ground_truth: dict[str, object] = json.loads(raw)
+    return sample_id, rgb_path.read_bytes(), swir_path.read_bytes(), ground_truth
+
+
+def stream_samples(refs: list[SampleRef]) -> Iterator[SampleData]:
+    return (read_sample(ref) for ref in refs)
+
+
+def _start_servers(
+    args: argparse.Namespace,
+) -> tuple[list[str], list[subprocess.Popen[bytes]]]:
+    """Return the llama-server base URLs to use and the processes started for them."""
+    if args.server_url:
+        return list(args.server_url), []
+
+    ports = [args.port + i for i in range(args.num_servers)]
+    processes: list[subprocess.Popen[bytes]] = []
+    for port in ports:
+        print(f"Starting llama-server with model {args.model} on port {port} ...")
+        processes.append(
+            start_llama_server(
+                args.model,
+                quant=args.quant or None,
+                port=port,
+                verbose=args.verbose_server,
+                mmproj=args.mmproj,
+            )
+        )
+    try:
+        for port in ports:
+            wait_for_server(port=port)
+    except TimeoutError as exc:
+        print(str(exc))
+        for process in processes:
+            stop_server(process)
+        sys.exit(1)
+    print(f"llama-server ready ({len(ports)} instance(s)).")
+    return [f"http://127.0.0.1:{port}" for port in ports], processes
 
 
 def main() -> None:
@@ -134,11 +185,35 @@ def main() -> None:
         default=8080,
         help="llama-server port (default: 8080, local backend only).",
     )
+    parser.add_argument(
+        "--num-servers",
+        type=int,
+        default=1,
+        help="llama-server instances to start on consecutive ports from --port (default: 1, local backend only).",
+    )
+    parser.add_argument(
+        "--server-url",
+        action="append",
+        metavar="URL",
+        help="Use an already running llama-server instead of starting one, e.g. http://127.0.0.1:8080. Repeat for several servers.",
+    )
     parser.add_argument(
         "--concurrency",
         type=int,
         default=None,
-        help="Parallel workers (default: 3 for anthropic, 1 for local).",
+        help="Requests kept in flight (default: 3 for anthropic, one per server for local).",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="EVAL_RUN_ID",
+        default=None,
+        help="Finish an interrupted run with the same dataset, backend, model and split: samples already checkpointed in evals/<EVAL_RUN_ID>/ are skipped, except those that failed with a backend error.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="Maximum samples per generate call (default: 8, hf backend only).",
     )
     parser.add_argument(
         "--split",
@@ -170,7 +245,7 @@ def main() -> None:
         print("--model is required when using --backend local or hf")
         sys.exit(1)
 
-    if args.backend == "local" and not shutil.which("llama-server"):
+    if args.backend == "local" and not args.server_url and not shutil.which("llama-server"):
         print("llama-server not found on PATH. Install llama.cpp and ensure llama-server is available.")
         sys.exit(1)
 
@@ -178,94 +253,147 @@ def main() -> None:
         print(f"Downloading dataset from Hugging Face: {args.hf_dataset} ...")
         snapshot_dir = Path(snapshot_download(repo_id=args.hf_dataset, repo_type="dataset"))
         print(f"Snapshot at {snapshot_dir}")
-        samples = load_hf_samples(snapshot_dir, args.split)
+        refs = list_hf_samples(snapshot_dir, args.split)
         dataset_label = args.hf_dataset
     else:
         local_dir = Path(args.dataset)
         if not local_dir.is_dir():
             print(f"Dataset not found: {local_dir}")
             sys.exit(1)
-        samples = load_local_samples(local_dir, args.split)
+        refs = list_local_samples(local_dir, args.split)
         dataset_label = args.dataset
 
-    if not samples:
+    if not refs:
         print(f"No samples found for split '{args.split}'.")
         sys.exit(1)
 
-    concurrency = args.concurrency or (1 if args.backend == "local" else 3)
-    eval_run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    mname = model_name(args.backend, args.model, args.quant)
+    eval_run_id = args.resume or datetime.now().strftime("%Y%m%d_%H%M%S")
+    eval_dir = EVALS_DIR / eval_run_id
+    previous: list[SampleResult] = []
+    previous_wall_time_s = 0.0
+    if args.resume:
+        if not eval_dir.is_dir():
+            print(f"Nothing to resume: evals/{eval_run_id} does not exist.")
+            sys.exit(1)
+        meta_path = eval_dir / "meta.json"
+        if meta_path.exists():
+            previous_meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            # Merging results from a different configuration would silently mix two evals
+            expected = {
+                "dataset": f"{dataset_label}/{args.split}",
+                "backend": args.backend,
+                "model": mname,
+                "split": args.split,
+            }
+            mismatched = {
+                key: (previous_meta.get(key), value)
+                for key, value in expected.items()
+                if previous_meta.get(key) != value
+            }
+            if mismatched:
+                print(f"Cannot resume evals/{eval_run_id}: it was run with different arguments.")
+                for key, (was, now) in mismatched.items():
+                    print(f"  {key}: {was!r} (now {now!r})")
+                sys.exit(1)
+            previous_wall_time_s = float(previous_meta.get("wall_time_s", 0.0))
+        previous = load_results(eval_dir)
+        # Samples the backend failed on (server down, timeout) never reached the model
+        failed = [r for r in previous if r.error is not None]
+        if failed:
+            print(f"Re-running {len(failed)} samples that failed with a backend error.")
+            previous = [r for r in previous if r.error is None]
+    done = {r.id for r in previous}
+    todo = [ref for ref in refs if ref[0] not in done]
+    eval_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.backend == "local":
+        base_urls, server_processes = _start_servers(args)
+    else:
+        base_urls, server_processes = [], []
+    concurrency = args.concurrency or (3 if args.backend == "anthropic" else max(1, len(base_urls)))
+
     print(
         f"Eval: {eval_run_id}  |  dataset: {dataset_label}  |  split: {args.split}"
-        f"  |  samples: {len(samples)}  |  backend: {args.backend}"
+        f"  |  samples: {len(refs)} ({len(done)} done, {len(todo)} to go)  |  backend: {args.backend}"
         f"  |  concurrency: {concurrency}"
     )
 
-    # Start llama-server if needed.
-    server_process = None
-    if args.backend == "local":
-        print(f"Starting llama-server with model {args.model} on port {args.port} ...")
-        server_process = start_llama_server(
-            args.model,
-            quant=args.quant or None,
-            port=args.port,
-            verbose=args.verbose_server,
-            mmproj=args.mmproj,
+    results: list[SampleResult] = list(previous)
+    sample_order = {ref[0]: i for i, ref in enumerate(refs)}
+    started = time.perf_counter()
+
+    def _save(complete: bool) -> EvalSummary:
+        ordered = sorted(results, key=lambda r: sample_order.get(r.id, len(sample_order)))
+        summary = EvalSummary(
+            results=ordered,
+            wall_time_s=previous_wall_time_s + time.perf_counter() - started,
         )
-        try:
-            wait_for_server(port=args.port)
-        except TimeoutError as exc:
-            print(str(exc))
-            stop_server(server_process)
-            sys.exit(1)
-        print("llama-server ready.")
-
-    if args.backend == "anthropic":
-        predict = anthropic_backend()
-    elif args.backend == "hf":
-        print(f"Loading HuggingFace checkpoint from {args.model} ...")
-        predict = transformers_backend(args.model)
-        print("Model loaded.")
-    else:
-        predict = llama_backend(args.model, args.port)
+        save_results(
+            eval_dir,
+            summary,
+            dataset=f"{dataset_label}/{args.split}",
+            backend=args.backend,
+            model=mname,
+            split=args.split,
+            eval_run_id=eval_run_id,
+            extra_meta={
+                "max_in_flight": concurrency,
+                "servers": base_urls,
+            },
+            complete=complete,
+        )
+        return summary
+
+    def _on_result(result: SampleResult) -> None:
+        results.append(result)
+        fm = result.field_matches
+        status = " ".join(
+            f"{f[:4]}={'✓' if fm.get(f) else '✗'}" for f in EVAL_FIELDS
+        )
+        if result.error is not None:
+            status = f"error: {result.error}"
+        print(f"[{result.id}] {result.latency_s:5.2f}s  {status}", flush=True)
+        checkpoint.write(result)
 
-    results: list[SampleResult] = []
-    sample_order = {sid: i for i, (sid, *_) in enumerate(samples)}
+    # Record the run's arguments up front, so even a killed run can be resumed
+    _save(complete=False)
+    checkpoint = PartialResultsWriter(eval_dir)
+    finished = False
     try:
-        with ThreadPoolExecutor(max_workers=concurrency) as pool:
-            futures = {
-                pool.submit(evaluate_sample, sid, rgb, swir, gt, predict): sid
-                for sid, rgb, swir, gt in samples
-            }
-            for future in as_completed(futures):
-                result = future.result()
-                results.append(result)
-                fm = result.field_matches
-                status = " ".join(
-                    f"{f[:4]}={'✓' if fm.get(f) else '✗'}" for f in EVAL_FIELDS
-                )
-                print(f"[{result.id}] {status}", flush=True)
+        if args.backend == "hf":
+            print(f"Loading HuggingFace checkpoint from {args.model} ...")
+            predict_batch = transformers_batch_backend(args.model, max_batch_size=args.batch_size)
+            print("Model loaded.")
+            started = time.perf_counter()
+            # Hand the backend several batches at a time so it can group them by length
+            samples = stream_samples(todo)
+            while chunk := list(islice(samples, args.batch_size * 4)):
+                for result in evaluate_batch(chunk, predict_batch):
+                    _on_result(result)
+        else:
+            predict = (
+                async_from_sync(anthropic_backend())
+                if args.backend == "anthropic"
+                else async_llama_backend(args.model, base_urls)
+            )
+            asyncio.run(run_eval_async(stream_samples(todo), predict, concurrency, _on_result))
+        finished = True
+    except KeyboardInterrupt:
+        print(f"\nInterrupted after {len(results)}/{len(refs)} samples.")
+        sys.exit(130)
     finally:
-        if server_process is not None:
-            stop_server(server_process)
+        checkpoint.close()
+        for process in server_processes:
+            stop_server(process)
+        if not finished:
+            # Whatever stopped the run, the finished samples are already in results.partial.jsonl
+            _save(complete=False)
+            print(f"Resume with: --resume {eval_run_id}")
 
-    results.sort(key=lambda r: sample_order.get(r.id, 999))
-
-    summary = EvalSummary(results=results)
-    mname = model_name(args.backend, args.model, args.quant)
+    summary = _save(complete=True)
     report = render_report(summary, f"{dataset_label}/{args.split}", args.backend, mname, eval_run_id)
-
-    eval_dir = EVALS_DIR / eval_run_id
-    eval_dir.mkdir(parents=True, exist_ok=True)
     (eval_dir / "report.md").write_text(report, encoding="utf-8")
-    save_results(
-        eval_dir,
-        summary,
-        dataset=f"{dataset_label}/{args.split}",
-        backend=args.backend,
-        model=mname,
-        split=args.split,
-        eval_run_id=eval_run_id,
-    )
 
     print()
     print(report)
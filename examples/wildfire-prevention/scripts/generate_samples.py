@@ -49,7 +49,7 @@ from tqdm import tqdm
 
 from wildfire_prevention.annotator import SYSTEM_PROMPT, USER_TEXT, annotate
 from wildfire_prevention.locations import LOCATIONS, LOCATIONS_BY_ID, Location
-from wildfire_prevention.simsat import fetch_rgb, fetch_swir
+from wildfire_prevention.simsat import fetch_rgb_swir
 from wildfire_prevention.tiles import (
     TileCoord,
     spatial_grid,
@@ -107,15 +107,9 @@ def process_tile(
 
     tqdm.write(f"[{task.label}] fetching images ...")
     try:
-        with ThreadPoolExecutor(max_workers=2) as pool:
-            rgb_future = pool.submit(
-                fetch_rgb, task.spatial.lon, task.spatial.lat, task.timestamp, size_km
-            )
-            swir_future = pool.submit(
-                fetch_swir, task.spatial.lon, task.spatial.lat, task.timestamp, size_km
-            )
-            rgb_bytes = rgb_future.result()
-            swir_bytes = swir_future.result()
+        rgb_bytes, swir_bytes = fetch_rgb_swir(
+            task.spatial.lon, task.spatial.lat, task.timestamp, size_km
+        )
     except requests.HTTPError as exc:
         tqdm.write(f"[{task.label}] SKIP: SimSat returned {exc.response.status_code}")
         return None
@@ -23,7 +23,7 @@ from pathlib import Path
 
 import requests
 
-from wildfire_prevention.db import init_db, insert_prediction
+from wildfire_prevention.db import init_db, insert_prediction, prediction_key
 from wildfire_prevention.evaluator import (
     PredictFn,
     anthropic_backend,
@@ -33,9 +33,9 @@ from wildfire_prevention.evaluator import (
     stop_server,
     wait_for_server,
 )
-from wildfire_prevention.live import _fetch_current_image, get_current_position
+from wildfire_prevention.live import fetch_current_images, get_current_position
 from wildfire_prevention.locations import LOCATIONS, LOCATIONS_BY_ID, Location
-from wildfire_prevention.regions import find_tile
+from wildfire_prevention.regions import TileIndex
 
 DB_PATH = Path(__file__).parent.parent / "wildfire.db"
 DB_IMAGES_DIR = Path(__file__).parent.parent / "db_images"
@@ -54,8 +54,8 @@ def _haversine_km(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
     return R * 2 * math.asin(math.sqrt(a))
 
 
-def _save_images(row_id: int, rgb_bytes: bytes, swir_bytes: bytes) -> tuple[str, str]:
-    tile_dir = DB_IMAGES_DIR / str(row_id)
+def _save_images(key: str, rgb_bytes: bytes, swir_bytes: bytes) -> tuple[str, str]:
+    tile_dir = DB_IMAGES_DIR / key
     tile_dir.mkdir(parents=True, exist_ok=True)
     rgb_path = tile_dir / "rgb.png"
     swir_path = tile_dir / "swir.png"
@@ -105,6 +105,7 @@ def watch_loop(
 
     locations = _build_location_list(args.location)
     tiles = [(loc.lon, loc.lat) for loc in locations]
+    tile_index = TileIndex(tiles, args.size_km)
     loc_by_coords = {(loc.lon, loc.lat): loc for loc in locations}
 
     label = args.location if args.location else f"all ({len(tiles)} locations)"
@@ -131,7 +132,7 @@ def watch_loop(
         # Check whether the satellite is over one of the watched locations.
         # Use the location's fixed coordinates as canonical coords so live and
         # backfill predictions are colocated in the DB.
-        hit = find_tile(sat_lon, sat_lat, tiles, args.size_km)
+        hit = tile_index.find(sat_lon, sat_lat)
         if hit is None:
             print(
                 f"[{timestamp[:19]}] lon={sat_lon:.4f}  lat={sat_lat:.4f}"
@@ -153,8 +154,7 @@ def watch_loop(
         print(f"[{timestamp[:19]}] {loc.id}  lon={lon:.4f}  lat={lat:.4f}  fetching ...", flush=True)
 
         try:
-            rgb_bytes = _fetch_current_image(["red", "green", "blue"], args.size_km)
-            swir_bytes = _fetch_current_image(["swir16", "nir08", "red"], args.size_km)
+            rgb_bytes, swir_bytes = fetch_current_images(args.size_km)
         except requests.HTTPError as exc:
             print(f"  SimSat {exc.response.status_code}: no coverage, skipping", flush=True)
             time.sleep(args.interval)
@@ -170,19 +170,16 @@ def watch_loop(
             continue
 
         prediction = predict(rgb_bytes, swir_bytes)
+        rgb_path, swir_path = _save_images(
+            prediction_key(lon, lat, timestamp, args.size_km, mname), rgb_bytes, swir_bytes
+        )
         row_id = insert_prediction(
             conn, lon, lat, timestamp, args.size_km,
             source="live",
-            rgb_path=None, swir_path=None,
+            rgb_path=rgb_path, swir_path=swir_path,
             prediction=prediction, model=mname,
             region_id=loc.id,
         )
-        rgb_path, swir_path = _save_images(row_id, rgb_bytes, swir_bytes)
-        conn.execute(
-            "UPDATE predictions SET rgb_path=?, swir_path=? WHERE id=?",
-            (rgb_path, swir_path, row_id),
-        )
-        conn.commit()
 
         last_lon, last_lat = lon, lat
         processed += 1
@@ -1,14 +1,131 @@
 """SQLite persistence layer for wildfire predictions."""
 
+import hashlib
 import sqlite3
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+# Natural key of a prediction: re-running a backfill replaces rows instead of duplicating them
+PREDICTION_KEY = ("lon", "lat", "timestamp", "size_km", "model")
+
+_RISK_SCORE_SQL = "CASE {0}.risk_level WHEN 'low' THEN 1 WHEN 'medium' THEN 2 WHEN 'high' THEN 3 END"
+
+
+def _rollup_delta(alias: str, sign: str) -> str:
+    """Add (sign="+") or remove (sign="-") one prediction from tile_daily_risk."""
+    score = _RISK_SCORE_SQL.format(alias)
+    return f"""
+        INSERT INTO tile_daily_risk (
+            lon, lat, day, model, region_id,
+            n_predictions, n_scored, score_sum, n_low, n_medium, n_high
+        ) VALUES (
+            {alias}.lon, {alias}.lat, substr({alias}.timestamp, 1, 10), {alias}.model, {alias}.region_id,
+            {sign}1,
+            {sign}({score} IS NOT NULL),
+            {sign}coalesce({score}, 0),
+            {sign}({alias}.risk_level IS 'low'),
+            {sign}({alias}.risk_level IS 'medium'),
+            {sign}({alias}.risk_level IS 'high')
+        )
+        ON CONFLICT (lon, lat, day, model) DO UPDATE SET
+            region_id     = coalesce(excluded.region_id, region_id),
+            n_predictions = n_predictions + excluded.n_predictions,
+            n_scored      = n_scored + excluded.n_scored,
+            score_sum     = score_sum + excluded.score_sum,
+            n_low         = n_low + excluded.n_low,
+            n_medium      = n_medium + excluded.n_medium,
+            n_high        = n_high + excluded.n_high;
+    """
+
+
+def _create_rollup(conn: sqlite3.Connection) -> None:
+    """Create the per-tile, per-day rollup and the triggers that keep it in sync."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tile_daily_risk'"
+    ).fetchone()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tile_daily_risk (
+            lon           REAL    NOT NULL,
+            lat           REAL    NOT NULL,
+            day           TEXT    NOT NULL,
+            model         TEXT    NOT NULL,
+            region_id     TEXT,
+            n_predictions INTEGER NOT NULL,
+            n_scored      INTEGER NOT NULL,
+            score_sum     REAL    NOT NULL,
+            n_low         INTEGER NOT NULL,
+            n_medium      INTEGER NOT NULL,
+            n_high        INTEGER NOT NULL,
+            PRIMARY KEY (lon, lat, day, model)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rollup_region_day ON tile_daily_risk (region_id, day)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rollup_day ON tile_daily_risk (day)")
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS predictions_rollup_insert AFTER INSERT ON predictions
+        BEGIN {_rollup_delta("new", "+")} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS predictions_rollup_delete AFTER DELETE ON predictions
+        BEGIN {_rollup_delta("old", "-")} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS predictions_rollup_update
+        AFTER UPDATE OF lon, lat, timestamp, model, region_id, risk_level ON predictions
+        BEGIN {_rollup_delta("old", "-")} {_rollup_delta("new", "+")} END
+    """)
+
+    if not exists:
+        # Seed from rows written before the rollup existed
+        score = _RISK_SCORE_SQL.format("p")
+        conn.execute(f"""
+            INSERT INTO tile_daily_risk
+            SELECT lon, lat, substr(timestamp, 1, 10), model, max(region_id),
+                   count(*), count({score}), coalesce(sum({score}), 0),
+                   sum(risk_level IS 'low'), sum(risk_level IS 'medium'), sum(risk_level IS 'high')
+            FROM predictions AS p
+            GROUP BY lon, lat, substr(timestamp, 1, 10), model
+        """)
+
+
+def _create_indexes(conn: sqlite3.Connection) -> None:
+    try:
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_key ON predictions ({', '.join(PREDICTION_KEY)})"
+        )
+    except sqlite3.IntegrityError:
+        # Older databases may hold duplicates from repeated backfills; keep the newest
+        conn.execute(f"""
+            DELETE FROM predictions WHERE id NOT IN (
+                SELECT max(id) FROM predictions GROUP BY {", ".join(PREDICTION_KEY)}
+            )
+        """)
+        conn.execute(
+            f"CREATE UNIQUE INDEX idx_predictions_key ON predictions ({', '.join(PREDICTION_KEY)})"
+        )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_tile_time ON predictions (lon, lat, timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_region_time ON predictions (region_id, timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_risk ON predictions (risk_level, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_created ON predictions (created_at)")
 
 
 def init_db(path: Path) -> sqlite3.Connection:
-    """Open (or create) the SQLite database and ensure the predictions table exists."""
-    conn = sqlite3.connect(str(path))
+    """Open (or create) the SQLite database and ensure the predictions table exists.
+
+    The connection may be shared between threads as long as writes go through
+    a PredictionWriter, which serialises them.
+    """
+    conn = sqlite3.connect(str(path), check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    # WAL lets the Streamlit app read while predict.py / backfill.py write
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
     conn.execute("""
         CREATE TABLE IF NOT EXISTS predictions (
             id          INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -34,10 +151,70 @@ def init_db(path: Path) -> sqlite3.Connection:
     existing_cols = {row[1] for row in conn.execute("PRAGMA table_info(predictions)")}
     if "region_id" not in existing_cols:
         conn.execute("ALTER TABLE predictions ADD COLUMN region_id TEXT")
+    _create_indexes(conn)
+    _create_rollup(conn)
     conn.commit()
     return conn
 
 
+def prediction_key(lon: float, lat: float, timestamp: str, size_km: float, model: str) -> str:
+    """Stable identifier of a prediction, e.g. for naming its image directory."""
+    raw = f"{lon:.5f}|{lat:.5f}|{timestamp}|{float(size_km)}|{model}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+_UPSERT_SQL = f"""
+    INSERT INTO predictions (
+        lon, lat, timestamp, size_km, source,
+        rgb_path, swir_path,
+        risk_level, dry_vegetation_present, urban_interface,
+        steep_terrain, water_body_present, image_quality_limited,
+        model, created_at, region_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT ({", ".join(PREDICTION_KEY)}) DO UPDATE SET
+        source = excluded.source,
+        rgb_path = coalesce(excluded.rgb_path, rgb_path),
+        swir_path = coalesce(excluded.swir_path, swir_path),
+        risk_level = excluded.risk_level,
+        dry_vegetation_present = excluded.dry_vegetation_present,
+        urban_interface = excluded.urban_interface,
+        steep_terrain = excluded.steep_terrain,
+        water_body_present = excluded.water_body_present,
+        image_quality_limited = excluded.image_quality_limited,
+        created_at = excluded.created_at,
+        region_id = coalesce(excluded.region_id, region_id)
+    RETURNING id
+"""
+
+
+def _prediction_params(
+    lon: float,
+    lat: float,
+    timestamp: str,
+    size_km: float,
+    source: str,
+    rgb_path: str | None,
+    swir_path: str | None,
+    prediction: dict[str, object],
+    model: str,
+    region_id: str | None = None,
+) -> tuple[object, ...]:
+    created_at = datetime.now(timezone.utc).isoformat()
+    return (
+        lon, lat, timestamp, size_km, source,
+        rgb_path, swir_path,
+        prediction.get("risk_level"),
+        int(bool(prediction.get("dry_vegetation_present"))),
+        int(bool(prediction.get("urban_interface"))),
+        int(bool(prediction.get("steep_terrain"))),
+        int(bool(prediction.get("water_body_present"))),
+        int(bool(prediction.get("image_quality_limited"))),
+        model,
+        created_at,
+        region_id,
+    )
+
+
 def insert_prediction(
     conn: sqlite3.Connection,
     lon: float,
@@ -51,34 +228,88 @@ def insert_prediction(
     model: str,
     region_id: str | None = None,
 ) -> int:
-    """Insert a prediction row and return the new row id."""
-    created_at = datetime.now(timezone.utc).isoformat()
-    cursor = conn.execute(
-        """
-        INSERT INTO predictions (
-            lon, lat, timestamp, size_km, source,
-            rgb_path, swir_path,
-            risk_level, dry_vegetation_present, urban_interface,
-            steep_terrain, water_body_present, image_quality_limited,
-            model, created_at, region_id
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            lon, lat, timestamp, size_km, source,
-            rgb_path, swir_path,
-            prediction.get("risk_level"),
-            int(bool(prediction.get("dry_vegetation_present"))),
-            int(bool(prediction.get("urban_interface"))),
-            int(bool(prediction.get("steep_terrain"))),
-            int(bool(prediction.get("water_body_present"))),
-            int(bool(prediction.get("image_quality_limited"))),
-            model,
-            created_at,
-            region_id,
+    """Insert (or replace) a prediction row, commit, and return its row id."""
+    rows = conn.execute(
+        _UPSERT_SQL,
+        _prediction_params(
+            lon, lat, timestamp, size_km, source, rgb_path, swir_path, prediction, model, region_id
         ),
-    )
+    ).fetchall()
     conn.commit()
-    return int(cursor.lastrowid)  # type: ignore[arg-type]
+    return int(rows[0][0])
+
+
+class PredictionWriter:
+    """Thread-safe buffered writer that upserts predictions in batched transactions.
+
+    Rows are committed once `batch_size` are pending or `flush_interval_s` has
+    passed since the last commit, and always on `flush()` / leaving the `with`
+    block. Until then they are not visible to readers.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        batch_size: int = 50,
+        flush_interval_s: float = 5.0,
+    ) -> None:
+        self.conn = conn
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_s = flush_interval_s
+        self.rows_written = 0
+        self._pending: list[tuple[object, ...]] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        lon: float,
+        lat: float,
+        timestamp: str,
+        size_km: float,
+        source: str,
+        rgb_path: str | None,
+        swir_path: str | None,
+        prediction: dict[str, object],
+        model: str,
+        region_id: str | None = None,
+    ) -> None:
+        params = _prediction_params(
+            lon, lat, timestamp, size_km, source, rgb_path, swir_path, prediction, model, region_id
+        )
+        with self._lock:
+            self._pending.append(params)
+            if (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval_s
+            ):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        with self.conn:  # one transaction per batch
+            # RETURNING rows must be consumed before the next statement runs
+            for params in self._pending:
+                self.conn.execute(_UPSERT_SQL, params).fetchall()
+        self.rows_written += len(self._pending)
+        self._pending.clear()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.flush()
 
 
 def fetch_all(conn: sqlite3.Connection) -> list[dict[str, object]]:
@@ -98,3 +329,77 @@ def fetch_recent(conn: sqlite3.Connection, hours: int) -> list[dict[str, object]
         (f"-{hours} hours",),
     )
     return [dict(row) for row in cursor.fetchall()]
+
+
+def fetch_tile_daily(
+    conn: sqlite3.Connection,
+    region_id: str | None = None,
+    models: list[str] | None = None,
+    start_day: str | None = None,
+    end_day: str | None = None,
+    risk_levels: list[str] | None = None,
+) -> list[dict[str, object]]:
+    """Per-tile, per-day mean risk score (1=low .. 3=high) from the rollup table.
+
+    Rows across the selected models are merged. With `risk_levels`, the mean
+    only counts predictions at those levels. Tiles with no such prediction on
+    a day are left out.
+    """
+    clauses: list[str] = ["1"]
+    params: list[object] = []
+    if region_id is not None:
+        clauses.append("region_id = ?")
+        params.append(region_id)
+    if models:
+        clauses.append(f"model IN ({', '.join('?' * len(models))})")
+        params.extend(models)
+    if start_day is not None:
+        clauses.append("day >= ?")
+        params.append(start_day)
+    if end_day is not None:
+        clauses.append("day <= ?")
+        params.append(end_day)
+    if risk_levels is None:
+        score_sum, n_scored = "sum(score_sum)", "sum(n_scored)"
+    else:
+        counts = {"low": ("n_low", 1), "medium": ("n_medium", 2), "high": ("n_high", 3)}
+        selected = [counts[level] for level in risk_levels if level in counts]
+        score_sum = "sum(" + (" + ".join(f"{w} * {col}" for col, w in selected) or "0") + ")"
+        n_scored = "sum(" + (" + ".join(col for col, _ in selected) or "0") + ")"
+    cursor = conn.execute(
+        f"""
+        SELECT lon, lat, day,
+               sum(n_predictions) AS n_predictions,
+               1.0 * {score_sum} / {n_scored} AS mean_score,
+               sum(n_low) AS n_low, sum(n_medium) AS n_medium, sum(n_high) AS n_high
+        FROM tile_daily_risk
+        WHERE {" AND ".join(clauses)}
+        GROUP BY lon, lat, day
+        HAVING {n_scored} > 0
+        ORDER BY day
+        """,
+        params,
+    )
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def db_version(conn: sqlite3.Connection) -> tuple[int, str]:
+    """(max id, max created_at): changes whenever a prediction is inserted or upserted.
+
+    Both are index lookups, so this is cheap enough to call on every page load.
+    """
+    row = conn.execute("SELECT max(id), max(created_at) FROM predictions").fetchone()
+    return int(row[0] or 0), str(row[1] or "")
+
+
+def fetch_since(conn: sqlite3.Connection, after_id: int) -> list[dict[str, object]]:
+    """Return predictions with id > after_id, oldest first.
+
+    Writers are serialised by SQLite, so ids grow in commit order and no row
+    committed after a read can get an id below what that read saw.
+    """
+    cursor = conn.execute(
+        "SELECT * FROM predictions WHERE id > ? ORDER BY id",
+        (after_id,),
+    )
+    return [dict(row) for row in cursor.fetchall()]
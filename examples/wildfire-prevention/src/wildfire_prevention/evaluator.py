@@ -1,15 +1,20 @@
 """Evaluation backends and metrics for wildfire risk prediction."""
 
+import asyncio
 import base64
 import json
+import math
 import subprocess
 import time
 import urllib.error
 import urllib.request
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 from time import perf_counter
-from typing import Protocol
+from types import TracebackType
+from typing import Any, Protocol, Self
 
 from openai import OpenAI
 
@@ -57,16 +62,28 @@ def anthropic_backend() -> PredictFn:
     return annotate
 
 
-def transformers_backend(model_path: str) -> PredictFn:
-    """Return a predict function that loads a HuggingFace safetensors checkpoint.
+@dataclass
+class BatchOutput:
+    """One pair's outcome from a batched predict call."""
 
-    Used to evaluate fine-tuned checkpoints that have not been converted to GGUF.
-    Requires: transformers, torch, Pillow (already in the project dependencies).
+    result: dict[str, object] | Exception  # the prediction, or the error raised for it
+    batch_size: int = 1  # rows that shared the generate call
+    latency_s: float = 0.0  # that call's wall time divided by its rows
+
+
+class BatchPredictFn(Protocol):
+    """Predict a list of (rgb_bytes, swir_bytes) pairs at once.
+
+    Returns one BatchOutput per pair, in order.
     """
-    import io
 
+    def __call__(self, pairs: list[tuple[bytes, bytes]]) -> list[BatchOutput]: ...
+
+
+@cache
+def _load_transformers(model_path: str) -> tuple[Any, Any, str]:
+    """Load (processor, model, device) once per checkpoint and share it between backends."""
     import torch
-    from PIL import Image
     from transformers import AutoProcessor, AutoModelForImageTextToText  # type: ignore[import-untyped]
 
     device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -75,6 +92,9 @@ def transformers_backend(model_path: str) -> PredictFn:
     # local — newer transformers (5.x) rejects absolute paths in AutoProcessor.
     processor_source = "LiquidAI/LFM2.5-VL-450M" if local_path.is_dir() else model_path
     processor = AutoProcessor.from_pretrained(processor_source, trust_remote_code=True)
+    # Decoder-only generation needs the padding on the left so every row ends
+    # at the same position and new tokens are appended right after the prompt
+    processor.tokenizer.padding_side = "left"
     model = AutoModelForImageTextToText.from_pretrained(
         str(local_path) if local_path.is_dir() else model_path,
         torch_dtype=torch.float16 if device == "cuda" else torch.float32,
@@ -82,82 +102,230 @@ def transformers_backend(model_path: str) -> PredictFn:
         local_files_only=local_path.is_dir(),
     ).to(device)
     model.eval()
+    return processor, model, device
 
-    prompt = f"{SYSTEM_PROMPT.strip()}\n\n{USER_TEXT}"
 
-    def predict(rgb_bytes: bytes, swir_bytes: bytes) -> dict[str, object]:
-        rgb_image  = Image.open(io.BytesIO(rgb_bytes)).convert("RGB")
-        swir_image = Image.open(io.BytesIO(swir_bytes)).convert("RGB")
+def _parse_json_output(raw: str) -> dict[str, object]:
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("\n", 1)[-1]
+        raw = raw.rsplit("```", 1)[0].strip()
+    return json.loads(raw)  # type: ignore[no-any-return]
 
-        messages = [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "image"},
-                    {"type": "image"},
-                    {"type": "text", "text": prompt},
-                ],
-            }
-        ]
-        text = processor.apply_chat_template(messages, add_generation_prompt=True)
+
+def transformers_batch_backend(
+    model_path: str,
+    max_batch_size: int = 8,
+    max_batch_tokens: int = 16384,
+) -> BatchPredictFn:
+    """Return a batched predict function for a HuggingFace safetensors checkpoint.
+
+    Pairs are grouped by prompt length, which only depends on the image sizes
+    since the text is fixed. Each batch holds at most `max_batch_size` pairs
+    and `max_batch_tokens` padded prompt tokens, so short prompts run in large
+    batches and long ones in small batches, with little padding in either.
+    """
+    import io
+
+    import torch
+    from PIL import Image
+
+    processor, model, device = _load_transformers(model_path)
+
+    prompt = f"{SYSTEM_PROMPT.strip()}\n\n{USER_TEXT}"
+    messages = [
+        {
+            "role": "user",
+            "content": [
+                {"type": "image"},
+                {"type": "image"},
+                {"type": "text", "text": prompt},
+            ],
+        }
+    ]
+    text = processor.apply_chat_template(messages, add_generation_prompt=True)
+    # Prompt length per (rgb size, swir size), measured once per distinct pair of sizes
+    prompt_lengths: dict[tuple[tuple[int, int], tuple[int, int]], int] = {}
+
+    def prompt_length(images: list[Any]) -> int:
+        key = (images[0].size, images[1].size)
+        if key not in prompt_lengths:
+            inputs = processor(text=text, images=images, return_tensors="pt")
+            prompt_lengths[key] = int(inputs["input_ids"].shape[1])
+        return prompt_lengths[key]
+
+    def generate(batch: list[list[Any]]) -> list[dict[str, object] | Exception]:
         inputs = processor(
-            text=text,
-            images=[rgb_image, swir_image],
+            text=[text] * len(batch),
+            images=batch,
+            padding=True,
             return_tensors="pt",
         ).to(device)
-
         with torch.no_grad():
             output_ids = model.generate(
                 **inputs,
                 max_new_tokens=256,
                 do_sample=False,
+                pad_token_id=processor.tokenizer.pad_token_id,
             )
-
+        # With left padding every row's prompt ends at the same column
         input_len = inputs["input_ids"].shape[1]
-        generated = output_ids[0][input_len:]
-        raw = processor.decode(generated, skip_special_tokens=True).strip()
+        raws = processor.batch_decode(output_ids[:, input_len:], skip_special_tokens=True)
+
+        results: list[dict[str, object] | Exception] = []
+        for raw in raws:
+            try:
+                results.append(_parse_json_output(raw))
+            except json.JSONDecodeError as exc:
+                results.append(exc)
+        return results
+
+    def predict_batch(pairs: list[tuple[bytes, bytes]]) -> list[BatchOutput]:
+        results = [BatchOutput(ValueError("not evaluated")) for _ in pairs]
+        images: list[list[Any]] = []
+        lengths: list[int] = []
+        pending: list[int] = []
+        for i, (rgb_bytes, swir_bytes) in enumerate(pairs):
+            try:
+                pair = [
+                    Image.open(io.BytesIO(rgb_bytes)).convert("RGB"),
+                    Image.open(io.BytesIO(swir_bytes)).convert("RGB"),
+                ]
+                lengths.append(prompt_length(pair))
+            except Exception as exc:  # noqa: BLE001 - a bad image only fails its own pair
+                results[i] = BatchOutput(exc)
+                images.append([])
+                lengths.append(0)
+                continue
+            images.append(pair)
+            pending.append(i)
+
+        def run(batch: list[int]) -> None:
+            t0 = perf_counter()
+            try:
+                outputs = generate([images[i] for i in batch])
+            except Exception as exc:  # noqa: BLE001 - out of memory or a bad row, retried below
+                if len(batch) > 1:
+                    # Halve until the failing row runs alone, so it does not fail the others
+                    half = len(batch) // 2
+                    run(batch[:half])
+                    run(batch[half:])
+                    return
+                outputs = [exc]
+            latency_s = (perf_counter() - t0) / len(batch)
+            for i, output in zip(batch, outputs):
+                results[i] = BatchOutput(output, batch_size=len(batch), latency_s=latency_s)
+
+        # Longest first, so the first batch fails fast if the token budget is too large
+        pending.sort(key=lambda i: lengths[i], reverse=True)
+        start = 0
+        while start < len(pending):
+            # All later prompts are shorter, so the first one sets the padded length
+            per_row = lengths[pending[start]]
+            size = max(1, min(max_batch_size, max_batch_tokens // max(per_row, 1)))
+            run(pending[start : start + size])
+            start += size
+        return results
+
+    return predict_batch
+
+
+def transformers_backend(model_path: str) -> PredictFn:
+    """Return a predict function that loads a HuggingFace safetensors checkpoint.
+
+    Used to evaluate fine-tuned checkpoints that have not been converted to GGUF.
+    Requires: transformers, torch, Pillow (already in the project dependencies).
+    Shares the loaded model with transformers_batch_backend.
+    """
+    predict_batch = transformers_batch_backend(model_path, max_batch_size=1)
 
-        if raw.startswith("```"):
-            raw = raw.split("\n", 1)[-1]
-            raw = raw.rsplit("```", 1)[0].strip()
-        return json.loads(raw)  # type: ignore[no-any-return]
+    def predict(rgb_bytes: bytes, swir_bytes: bytes) -> dict[str, object]:
+        result = predict_batch([(rgb_bytes, swir_bytes)])[0].result
+        if isinstance(result, Exception):
+            raise result
+        return result
 
     return predict
 
 
+def _llama_request(model: str, rgb_bytes: bytes, swir_bytes: bytes) -> dict[str, Any]:
+    """Chat-completion arguments for one tile, shared by the sync and async llama backends."""
+
+    def _data_url(image_bytes: bytes) -> str:
+        return "data:image/png;base64," + base64.standard_b64encode(image_bytes).decode()
+
+    return {
+        "model": model,
+        "temperature": 0.0,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "WildfireRisk", "schema": _RESPONSE_SCHEMA},
+        },
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "image_url", "image_url": {"url": _data_url(rgb_bytes)}},
+                    {"type": "image_url", "image_url": {"url": _data_url(swir_bytes)}},
+                    {"type": "text", "text": USER_TEXT},
+                ],
+            },
+        ],
+    }
+
+
 def llama_backend(model: str, port: int = 8080) -> PredictFn:
     """Return a predict function that calls a local llama-server via the OpenAI API."""
     client = OpenAI(base_url=f"http://127.0.0.1:{port}/v1", api_key="not-needed")
 
     def predict(rgb_bytes: bytes, swir_bytes: bytes) -> dict[str, object]:
-        def _data_url(image_bytes: bytes) -> str:
-            return "data:image/png;base64," + base64.standard_b64encode(image_bytes).decode()
-
-        response = client.chat.completions.create(
-            model=model,
-            temperature=0.0,
-            response_format={
-                "type": "json_schema",
-                "json_schema": {"name": "WildfireRisk", "schema": _RESPONSE_SCHEMA},
-            },
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "image_url", "image_url": {"url": _data_url(rgb_bytes)}},
-                        {"type": "image_url", "image_url": {"url": _data_url(swir_bytes)}},
-                        {"type": "text", "text": USER_TEXT},
-                    ],
-                },
-            ],
-        )
+        response = client.chat.completions.create(**_llama_request(model, rgb_bytes, swir_bytes))
         content = response.choices[0].message.content or ""
         return json.loads(content)  # type: ignore[no-any-return]
 
     return predict
 
 
+class AsyncPredictFn(Protocol):
+    async def __call__(self, rgb_bytes: bytes, swir_bytes: bytes) -> dict[str, object]: ...
+
+
+def async_llama_backend(model: str, base_urls: list[str]) -> AsyncPredictFn:
+    """Return an async predict function spread over one or more llama-servers.
+
+    Each request goes to the server with the fewest requests in flight, so a
+    slow server does not hold back the others.
+    """
+    from openai import AsyncOpenAI
+
+    clients = [AsyncOpenAI(base_url=f"{url.rstrip('/')}/v1", api_key="not-needed") for url in base_urls]
+    in_flight = [0] * len(clients)
+
+    async def predict(rgb_bytes: bytes, swir_bytes: bytes) -> dict[str, object]:
+        i = min(range(len(clients)), key=in_flight.__getitem__)
+        in_flight[i] += 1
+        try:
+            response = await clients[i].chat.completions.create(
+                **_llama_request(model, rgb_bytes, swir_bytes)
+            )
+        finally:
+            in_flight[i] -= 1
+        content = response.choices[0].message.content or ""
+        return json.loads(content)  # type: ignore[no-any-return]
+
+    return predict
+
+
+def async_from_sync(predict: PredictFn) -> AsyncPredictFn:
+    """Run a blocking predict function on a worker thread."""
+
+    async def apredict(rgb_bytes: bytes, swir_bytes: bytes) -> dict[str, object]:
+        return await asyncio.to_thread(predict, rgb_bytes, swir_bytes)
+
+    return apredict
+
+
 # ---------------------------------------------------------------------------
 # llama-server lifecycle (mirrors invoice-parser pattern)
 # ---------------------------------------------------------------------------
@@ -220,35 +388,35 @@ class SampleResult:
     latency_s: float = 0.0
     prediction: dict[str, object] | None = None
     ground_truth: dict[str, object] | None = None
+    batch_size: int = 1  # samples that shared the generate call, latency_s is its share
+    error: str | None = None  # backend exception (e.g. server down); None when the model answered
 
     @property
     def all_fields_match(self) -> bool:
         return all(self.field_matches.values())
 
 
-def evaluate_sample(
+def _score_sample(
     location_id: str,
-    rgb_bytes: bytes,
-    swir_bytes: bytes,
+    prediction: dict[str, object] | None,
     ground_truth: dict[str, object],
-    predict: PredictFn,
+    latency_s: float,
+    batch_size: int = 1,
+    error: str | None = None,
 ) -> SampleResult:
-    t0 = perf_counter()
-    try:
-        prediction = predict(rgb_bytes, swir_bytes)
-        valid_json = True
-    except Exception:
+    if prediction is None:
         return SampleResult(
             id=location_id,
             valid_json=False,
             fields_present=False,
             field_matches={f: False for f in EVAL_FIELDS},
-            latency_s=perf_counter() - t0,
+            latency_s=latency_s,
             prediction=None,
             ground_truth=ground_truth,
+            batch_size=batch_size,
+            error=error,
         )
 
-    latency_s = perf_counter() - t0
     fields_present = all(f in prediction for f in EVAL_FIELDS)
     field_matches = {
         f: prediction.get(f) == ground_truth.get(f)
@@ -256,22 +424,135 @@ def evaluate_sample(
     }
     return SampleResult(
         id=location_id,
-        valid_json=valid_json,
+        valid_json=True,
         fields_present=fields_present,
         field_matches=field_matches,
         latency_s=latency_s,
         prediction=prediction,
         ground_truth=ground_truth,
+        batch_size=batch_size,
     )
 
 
+def _describe_failure(exc: Exception) -> str | None:
+    """Error text for a failed prediction, or None when the model's output was not valid JSON.
+
+    Unparseable output is a model failure and is scored as such; anything else
+    (connection errors, timeouts, out of memory) says nothing about the model,
+    so the sample is worth running again.
+    """
+    # annotate() re-raises the decode error as a ValueError with the raw response
+    if isinstance(exc, json.JSONDecodeError) or isinstance(exc.__cause__, json.JSONDecodeError):
+        return None
+    return f"{type(exc).__name__}: {exc}"
+
+
+def evaluate_sample(
+    location_id: str,
+    rgb_bytes: bytes,
+    swir_bytes: bytes,
+    ground_truth: dict[str, object],
+    predict: PredictFn,
+) -> SampleResult:
+    t0 = perf_counter()
+    error = None
+    try:
+        prediction = predict(rgb_bytes, swir_bytes)
+    except Exception as exc:
+        prediction = None
+        error = _describe_failure(exc)
+    return _score_sample(location_id, prediction, ground_truth, perf_counter() - t0, error=error)
+
+
+def evaluate_batch(
+    samples: list[tuple[str, bytes, bytes, dict[str, object]]],
+    predict_batch: BatchPredictFn,
+) -> list[SampleResult]:
+    """Evaluate (id, rgb_bytes, swir_bytes, ground_truth) samples with one batched call.
+
+    The backend may split them over several generate calls. Each sample gets
+    the size of the call it ran in, and that call's wall time divided by its rows.
+    """
+    outputs = predict_batch([(rgb, swir) for _, rgb, swir, _ in samples])
+    return [
+        _score_sample(
+            sid,
+            None if isinstance(output.result, Exception) else output.result,
+            ground_truth,
+            output.latency_s,
+            batch_size=output.batch_size,
+            error=_describe_failure(output.result) if isinstance(output.result, Exception) else None,
+        )
+        for (sid, _, _, ground_truth), output in zip(samples, outputs)
+    ]
+
+
+async def evaluate_sample_async(
+    location_id: str,
+    rgb_bytes: bytes,
+    swir_bytes: bytes,
+    ground_truth: dict[str, object],
+    predict: AsyncPredictFn,
+) -> SampleResult:
+    t0 = perf_counter()
+    error = None
+    try:
+        prediction = await predict(rgb_bytes, swir_bytes)
+    except Exception as exc:
+        prediction = None
+        error = _describe_failure(exc)
+    return _score_sample(location_id, prediction, ground_truth, perf_counter() - t0, error=error)
+
+
+async def run_eval_async(
+    samples: Iterable[tuple[str, bytes, bytes, dict[str, object]]],
+    predict: AsyncPredictFn,
+    max_in_flight: int,
+    on_result: Callable[[SampleResult], None],
+) -> None:
+    """Evaluate samples with at most `max_in_flight` requests outstanding.
+
+    Samples are pulled from the iterable only when a slot frees up, so at most
+    `max_in_flight` of them are held in memory. `on_result` is called as soon
+    as each sample finishes, in completion order.
+    """
+    slots = asyncio.Semaphore(max(1, max_in_flight))
+    tasks: set[asyncio.Task[None]] = set()
+    iterator = iter(samples)
+
+    async def run_one(sample: tuple[str, bytes, bytes, dict[str, object]]) -> None:
+        try:
+            on_result(await evaluate_sample_async(*sample, predict))
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            # Reading the next sample touches the disk; keep the event loop free
+            sample = await asyncio.to_thread(next, iterator, None)
+            if sample is None:
+                break
+            task = asyncio.create_task(run_one(sample))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 # ---------------------------------------------------------------------------
 # Aggregate metrics
 # ---------------------------------------------------------------------------
 
+LATENCY_BUCKETS_S: list[float] = [0.25, 0.5, 1, 2, 4, 8, 16, 32, 64]
+
+
 @dataclass
 class EvalSummary:
     results: list[SampleResult]
+    wall_time_s: float = 0.0  # end-to-end time of the run, 0 when not measured
 
     def valid_json_accuracy(self) -> float:
         return sum(r.valid_json for r in self.results) / len(self.results) if self.results else 0.0
@@ -295,6 +576,25 @@ class EvalSummary:
     def avg_latency_s(self) -> float:
         return sum(r.latency_s for r in self.results) / len(self.results) if self.results else 0.0
 
+    def latency_percentile_s(self, q: float) -> float:
+        """Per-sample latency at percentile q (0-100), nearest-rank."""
+        latencies = sorted(r.latency_s for r in self.results)
+        if not latencies:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * len(latencies)))
+        return latencies[rank - 1]
+
+    def samples_per_second(self) -> float:
+        return len(self.results) / self.wall_time_s if self.wall_time_s > 0 else 0.0
+
+    def latency_histogram(self) -> dict[str, int]:
+        """Sample counts per latency bucket, keyed by the bucket's upper bound in seconds."""
+        counts = {f"<={edge:g}s": 0 for edge in LATENCY_BUCKETS_S} | {f">{LATENCY_BUCKETS_S[-1]:g}s": 0}
+        for r in self.results:
+            edge = next((e for e in LATENCY_BUCKETS_S if r.latency_s <= e), None)
+            counts[f"<={edge:g}s" if edge is not None else f">{LATENCY_BUCKETS_S[-1]:g}s"] += 1
+        return counts
+
 
 # ---------------------------------------------------------------------------
 # Report rendering
@@ -334,6 +634,23 @@ def render_report(
     lines.append(f"| **avg latency (s)** | **{summary.avg_latency_s():.2f}** |")
     lines.append("")
 
+    lines.append("## Throughput")
+    lines.append("")
+    lines.append("| metric | value |")
+    lines.append("|---|---|")
+    lines.append(f"| samples | {len(summary.results)} |")
+    lines.append(f"| wall time (s) | {summary.wall_time_s:.2f} |")
+    lines.append(f"| samples/sec | {summary.samples_per_second():.2f} |")
+    batch_sizes = [r.batch_size for r in summary.results]
+    batched = any(b > 1 for b in batch_sizes)
+    # A batched sample's latency is its batch's wall time divided by the batch size
+    label = "latency, per-sample share of batch time" if batched else "latency per sample"
+    for q in (50, 95, 99):
+        lines.append(f"| p{q} {label} (s) | {summary.latency_percentile_s(q):.2f} |")
+    if batched:
+        lines.append(f"| mean batch size | {sum(batch_sizes) / len(batch_sizes):.1f} |")
+    lines.append("")
+
     # Per-sample table
     lines.append("## Per-sample results")
     lines.append("")
@@ -375,6 +692,73 @@ def model_name(backend: str, llama_model: str, quant: str = "") -> str:
 # Structured result persistence
 # ---------------------------------------------------------------------------
 
+PARTIAL_RESULTS_FILE = "results.partial.jsonl"
+
+
+def _write_json(path: Path, data: object) -> None:
+    """Write JSON via a temporary file, so an interrupted run never leaves a truncated file."""
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _to_record(r: SampleResult) -> dict[str, object]:
+    return {
+        "id": r.id,
+        "valid_json": r.valid_json,
+        "fields_present": r.fields_present,
+        "field_matches": r.field_matches,
+        "latency_s": r.latency_s,
+        "batch_size": r.batch_size,
+        "error": r.error,
+        "prediction": r.prediction,
+        "ground_truth": r.ground_truth,
+    }
+
+
+def _from_record(r: dict[str, Any]) -> SampleResult:
+    return SampleResult(
+        id=r["id"],
+        valid_json=r["valid_json"],
+        fields_present=r["fields_present"],
+        field_matches=r["field_matches"],
+        latency_s=r.get("latency_s", 0.0),
+        prediction=r.get("prediction"),
+        ground_truth=r.get("ground_truth"),
+        batch_size=r.get("batch_size", 1),
+        error=r.get("error"),
+    )
+
+
+class PartialResultsWriter:
+    """Append each finished sample to results.partial.jsonl as soon as it is scored.
+
+    Every checkpoint is one short line, so it costs the same at the end of a
+    long run as at the start, and a crash loses at most the line being written.
+    """
+
+    def __init__(self, eval_dir: Path) -> None:
+        self._file = (eval_dir / PARTIAL_RESULTS_FILE).open("a", encoding="utf-8")
+
+    def write(self, result: SampleResult) -> None:
+        self._file.write(json.dumps(_to_record(result)) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
 def save_results(
     eval_dir: Path,
     summary: EvalSummary,
@@ -383,31 +767,55 @@ def save_results(
     model: str,
     split: str,
     eval_run_id: str,
+    extra_meta: dict[str, object] | None = None,
+    complete: bool = True,
 ) -> None:
-    """Write results.json and meta.json into eval_dir."""
+    """Write results.json and meta.json into eval_dir.
+
+    For an unfinished run (complete=False) only meta.json is written: its
+    results are already in results.partial.jsonl (see PartialResultsWriter),
+    and tools that read results.json only ever see finished runs.
+    """
     meta = {
         "eval_run_id": eval_run_id,
         "dataset": dataset,
         "backend": backend,
         "model": model,
         "split": split,
+        "n_samples": len(summary.results),
+        "wall_time_s": round(summary.wall_time_s, 3),
+        "samples_per_second": round(summary.samples_per_second(), 3),
+        "latency_p50_s": round(summary.latency_percentile_s(50), 3),
+        "latency_p95_s": round(summary.latency_percentile_s(95), 3),
+        "latency_p99_s": round(summary.latency_percentile_s(99), 3),
+        "latency_histogram": summary.latency_histogram(),
+        "complete": complete,
+        **(extra_meta or {}),
     }
-    (eval_dir / "meta.json").write_text(
-        json.dumps(meta, indent=2), encoding="utf-8"
-    )
+    _write_json(eval_dir / "meta.json", meta)
 
-    records = [
-        {
-            "id": r.id,
-            "valid_json": r.valid_json,
-            "fields_present": r.fields_present,
-            "field_matches": r.field_matches,
-            "latency_s": r.latency_s,
-            "prediction": r.prediction,
-            "ground_truth": r.ground_truth,
-        }
-        for r in summary.results
-    ]
-    (eval_dir / "results.json").write_text(
-        json.dumps(records, indent=2), encoding="utf-8"
-    )
+    if complete:
+        _write_json(eval_dir / "results.json", [_to_record(r) for r in summary.results])
+        (eval_dir / PARTIAL_RESULTS_FILE).unlink(missing_ok=True)
+
+
+def load_results(eval_dir: Path) -> list[SampleResult]:
+    """Read back the results of a previous run, including an unfinished run's checkpoint.
+
+    Lines of results.partial.jsonl override results.json, and later lines
+    override earlier ones, so a sample re-run on resume keeps its latest result.
+    """
+    records: dict[str, dict[str, Any]] = {}
+    results_path = eval_dir / "results.json"
+    if results_path.exists():
+        for r in json.loads(results_path.read_text(encoding="utf-8")):
+            records[r["id"]] = r
+    partial_path = eval_dir / PARTIAL_RESULTS_FILE
+    if partial_path.exists():
+        for line in partial_path.read_text(encoding="utf-8").splitlines():
+            try:
+                r = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # the line being written when the run was killed
+            records[r["id"]] = r
+    return [_from_record(r) for r in records.values()]
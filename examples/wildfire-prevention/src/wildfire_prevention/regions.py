@@ -6,7 +6,10 @@ both the live watch loop (predict.py) and the historical backfill (backfill.py).
 """
 
 import math
-from dataclasses import dataclass
+import warnings
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import cache
 
 
 @dataclass(frozen=True)
@@ -90,6 +93,19 @@ def generate_tile_grid(region: Region, size_km: float) -> list[tuple[float, floa
     return tiles
 
 
+@cache
+def region_tiles(region_id: str, size_km: float) -> tuple[tuple[float, float], ...]:
+    """Tile grid of REGIONS[region_id], generated once per (region, size)."""
+    return tuple(generate_tile_grid(REGIONS[region_id], size_km))
+
+
+def _tile_half_extents(tile_lat: float, size_km: float) -> tuple[float, float]:
+    """(lon_half, lat_half) of a tile in degrees."""
+    lat_half = (size_km / 111.0) / 2.0
+    lon_half = (size_km / (111.0 * math.cos(math.radians(tile_lat)))) / 2.0
+    return lon_half, lat_half
+
+
 def tile_contains(
     lon: float,
     lat: float,
@@ -101,8 +117,7 @@ def tile_contains(
 
     The tile is centred at (tile_lon, tile_lat) with edge length size_km.
     """
-    lat_half = (size_km / 111.0) / 2.0
-    lon_half = (size_km / (111.0 * math.cos(math.radians(tile_lat)))) / 2.0
+    lon_half, lat_half = _tile_half_extents(tile_lat, size_km)
     return (
         tile_lon - lon_half <= lon <= tile_lon + lon_half
         and tile_lat - lat_half <= lat <= tile_lat + lat_half
@@ -115,8 +130,86 @@ def find_tile(
     tiles: list[tuple[float, float]],
     size_km: float,
 ) -> tuple[float, float] | None:
-    """Return the tile center that contains (lon, lat), or None if outside all tiles."""
+    """Return the tile center that contains (lon, lat), or None if outside all tiles.
+
+    Deprecated: scans every tile on each call. Build a `TileIndex(tiles, size_km)`
+    once and call its `find` instead.
+    """
+    warnings.warn(
+        "find_tile scans every tile; use TileIndex(tiles, size_km).find instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    return find_tile_scan(lon, lat, tiles, size_km)
+
+
+def find_tile_scan(
+    lon: float,
+    lat: float,
+    tiles: list[tuple[float, float]],
+    size_km: float,
+) -> tuple[float, float] | None:
+    """Linear-scan reference for TileIndex, kept for benchmarking."""
     for tile_lon, tile_lat in tiles:
         if tile_contains(lon, lat, tile_lon, tile_lat, size_km):
             return tile_lon, tile_lat
     return None
+
+
+@dataclass
+class TileIndex:
+    """Uniform-grid hash over tile bounding boxes for O(1) point lookups.
+
+    The plane is cut into square cells one tile-height (size_km / 111 degrees)
+    wide and every tile is registered in each cell its bounding box overlaps.
+    A lookup only tests the handful of tiles registered in the point's cell,
+    in the original tile order, so it returns the same tile as `find_tile_scan`.
+    """
+
+    tiles: list[tuple[float, float]]
+    size_km: float
+    _cells: dict[tuple[int, int], list[tuple[float, float]]] = field(
+        init=False, repr=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        self._cell_deg = self.size_km / 111.0
+        for tile_lon, tile_lat in self.tiles:
+            lon_half, lat_half = _tile_half_extents(tile_lat, self.size_km)
+            x0, y0 = self._cell(tile_lon - lon_half, tile_lat - lat_half)
+            x1, y1 = self._cell(tile_lon + lon_half, tile_lat + lat_half)
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self._cells.setdefault((x, y), []).append((tile_lon, tile_lat))
+
+    @classmethod
+    def for_regions(cls, region_ids: Iterable[str], size_km: float) -> "TileIndex":
+        """Index over the tile grids of several regions, built once per region set.
+
+        Tiles are taken region by region in sorted id order; `tiles` holds
+        that order for callers that need the same list.
+        """
+        return _regions_index(tuple(sorted(region_ids)), size_km)
+
+    def _cell(self, lon: float, lat: float) -> tuple[int, int]:
+        return math.floor(lon / self._cell_deg), math.floor(lat / self._cell_deg)
+
+    def find(self, lon: float, lat: float) -> tuple[float, float] | None:
+        """Return the tile center that contains (lon, lat), or None if outside all tiles."""
+        for tile_lon, tile_lat in self._cells.get(self._cell(lon, lat), ()):
+            if tile_contains(lon, lat, tile_lon, tile_lat, self.size_km):
+                return tile_lon, tile_lat
+        return None
+
+    def find_many(
+        self, points: Iterable[tuple[float, float]]
+    ) -> list[tuple[float, float] | None]:
+        """Look up every (lon, lat) of a trajectory, in order."""
+        return [self.find(lon, lat) for lon, lat in points]
+
+
+@cache
+def _regions_index(region_ids: tuple[str, ...], size_km: float) -> TileIndex:
+    tiles = [tile for rid in region_ids for tile in region_tiles(rid, size_km)]
+    return TileIndex(tiles, size_km)
+
@@ -1,7 +1,160 @@
+"""SimSat HTTP client.
+
+All requests go through one keep-alive session per base URL, with retries and
+exponential backoff on connection errors and transient 5xx/429 responses.
+Historical images are cached on disk, keyed by location, timestamp, bands and
+tile size, so backfill and sample generation never fetch the same tile twice.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 SIMSAT_BASE_URL = "http://localhost:9005"
 
+RGB_BANDS = ["red", "green", "blue"]
+SWIR_BANDS = ["swir16", "nir08", "red"]
+
+# Override with SIMSAT_CACHE_DIR; set it to an empty string to disable the cache
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / ".simsat_cache"
+
+
+def _cache_dir_from_env() -> Path | None:
+    value = os.environ.get("SIMSAT_CACHE_DIR")
+    if value is None:
+        return DEFAULT_CACHE_DIR
+    return Path(value) if value else None
+
+
+class SimSatClient:
+    """Pooled, retrying SimSat client with an optional on-disk tile cache."""
+
+    def __init__(
+        self,
+        base_url: str = SIMSAT_BASE_URL,
+        cache_dir: Path | None = DEFAULT_CACHE_DIR,
+        pool_size: int = 8,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float = 60.0,
+    ) -> None:
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.cache_hits = 0
+        self.requests_sent = 0
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            # Hand the last response back so callers still see requests.HTTPError
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="simsat")
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        self.session.close()
+
+    def _get(self, path: str, params: list[tuple[str, object]] | None = None) -> requests.Response:
+        self.requests_sent += 1
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def _cache_path(
+        self, lon: float, lat: float, timestamp: str, bands: list[str], size_km: float
+    ) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        key = json.dumps([round(lon, 6), round(lat, 6), timestamp, bands, float(size_km)])
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.png"
+
+    def fetch_image(
+        self,
+        lon: float,
+        lat: float,
+        timestamp: str,
+        bands: list[str],
+        size_km: float = 10.0,
+    ) -> bytes:
+        """Return raw PNG bytes for the requested Sentinel-2 band composite.
+
+        Raises:
+            requests.HTTPError: if SimSat returns a non-2xx status (e.g. 404 when
+                no Sentinel pass exists for the requested location/time).
+        """
+        cache_path = self._cache_path(lon, lat, timestamp, bands, size_km)
+        if cache_path is not None and cache_path.exists():
+            self.cache_hits += 1
+            return cache_path.read_bytes()
+
+        params: list[tuple[str, object]] = [
+            ("lon", lon),
+            ("lat", lat),
+            ("timestamp", timestamp),
+            ("size_km", size_km),
+            ("return_type", "png"),
+        ] + [("spectral_bands", b) for b in bands]
+        content = self._get("/data/image/sentinel", params).content
+
+        # Empty bodies mean no coverage; don't pin them in the cache
+        if cache_path is not None and content:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees a partial file
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(cache_path)
+        return content
+
+    def fetch_pair(
+        self, lon: float, lat: float, timestamp: str, size_km: float = 10.0
+    ) -> tuple[bytes, bytes]:
+        """Fetch the RGB and SWIR composites of a tile concurrently."""
+        rgb = self._pool.submit(self.fetch_image, lon, lat, timestamp, RGB_BANDS, size_km)
+        swir = self._pool.submit(self.fetch_image, lon, lat, timestamp, SWIR_BANDS, size_km)
+        return rgb.result(), swir.result()
+
+    def current_position(self) -> tuple[float, float]:
+        """Return (lon, lat) of the satellite's current simulated position."""
+        data: dict[str, object] = self._get("/data/current/position").json()
+        lon_lat_alt: list[float] = data["lon-lat-alt"]  # type: ignore[assignment]
+        return float(lon_lat_alt[0]), float(lon_lat_alt[1])
+
+    def fetch_current_image(self, bands: list[str], size_km: float) -> bytes:
+        """Call the SimSat live image endpoint (no timestamp required, never cached)."""
+        params: list[tuple[str, object]] = [
+            ("size_km", size_km),
+            ("return_type", "png"),
+        ] + [("spectral_bands", b) for b in bands]
+        return self._get("/data/current/image/sentinel", params).content
+
+    def fetch_current_pair(self, size_km: float) -> tuple[bytes, bytes]:
+        """Fetch the live RGB and SWIR composites concurrently."""
+        rgb = self._pool.submit(self.fetch_current_image, RGB_BANDS, size_km)
+        swir = self._pool.submit(self.fetch_current_image, SWIR_BANDS, size_km)
+        return rgb.result(), swir.result()
+
+
+@cache
+def get_client(base_url: str = SIMSAT_BASE_URL) -> SimSatClient:
+    """Shared client for `base_url`, so every caller reuses the same connection pool."""
+    return SimSatClient(base_url, cache_dir=_cache_dir_from_env())
+
 
 def fetch_image(
     lon: float,
@@ -17,16 +170,7 @@ def fetch_image(
         requests.HTTPError: if SimSat returns a non-2xx status (e.g. 404 when
             no Sentinel pass exists for the requested location/time).
     """
-    params: list[tuple[str, object]] = [
-        ("lon", lon),
-        ("lat", lat),
-        ("timestamp", timestamp),
-        ("size_km", size_km),
-        ("return_type", "png"),
-    ] + [("spectral_bands", b) for b in bands]
-    response = requests.get(f"{base_url}/data/image/sentinel", params=params, timeout=60)
-    response.raise_for_status()
-    return response.content
+    return get_client(base_url).fetch_image(lon, lat, timestamp, bands, size_km)
 
 
 def fetch_rgb(
@@ -37,7 +181,7 @@ def fetch_rgb(
     base_url: str = SIMSAT_BASE_URL,
 ) -> bytes:
     """Fetch a natural-color RGB composite (B4-B3-B2)."""
-    return fetch_image(lon, lat, timestamp, ["red", "green", "blue"], size_km, base_url)
+    return fetch_image(lon, lat, timestamp, RGB_BANDS, size_km, base_url)
 
 
 def fetch_swir(
@@ -48,4 +192,15 @@ def fetch_swir(
     base_url: str = SIMSAT_BASE_URL,
 ) -> bytes:
     """Fetch a SWIR composite (B12-B8-B4) optimised for vegetation stress and dryness."""
-    return fetch_image(lon, lat, timestamp, ["swir16", "nir08", "red"], size_km, base_url)
+    return fetch_image(lon, lat, timestamp, SWIR_BANDS, size_km, base_url)
+
+
+def fetch_rgb_swir(
+    lon: float,
+    lat: float,
+    timestamp: str,
+    size_km: float = 10.0,
+    base_url: str = SIMSAT_BASE_URL,
+) -> tuple[bytes, bytes]:
+    """Fetch the RGB and SWIR composites of a tile concurrently."""
+    return get_client(base_url).fetch_pair(lon, lat, timestamp, size_km)
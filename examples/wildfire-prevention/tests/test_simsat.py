@@ -0,0 +1,135 @@
+"""Tests for the SimSat client against a fake SimSat server."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from wildfire_prevention.simsat import RGB_BANDS, SWIR_BANDS, SimSatClient
+
+
+class FakeSimSat(ThreadingHTTPServer):
+    """SimSat stand-in: answers image requests with the requested bands and counts requests."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures_left = 0  # image requests answered with 503 before succeeding
+        self.delay_s = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeSimSat
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        state = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        with state.lock:
+            state.requests += 1
+            failing = state.failures_left > 0
+            if failing:
+                state.failures_left -= 1
+            state.in_flight += 1
+            state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        try:
+            if url.path != "/data/image/sentinel":
+                self._send(404, b"")
+            elif failing:
+                self._send(503, b"")
+            else:
+                time.sleep(state.delay_s)
+                self._send(200, ",".join(query["spectral_bands"]).encode())
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def simsat() -> Iterator[FakeSimSat]:
+    server = FakeSimSat()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def client(simsat: FakeSimSat, tmp_path: Path) -> Iterator[SimSatClient]:
+    client = SimSatClient(simsat.base_url, cache_dir=tmp_path / "cache", backoff_factor=0.01, timeout=5.0)
+    yield client
+    client.close()
+
+
+def test_retries_transient_errors(simsat: FakeSimSat, client: SimSatClient) -> None:
+    """A 503 is retried on the same call instead of failing the fetch."""
+    simsat.failures_left = 2
+
+    content = client.fetch_image(23.7, 38.1, "2025-07-01T00:00:00Z", RGB_BANDS)
+
+    assert content == b"red,green,blue"
+    assert simsat.requests == 3
+    assert client.requests_sent == 1
+
+
+def test_raises_when_retries_are_exhausted(simsat: FakeSimSat, tmp_path: Path) -> None:
+    """Once the retries are used up the last response surfaces as an HTTPError."""
+    simsat.failures_left = 10
+    client = SimSatClient(simsat.base_url, cache_dir=tmp_path, retries=2, backoff_factor=0.01, timeout=5.0)
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch_image(23.7, 38.1, "2025-07-01T00:00:00Z", RGB_BANDS)
+    client.close()
+
+    assert simsat.requests == 3
+    assert not list(tmp_path.rglob("*.png"))
+
+
+def test_fetch_pair_requests_both_composites_concurrently(simsat: FakeSimSat, client: SimSatClient) -> None:
+    """RGB and SWIR are fetched at the same time, and each result matches its bands."""
+    simsat.delay_s = 0.3
+
+    rgb, swir = client.fetch_pair(23.7, 38.1, "2025-07-01T00:00:00Z")
+
+    assert rgb == ",".join(RGB_BANDS).encode()
+    assert swir == ",".join(SWIR_BANDS).encode()
+    assert simsat.max_in_flight == 2
+
+
+def test_second_fetch_is_served_from_disk_cache(simsat: FakeSimSat, client: SimSatClient) -> None:
+    """A tile fetched once is read from the cache directory on the next call."""
+    first = client.fetch_image(23.7, 38.1, "2025-07-01T00:00:00Z", SWIR_BANDS)
+    second = client.fetch_image(23.7, 38.1, "2025-07-01T00:00:00Z", SWIR_BANDS)
+
+    assert first == second == b"swir16,nir08,red"
+    assert simsat.requests == 1
+    assert client.cache_hits == 1
+
+    # A different timestamp is a different tile
+    client.fetch_image(23.7, 38.1, "2025-07-02T00:00:00Z", SWIR_BANDS)
+    assert simsat.requests == 2